@@ -0,0 +1,117 @@
+# backend/community/counters.py
+from django.db import IntegrityError, transaction
+from django.db.models import CharField, Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Post, Comment
+
+# =========================================================
+# 🐜 게시글/댓글 좋아요·싫어요·댓글 수 카운터
+# =========================================================
+# - 토글: 중간 테이블(through) 한 줄 추가/삭제 + 카운터 UPDATE ... SET x = x + 1 을 한 트랜잭션으로
+#   (삭제/추가된 행 수로 증감을 정하므로 동시에 눌러도 실제 행 수와 카운터가 어긋나지 않음)
+# - 댓글 수는 Comment 저장/삭제 signals 에서 같은 방식으로 증감
+# - 어긋났을 때는 repair_counters 커맨드가 중간 테이블 기준으로 한 번에 다시 셈
+# - 목록 응답의 is_liked/is_disliked 는 user_reactions 로 페이지 전체를 한 번에 조회해서 serializer context 로 넘김
+
+REACTIONS = {'like': ('like_users', 'like_count'), 'dislike': ('dislike_users', 'dislike_count')}
+OPPOSITE = {'like': 'dislike', 'dislike': 'like'}
+
+
+def through_columns(model, reaction):
+    field = model._meta.get_field(REACTIONS[reaction][0])
+    through = field.remote_field.through
+    return through, field.m2m_field_name() + '_id', field.m2m_reverse_field_name() + '_id'
+
+
+def toggle_reaction(obj, user, reaction):
+    """좋아요/싫어요 토글 -> (눌린 상태 여부, like_count, dislike_count). 반대쪽 반응은 자동 취소"""
+    model = type(obj)
+    through, obj_col, user_col = through_columns(model, reaction)
+    key = {obj_col: obj.pk, user_col: user.pk}
+    delta = {'like_count': 0, 'dislike_count': 0}
+
+    with transaction.atomic():
+        removed, _ = through.objects.filter(**key).delete()
+        if removed:
+            active = False
+            delta[REACTIONS[reaction][1]] -= removed
+        else:
+            active = True
+            try:
+                with transaction.atomic():
+                    through.objects.create(**key)
+                delta[REACTIONS[reaction][1]] += 1
+            except IntegrityError:
+                pass  # 같은 순간 다른 요청이 먼저 추가함 (카운터는 그쪽에서 올림)
+            other, other_obj_col, other_user_col = through_columns(model, OPPOSITE[reaction])
+            other_removed, _ = other.objects.filter(**{other_obj_col: obj.pk, other_user_col: user.pk}).delete()
+            delta[REACTIONS[OPPOSITE[reaction]][1]] -= other_removed
+
+        changes = {field: F(field) + value for field, value in delta.items() if value}
+        if changes:
+            model.objects.filter(pk=obj.pk).update(**changes)
+        like_count, dislike_count = model.objects.filter(pk=obj.pk).values_list('like_count', 'dislike_count').get()
+    return active, like_count, dislike_count
+
+
+def user_reactions(user, posts=(), comments=()):
+    """이 유저가 누른 반응 {'post': {'like': {pk..}, 'dislike': {..}}, 'comment': {...}}
+    종류(게시글/댓글)마다 좋아요+싫어요를 UNION ALL 쿼리 한 번으로 조회"""
+    state = {'post': {'like': set(), 'dislike': set()}, 'comment': {'like': set(), 'dislike': set()}}
+    if not user or not user.is_authenticated:
+        return state
+    for kind, model, objects in (('post', Post, posts), ('comment', Comment, comments)):
+        ids = [obj.pk for obj in objects]
+        if not ids:
+            continue
+        queries = []
+        for reaction in REACTIONS:
+            through, obj_col, user_col = through_columns(model, reaction)
+            queries.append(
+                through.objects.filter(**{user_col: user.pk, f'{obj_col}__in': ids})
+                .values_list(obj_col, Value(reaction, output_field=CharField()))
+            )
+        for pk, reaction in queries[0].union(*queries[1:], all=True):
+            state[kind][reaction].add(pk)
+    return state
+
+
+def change_comment_count(post_id, value):
+    Post.objects.filter(pk=post_id).update(comment_count=F('comment_count') + value)
+
+
+# ---------------------------------------------------------
+# 복구 (repair_counters 커맨드)
+# ---------------------------------------------------------
+def _count_subquery(model, column, value_field='pk'):
+    rows = model.objects.filter(**{column: OuterRef(value_field)}).order_by().values(column)
+    return Coalesce(Subquery(rows.annotate(c=Count('*')).values('c'), output_field=IntegerField()), Value(0))
+
+
+def actual_counts(model):
+    """카운터 필드 -> 중간 테이블/댓글 테이블 기준 실제 개수 (상관 서브쿼리 표현식)"""
+    counts = {}
+    for reaction, (_, counter) in REACTIONS.items():
+        through, obj_col, _ = through_columns(model, reaction)
+        counts[counter] = _count_subquery(through, obj_col)
+    if model is Post:
+        counts['comment_count'] = _count_subquery(Comment, 'post_id')
+    return counts
+
+
+def mismatched(model):
+    """카운터가 실제 개수와 다른 행 (queryset)"""
+    counts = actual_counts(model)
+    q = Q()
+    for field in counts:
+        q |= ~Q(**{field: F(f'actual_{field}')})
+    return model.objects.annotate(**{f'actual_{field}': expr for field, expr in counts.items()}).filter(q)
+
+
+def repair_counters(model, dry_run=False):
+    """어긋난 행 수를 세고, dry_run 이 아니면 전체 카운터를 UPDATE 한 번으로 다시 계산"""
+    stale = mismatched(model).count()
+    if stale and not dry_run:
+        model.objects.update(**actual_counts(model))
+    return stale
@@ -0,0 +1,45 @@
+# backend/community/hot.py
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import Post
+
+# =========================================================
+# 🐜 인기글(hot) 점수 (posts/hot/)
+# =========================================================
+# - 점수 = (좋아요 - 싫어요 + 댓글 x 2) / (글 나이(시간) + 2) ^ 1.5   (Hacker News 식 시간 감쇠)
+#   반응이 많아도 시간이 지나면 내려가고, 싫어요가 더 많은 글은 음수라 목록에 안 나옴
+# - 요청마다 M2M/댓글 테이블을 세지 않고, 저장된 카운터로 스케줄러 hot_posts 작업이 Post.hot_score 를 다시 계산
+#   -> posts/hot/ 은 hot_score 인덱스를 순서대로 읽기만 함
+# - 최근 HOT_WINDOW 안의 글만 계산, 그보다 오래된 글은 0 으로 내려서 목록에서 빠짐
+
+HOT_WINDOW = timedelta(days=7)
+COMMENT_WEIGHT = 2
+GRAVITY = 1.5
+HOT_PAGE_SIZE, HOT_MAX_SIZE = 20, 50   # posts/hot/ 기본 / 최대 개수
+
+
+def hot_score(like_count, dislike_count, comment_count, created_at, now):
+    points = like_count - dislike_count + COMMENT_WEIGHT * comment_count
+    age_hours = max((now - created_at).total_seconds() / 3600, 0)
+    return round(points / (age_hours + 2) ** GRAVITY, 8)
+
+
+def refresh_hot_scores(now=None):
+    """최근 글 점수 다시 계산 (바뀐 행만 bulk_update), 기간이 지난 글은 0 으로"""
+    now = now or timezone.now()
+    since = now - HOT_WINDOW
+    recent = Post.objects.filter(created_at__gte=since).only(
+        'id', 'like_count', 'dislike_count', 'comment_count', 'created_at', 'hot_score',
+    )
+    scored, changed = 0, []
+    for post in recent.iterator(chunk_size=1000):
+        scored += 1
+        score = hot_score(post.like_count, post.dislike_count, post.comment_count, post.created_at, now)
+        if score != post.hot_score:
+            post.hot_score = score
+            changed.append(post)
+    Post.objects.bulk_update(changed, ['hot_score'], batch_size=500)
+    expired = Post.objects.filter(created_at__lt=since).exclude(hot_score=0).update(hot_score=0)
+    return {'scored': scored, 'updated': len(changed), 'expired': expired}
@@ -0,0 +1,14 @@
+# backend/community/jobs.py
+from finlife.scheduler import register_job
+
+from .hot import refresh_hot_scores
+
+# =========================================================
+# 🐜 community 백그라운드 작업 (finlife/scheduler.py 가 자동으로 찾아서 실행)
+# =========================================================
+
+
+@register_job('hot_posts', interval=10 * 60)
+def sync_hot_posts():
+    # 좋아요/댓글 반영과 시간 감쇠를 10분마다 hot_score 에 다시 씀
+    return refresh_hot_scores()
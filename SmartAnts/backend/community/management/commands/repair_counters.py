@@ -0,0 +1,23 @@
+# backend/community/management/commands/repair_counters.py
+from django.core.management.base import BaseCommand
+
+from community.counters import repair_counters
+from community.models import Post, Comment
+
+
+class Command(BaseCommand):
+    help = 'Recompute stored like/dislike/comment counters on posts and comments from the M2M/comment tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows are out of sync')
+
+    def handle(self, *args, **options):
+        for model in (Post, Comment):
+            stale = repair_counters(model, dry_run=options['dry_run'])
+            name = model._meta.verbose_name_plural
+            if not stale:
+                self.stdout.write(self.style.SUCCESS(f"{name}: all counters in sync"))
+            elif options['dry_run']:
+                self.stdout.write(self.style.ERROR(f"{name}: {stale} rows out of sync"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{name}: {stale} rows repaired"))
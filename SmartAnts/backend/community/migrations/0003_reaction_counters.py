@@ -0,0 +1,60 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:23
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _count(model, column):
+    rows = model.objects.filter(**{column: OuterRef('pk')}).order_by().values(column)
+    return Coalesce(Subquery(rows.annotate(c=Count('*')).values('c'), output_field=IntegerField()), Value(0))
+
+
+def backfill_counters(apps, schema_editor):
+    # 기존 게시글/댓글 카운터를 중간 테이블 기준으로 채움 (모델당 UPDATE 한 번)
+    Post = apps.get_model('community', 'Post')
+    Comment = apps.get_model('community', 'Comment')
+    for model in (Post, Comment):
+        counts = {}
+        for m2m, counter in (('like_users', 'like_count'), ('dislike_users', 'dislike_count')):
+            field = model._meta.get_field(m2m)
+            counts[counter] = _count(field.remote_field.through, field.m2m_field_name() + '_id')
+        if model is Post:
+            counts['comment_count'] = _count(Comment, 'post_id')
+        model.objects.update(**counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0002_post_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='dislike_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='dislike_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:02
+
+from django.db import migrations
+
+from community import search
+
+
+def build_search_index(apps, schema_editor):
+    # SQLite 는 FTS5 가상 테이블, Postgres 는 tsvector + GIN (community/search.py), 기존 글 전체 색인
+    connection = schema_editor.connection
+    search.create_index(connection)
+    Post = apps.get_model('community', 'Post')
+    rows = Post.objects.using(connection.alias).order_by('pk').values_list('pk', 'title', 'content')
+    search.index_rows(rows.iterator(chunk_size=1000), connection=connection)
+
+
+def drop_search_index(apps, schema_editor):
+    search.drop_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0004_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_search_index, drop_search_index),
+    ]
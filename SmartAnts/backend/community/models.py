@@ -24,6 +24,23 @@ class Post(models.Model):
     like_users = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='like_posts', blank=True)
     dislike_users = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='dislike_posts', blank=True)
 
+    # 🐜 목록에서 매번 COUNT 하지 않도록 저장해두는 카운터 (community/counters.py 에서 F() 로만 갱신)
+    like_count = models.PositiveIntegerField(default=0)
+    dislike_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+    # 🐜 인기글 점수: 스케줄러 hot_posts 작업이 주기적으로 다시 계산 (community/hot.py), 요청 때는 읽기만
+    hot_score = models.FloatField(default=0)
+
+    class Meta:
+        indexes = [
+            # 목록 커서 페이지네이션 (전체 / 게시판별 최신순)
+            models.Index(fields=['-created_at'], name='post_created_idx'),
+            models.Index(fields=['category', '-created_at'], name='post_category_created_idx'),
+            # 인기글 (전체 / 게시판별 점수순)
+            models.Index(fields=['-hot_score', '-id'], name='post_hot_idx'),
+            models.Index(fields=['category', '-hot_score', '-id'], name='post_category_hot_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -39,5 +56,11 @@ class Comment(models.Model):
     like_users = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='like_comments', blank=True)
     dislike_users = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='dislike_comments', blank=True)
 
+    like_count = models.PositiveIntegerField(default=0)
+    dislike_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=['post', 'created_at'], name='comment_post_created_idx')]
+
     def __str__(self):
         return f"{self.user.username}의 댓글"
\ No newline at end of file
@@ -0,0 +1,25 @@
+# backend/community/pagination.py
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class PostCursorPagination(CursorPagination):
+    """게시글 목록: 최신순 커서 페이지네이션 (글이 많아도 OFFSET 없이 created_at 인덱스만 읽음)"""
+    ordering = '-created_at'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class CommentCursorPagination(CursorPagination):
+    """게시글 상세의 댓글: 작성순"""
+    ordering = 'created_at'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class SearchPagination(PageNumberPagination):
+    """검색 결과: 관련도 순이라 커서 대신 페이지 번호 (상위 search.SEARCH_MAX_RESULTS 개 안에서)"""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 50
@@ -0,0 +1,195 @@
+# backend/community/search.py
+import re
+
+from django.db import connection as default_connection
+from django.db.models import Q
+from django.utils.html import escape
+
+# =========================================================
+# 🐜 게시글 전문 검색 (posts/search/?q=)
+# =========================================================
+# - 예전처럼 title__icontains | content__icontains 로 전체 테이블을 훑지 않고 별도 검색 인덱스를 씀
+#   SQLite   : FTS5 가상 테이블 community_post_search (rowid = 게시글 id), 순위는 bm25
+#   Postgres : community_post_search(post_id, document tsvector) + GIN 인덱스, 순위는 ts_rank
+#   그 외 DB : 인덱스 없이 icontains (같은 API 유지용)
+# - 한국어는 띄어쓰기 단위로 자르면 조사/합성어 때문에 거의 안 걸림 -> 단어를 글자 2개씩(bigram) 쪼개서 저장
+#   '삼성전자는' -> 삼성 성전 전자 자는,  검색어 '성전자' -> "성전 전자" 구(phrase) 검색 = 단어 안 부분 문자열 검색
+#   한 글자 검색어는 접두어 검색 ('돈' -> 돈*)
+# - 제목 가중치를 본문보다 높게, 하이라이트/스니펫은 원문에서 검색어 위치를 찾아 <mark> 로 감쌈 (HTML 이스케이프 후)
+# - 글 작성/수정/삭제 때 signals 에서 그 글 한 줄만 다시 색인
+
+SEARCH_TABLE = 'community_post_search'
+SEARCH_MAX_RESULTS = 200   # 순위 상위 몇 개까지 보여줄지 (페이지는 그 안에서 나눔)
+TITLE_WEIGHT, CONTENT_WEIGHT = 10.0, 1.0
+
+WORD_RE = re.compile(r'\w+')
+
+
+def ngrams(text):
+    """검색용 토큰 문자열: 단어마다 글자 bigram (두 글자 이하 단어는 그대로)"""
+    tokens = []
+    for word in WORD_RE.findall((text or '').lower()):
+        if len(word) <= 2:
+            tokens.append(word)
+        else:
+            tokens += [word[i:i + 2] for i in range(len(word) - 1)]
+    return ' '.join(tokens)
+
+
+def query_terms(query):
+    """검색어 -> 단어 목록 (중복 제거, 입력 순서 유지)"""
+    return list(dict.fromkeys(WORD_RE.findall((query or '').lower())))
+
+
+def _term_grams(term):
+    return [term] if len(term) <= 2 else [term[i:i + 2] for i in range(len(term) - 1)]
+
+
+def _fts5_query(terms):
+    parts = []
+    for term in terms:
+        if len(term) == 1:
+            parts.append(f'"{term}"*')
+        else:
+            parts.append('"' + ' '.join(_term_grams(term)) + '"')
+    return ' AND '.join(parts)
+
+
+def _tsquery(terms):
+    parts = []
+    for term in terms:
+        if len(term) == 1:
+            parts.append(f"'{term}':*")
+        else:
+            parts.append('(' + ' <-> '.join(f"'{g}'" for g in _term_grams(term)) + ')')
+    return ' & '.join(parts)
+
+
+# ---------------------------------------------------------
+# 인덱스 생성 / 갱신 (마이그레이션, signals 에서 호출)
+# ---------------------------------------------------------
+def create_index(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(title, content)")
+        elif connection.vendor == 'postgresql':
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+                f"post_id bigint PRIMARY KEY REFERENCES community_post(id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+                f"document tsvector NOT NULL)"
+            )
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_gin ON {SEARCH_TABLE} USING gin (document)")
+
+
+def drop_index(connection):
+    if connection.vendor in ('sqlite', 'postgresql'):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+def index_rows(rows, connection=default_connection):
+    """[(post id, 제목, 본문), ...] 색인 (있으면 교체)"""
+    rows = [(pk, ngrams(title), ngrams(content)) for pk, title, content in rows]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.executemany(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [(pk,) for pk, _, _ in rows])
+            cursor.executemany(f"INSERT INTO {SEARCH_TABLE} (rowid, title, content) VALUES (%s, %s, %s)", rows)
+        elif connection.vendor == 'postgresql':
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (post_id, document) VALUES "
+                f"(%s, setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'B')) "
+                f"ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document",
+                rows,
+            )
+
+
+def index_post(post):
+    index_rows([(post.pk, post.title, post.content)])
+
+
+def remove_post(post_id, connection=default_connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [post_id])
+        elif connection.vendor == 'postgresql':
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE post_id = %s", [post_id])
+
+
+# ---------------------------------------------------------
+# 검색
+# ---------------------------------------------------------
+def ranked_ids(terms, limit=SEARCH_MAX_RESULTS, offset=0, connection=default_connection):
+    """[(post id, 점수), ...] 관련도 높은 순 (점수는 클수록 관련 있음, 같으면 최신 글 먼저). 인덱스 없는 DB 면 None"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            # bm25 는 작을수록 관련 있음 -> 부호를 뒤집어서 돌려줌
+            cursor.execute(
+                f"SELECT rowid, -bm25({SEARCH_TABLE}, %s, %s) AS score FROM {SEARCH_TABLE} "
+                f"WHERE {SEARCH_TABLE} MATCH %s ORDER BY score DESC, rowid DESC LIMIT %s OFFSET %s",
+                [TITLE_WEIGHT, CONTENT_WEIGHT, _fts5_query(terms), limit, offset],
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute(
+                f"SELECT post_id, ts_rank(document, q) AS score FROM {SEARCH_TABLE}, to_tsquery('simple', %s) q "
+                f"WHERE document @@ q ORDER BY score DESC, post_id DESC LIMIT %s OFFSET %s",
+                [_tsquery(terms), limit, offset],
+            )
+        else:
+            return None
+        return [(pk, float(score)) for pk, score in cursor.fetchall()]
+
+
+def highlight(text, terms, width=None):
+    """검색어 위치를 <mark> 로 감싼 HTML. width 를 주면 첫 위치 주변 width 글자만 잘라서 (스니펫)"""
+    text = text or ''
+    pattern = re.compile('|'.join(re.escape(t) for t in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    start, end = 0, len(text)
+    if width and len(text) > width:
+        first = pattern.search(text)
+        center = first.start() if first else 0
+        start = max(0, min(center - width // 3, len(text) - width))
+        end = start + width
+    piece = text[start:end]
+
+    html, pos = [], 0
+    for m in pattern.finditer(piece):
+        html += [escape(piece[pos:m.start()]), f'<mark>{escape(m.group())}</mark>']
+        pos = m.end()
+    html.append(escape(piece[pos:]))
+    return ('…' if start > 0 else '') + ''.join(html) + ('…' if end < len(text) else '')
+
+
+def search_posts(queryset, query, limit=SEARCH_MAX_RESULTS, snippet_width=120):
+    """queryset(볼 수 있는 글) 중 검색어에 맞는 글을 관련도 순 리스트로.
+    글마다 search_rank / title_highlight / snippet 속성을 붙여줌"""
+    terms = query_terms(query)
+    if not terms:
+        return []
+
+    ranked = ranked_ids(terms, limit)
+    if ranked is None:
+        q = Q()
+        for term in terms:
+            q &= Q(title__icontains=term) | Q(content__icontains=term)
+        posts = list(queryset.filter(q)[:limit])
+        scores = {post.pk: 0.0 for post in posts}
+    else:
+        # 비밀글/다른 카테고리 등 볼 수 없는 글은 queryset 조건으로 걸러짐
+        # -> 걸러져서 limit 개가 안 차면 그 다음 순위를 (두 배씩 늘려가며) 더 가져옴
+        scores, posts, offset, batch = {}, [], 0, limit
+        while True:
+            scores.update(ranked)
+            posts += queryset.filter(pk__in=[pk for pk, _ in ranked])
+            if len(posts) >= limit or len(ranked) < batch:
+                break
+            offset, batch = offset + batch, batch * 2
+            ranked = ranked_ids(terms, batch, offset)
+        posts = sorted(posts, key=lambda p: (-scores[p.pk], -p.pk))[:limit]
+
+    for post in posts:
+        post.search_rank = round(scores[post.pk], 6)
+        post.title_highlight = highlight(post.title, terms)
+        post.snippet = highlight(post.content, terms, width=snippet_width)
+    return posts
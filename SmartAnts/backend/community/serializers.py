@@ -1,54 +1,76 @@
 from rest_framework import serializers
 from .models import Post, Comment
 
-class CommentSerializer(serializers.ModelSerializer):
+
+class ReactionStateMixin:
+    """is_liked / is_disliked. 뷰가 context['reactions'] (counters.user_reactions) 를 넘기면 쿼리 없이 집합에서 확인"""
+    reaction_kind = 'post'
+
+    def _reacted(self, obj, reaction):
+        reactions = self.context.get('reactions')
+        if reactions is not None:
+            return obj.pk in reactions[self.reaction_kind][reaction]
+        user = self.context.get('request').user
+        if user and user.is_authenticated:
+            return getattr(obj, f'{reaction}_users').filter(pk=user.pk).exists()
+        return False
+
+    def get_is_liked(self, obj):
+        return self._reacted(obj, 'like')
+
+    def get_is_disliked(self, obj):
+        return self._reacted(obj, 'dislike')
+
+
+class CommentSerializer(ReactionStateMixin, serializers.ModelSerializer):
+    reaction_kind = 'comment'
     user_nickname = serializers.ReadOnlyField(source='user.nickname')
-    like_count = serializers.IntegerField(source='like_users.count', read_only=True)
-    dislike_count = serializers.IntegerField(source='dislike_users.count', read_only=True)
+    # like_count / dislike_count 는 모델에 저장된 카운터 (추가 쿼리 없음)
     # 🐜 [추가] 현재 로그인한 유저가 좋아요/싫어요 눌렀는지 확인
     is_liked = serializers.SerializerMethodField()
     is_disliked = serializers.SerializerMethodField()
 
     class Meta:
         model = Comment
-        fields = '__all__'
-        read_only_fields = ('user', 'like_users', 'dislike_users')
+        # 누른 사람 id 목록(like_users/dislike_users)은 객체마다 쿼리가 돌아서 내보내지 않음 (카운터 + is_liked 로 충분)
+        exclude = ('like_users', 'dislike_users')
+        read_only_fields = ('user', 'like_count', 'dislike_count')
 
-    def get_is_liked(self, obj):
-        user = self.context.get('request').user
-        if user.is_authenticated:
-            return obj.like_users.filter(pk=user.pk).exists()
-        return False
+class PostListSerializer(ReactionStateMixin, serializers.ModelSerializer):
+    """목록용: 본문/댓글 없이 카드에 필요한 필드만 (본문과 댓글은 상세에서)"""
+    user_nickname = serializers.ReadOnlyField(source='user.nickname')
+    is_liked = serializers.SerializerMethodField()
+    is_disliked = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Post
+        fields = (
+            'id', 'user', 'user_nickname', 'category', 'title', 'is_secret', 'created_at', 'updated_at',
+            'like_count', 'dislike_count', 'comment_count', 'is_liked', 'is_disliked',
+        )
+        read_only_fields = fields
 
-    def get_is_disliked(self, obj):
-        user = self.context.get('request').user
-        if user.is_authenticated:
-            return obj.dislike_users.filter(pk=user.pk).exists()
-        return False
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSearchSerializer(PostListSerializer):
+    """검색 결과: 목록 카드 + 관련도 점수, <mark> 로 감싼 제목/본문 스니펫 (community/search.py 가 붙여줌)"""
+    search_rank = serializers.FloatField(read_only=True)
+    title_highlight = serializers.CharField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+
+    class Meta(PostListSerializer.Meta):
+        fields = PostListSerializer.Meta.fields + ('search_rank', 'title_highlight', 'snippet')
+        read_only_fields = fields
+
+
+class PostSerializer(ReactionStateMixin, serializers.ModelSerializer):
+    """상세/작성/수정용. 댓글은 뷰가 첫 페이지만 붙여줌 (나머지는 posts/{id}/comments/)"""
     user_nickname = serializers.ReadOnlyField(source='user.nickname')
-    comments = CommentSerializer(many=True, read_only=True)
-    comment_count = serializers.IntegerField(source='comments.count', read_only=True)
-    like_count = serializers.IntegerField(source='like_users.count', read_only=True)
-    dislike_count = serializers.IntegerField(source='dislike_users.count', read_only=True)
+    # comment_count / like_count / dislike_count 는 모델에 저장된 카운터 (추가 쿼리 없음)
     # 🐜 [추가] 게시글도 마찬가지로 상태 확인
     is_liked = serializers.SerializerMethodField()
     is_disliked = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
-        fields = '__all__'
-        read_only_fields = ('user', 'like_users', 'dislike_users')
-
-    def get_is_liked(self, obj):
-        user = self.context.get('request').user
-        if user and user.is_authenticated:
-            return obj.like_users.filter(pk=user.pk).exists()
-        return False
-
-    def get_is_disliked(self, obj):
-        user = self.context.get('request').user
-        if user and user.is_authenticated:
-            return obj.dislike_users.filter(pk=user.pk).exists()
-        return False
\ No newline at end of file
+        exclude = ('like_users', 'dislike_users')
+        read_only_fields = ('user', 'like_count', 'dislike_count', 'comment_count')
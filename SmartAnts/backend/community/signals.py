@@ -0,0 +1,33 @@
+# backend/community/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from . import search
+from .counters import change_comment_count
+from .models import Comment, Post
+
+
+# 🐜 댓글 작성/삭제 시 게시글 comment_count 를 F() 로 증감 (관리자 페이지에서 지워도 맞게)
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        change_comment_count(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    # 게시글째 지워지는 경우엔 UPDATE 대상이 없어서 아무 일도 안 일어남
+    change_comment_count(instance.post_id, -1)
+
+
+# 🐜 게시글 검색 인덱스: 작성/수정/삭제된 글 한 줄만 다시 색인 (community/search.py)
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not {'title', 'content'} & set(update_fields)):
+        return
+    search.index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    search.remove_post(instance.pk)
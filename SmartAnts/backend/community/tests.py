@@ -1,3 +1,191 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .counters import repair_counters
+from .hot import refresh_hot_scores
+from .models import Post, Comment
+
+
+def make_user(name):
+    return get_user_model().objects.create_user(username=name, password='pw', nickname=name)
+
+
+class ReactionCounterTest(TestCase):
+    def setUp(self):
+        self.author, self.reader = make_user('author'), make_user('reader')
+        self.post = Post.objects.create(user=self.author, title='제목', content='내용')
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def test_toggle_updates_counters(self):
+        url = f'/api/community/posts/{self.post.pk}'
+        self.assertEqual(self.client.post(f'{url}/like/').json(), {'liked': True, 'like_count': 1, 'dislike_count': 0})
+        self.assertEqual(self.client.post(f'{url}/dislike/').json(), {'disliked': True, 'like_count': 0, 'dislike_count': 1})
+        self.assertEqual(self.client.post(f'{url}/dislike/').json(), {'disliked': False, 'like_count': 0, 'dislike_count': 0})
+
+        comment = Comment.objects.create(post=self.post, user=self.author, content='댓글')
+        self.client.post(f'/api/community/comments/{comment.pk}/like/')
+        comment.refresh_from_db()
+        self.assertEqual(comment.like_count, 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+        comment.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 0)
+
+    def test_repair(self):
+        self.post.like_users.add(self.reader)     # 카운터를 거치지 않은 변경
+        Comment.objects.create(post=self.post, user=self.reader, content='a')
+        Post.objects.filter(pk=self.post.pk).update(comment_count=5)
+        self.assertEqual(repair_counters(Post, dry_run=True), 1)
+        self.assertEqual(repair_counters(Post), 1)
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.dislike_count, self.post.comment_count), (1, 0, 1))
+        self.assertEqual(repair_counters(Post), 0)
+
+
+class PostListQueryCountTest(TestCase):
+    """내 반응(is_liked/is_disliked)과 카운터는 게시글/댓글 수와 상관없이 쿼리 수가 일정해야 함"""
+
+    def make_posts(self, count, author, reader):
+        for i in range(count):
+            post = Post.objects.create(user=author, title=f'글{i}', content='내용')
+            for j in range(3):
+                comment = Comment.objects.create(post=post, user=author, content=f'댓글{j}')
+                if j == 0:
+                    comment.like_users.add(reader)
+            if i % 2:
+                post.like_users.add(reader)
+
+    def count_queries(self, client, url='/api/community/posts/'):
+        with CaptureQueriesContext(connection) as ctx:
+            res = client.get(url)
+        self.assertEqual(res.status_code, 200)
+        return len(ctx), res.json()
+
+    def test_constant_queries(self):
+        author, reader = make_user('author'), make_user('reader')
+        client = APIClient()
+        client.force_authenticate(reader)
+        self.make_posts(2, author, reader)
+        small, _ = self.count_queries(client)
+        self.make_posts(20, author, reader)
+        large, data = self.count_queries(client, '/api/community/posts/?page_size=50')
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, 6)
+
+        posts = data['results']
+        self.assertEqual(len([p for p in posts if p['is_liked']]), 11)
+        self.assertNotIn('like_users', posts[0])
+        self.assertNotIn('comments', posts[0])
+
+        _, detail = self.count_queries(client, f"/api/community/posts/{posts[0]['id']}/")
+        self.assertEqual([c['is_liked'] for c in detail['comments']], [True, False, False])
+        self.assertIsNone(detail['comments_next'])
+
+
+class PostPaginationTest(TestCase):
+    def test_cursor_pages_and_comment_pages(self):
+        author = make_user('author')
+        posts = [Post.objects.create(user=author, title=f'글{i}', content='내용') for i in range(5)]
+        for i in range(3):
+            Comment.objects.create(post=posts[0], user=author, content=f'댓글{i}')
+        client = APIClient()
+
+        first = client.get('/api/community/posts/', {'page_size': 2}).json()
+        self.assertEqual([p['title'] for p in first['results']], ['글4', '글3'])
+        second = client.get(first['next']).json()
+        self.assertEqual([p['title'] for p in second['results']], ['글2', '글1'])
+
+        detail = client.get(f'/api/community/posts/{posts[0].pk}/', {'page_size': 2}).json()
+        self.assertEqual([c['content'] for c in detail['comments']], ['댓글0', '댓글1'])
+        self.assertIn(f'/api/community/posts/{posts[0].pk}/comments/?cursor=', detail['comments_next'])
+        rest = client.get(detail['comments_next']).json()
+        self.assertEqual([c['content'] for c in rest['results']], ['댓글2'])
+        self.assertIsNone(rest['next'])
+
+
+class PostSearchTest(TestCase):
+    def test_ngram_search_ranks_highlights_and_tracks_changes(self):
+        author, other = make_user('author'), make_user('other')
+        title_hit = Post.objects.create(user=author, title='삼성전자 실적 발표', content='반도체 이야기')
+        body_hit = Post.objects.create(user=author, title='오늘의 시장', content='외국인이 삼성전자를 <b>샀다</b>')
+        Post.objects.create(user=author, title='적금 추천', content='금리 비교')
+        Post.objects.create(user=other, title='삼성전자 문의', content='비밀', is_secret=True)
+        client = APIClient()
+
+        res = client.get('/api/community/posts/search/', {'q': '성전자'})
+        self.assertEqual(res.status_code, 200)
+        results = res.json()['results']
+        # 제목에 있는 글이 먼저, 비밀글은 안 보임
+        self.assertEqual([p['id'] for p in results], [title_hit.pk, body_hit.pk])
+        self.assertEqual(results[0]['title_highlight'], '삼<mark>성전자</mark> 실적 발표')
+        self.assertIn('<mark>성전자</mark>를 &lt;b&gt;샀다&lt;/b&gt;', results[1]['snippet'])
+        self.assertGreater(results[0]['search_rank'], results[1]['search_rank'])
+
+        # 수정/삭제가 바로 반영
+        body_hit.content = '외국인이 하이닉스를 샀다'
+        body_hit.save()
+        title_hit.delete()
+        self.assertEqual(client.get('/api/community/posts/search/', {'q': '성전자'}).json()['results'], [])
+        self.assertEqual(len(client.get('/api/community/posts/search/', {'q': '하이닉스 외국'}).json()['results']), 1)
+        self.assertEqual(client.get('/api/community/posts/search/').status_code, 400)
+
+        client.force_authenticate(other)
+        self.assertEqual(len(client.get('/api/community/posts/search/', {'q': '문의'}).json()['results']), 1)
+
+    def test_hidden_top_matches_do_not_crowd_out_visible_ones(self):
+        from .search import search_posts
+        author = make_user('author')
+        # 순위가 더 높은(제목 매치) 글은 전부 비밀글/다른 카테고리
+        for i in range(5):
+            Post.objects.create(user=author, title=f'배당주 {i}', content='비밀', is_secret=True)
+        Post.objects.create(user=author, title='배당주 후기', content='후기', category='review')
+        visible = [Post.objects.create(user=author, title=f'잡담 {i}', content='오늘 배당주 샀다') for i in range(2)]
+
+        posts = search_posts(Post.objects.filter(is_secret=False, category='free'), '배당주', limit=2)
+        self.assertEqual(sorted(p.pk for p in posts), sorted(p.pk for p in visible))
+        posts = search_posts(Post.objects.filter(is_secret=False, category='free'), '배당주', limit=1)
+        self.assertEqual(len(posts), 1)
+
+
+class HotFeedTest(TestCase):
+    def test_scores_decay_and_feed_reads_precomputed_order(self):
+        author = make_user('author')
+        now = timezone.now()
+
+        def post(title, hours_ago, likes=0, dislikes=0, comments=0):
+            p = Post.objects.create(user=author, title=title, content='내용')
+            Post.objects.filter(pk=p.pk).update(
+                created_at=now - timedelta(hours=hours_ago),
+                like_count=likes, dislike_count=dislikes, comment_count=comments,
+            )
+            return p
+
+        fresh = post('새 글', 1, likes=5)
+        old_popular = post('어제 인기글', 30, likes=20, comments=5)
+        chatty = post('댓글 많은 글', 2, comments=4)
+        post('싫어요 글', 1, likes=1, dislikes=5)
+        expired = post('지난주 글', 24 * 10, likes=100)
+        Post.objects.filter(pk=expired.pk).update(hot_score=1.0)
+
+        stats = refresh_hot_scores(now)
+        self.assertEqual((stats['scored'], stats['expired']), (4, 1))
+
+        client = APIClient()
+        with CaptureQueriesContext(connection) as ctx:
+            res = client.get('/api/community/posts/hot/')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([p['id'] for p in res.json()['results']], [chatty.pk, fresh.pk, old_popular.pk])
+        self.assertEqual(len(ctx), 1)  # 비로그인: 점수 인덱스 읽기 한 번 (반응 조회 없음)
 
-# Create your tests here.
+        # 같은 반응이라도 시간이 지나면 점수가 내려감
+        refresh_hot_scores(now + timedelta(hours=12))
+        self.assertLess(Post.objects.get(pk=fresh.pk).hot_score, 5 / 3 ** 1.5)
+        self.assertEqual(len(client.get('/api/community/posts/hot/', {'limit': 1}).json()['results']), 1)
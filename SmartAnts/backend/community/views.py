@@ -1,18 +1,51 @@
+from urllib.parse import urlsplit
+
 from django.db.models import Q
+from django.urls import reverse
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from .counters import toggle_reaction, user_reactions
+from .hot import HOT_MAX_SIZE, HOT_PAGE_SIZE
 from .models import Post, Comment
-from .serializers import PostSerializer, CommentSerializer
+from .pagination import PostCursorPagination, CommentCursorPagination, SearchPagination
+from .search import search_posts
+from .serializers import PostListSerializer, PostSearchSerializer, PostSerializer, CommentSerializer
 from .permissions import IsOwnerOrAdminReadOnly
 
-class PostViewSet(viewsets.ModelViewSet):
+class ReactionContextMixin:
+    """조회 응답이면 페이지 전체의 내 반응(좋아요/싫어요)을 미리 조회해서 serializer context 로 넘김
+    -> is_liked / is_disliked 가 객체마다 exists() 를 돌리지 않음 (게시글 1번 + 댓글 1번)"""
+
+    def reaction_targets(self, objects):
+        return objects, []
+
+    def get_serializer(self, *args, **kwargs):
+        if args and 'data' not in kwargs:
+            instance = args[0]
+            objects = list(instance) if kwargs.get('many') else [instance]
+            context = kwargs.setdefault('context', self.get_serializer_context())
+            context['reactions'] = user_reactions(self.request.user, *self.reaction_targets(objects))
+        return super().get_serializer(*args, **kwargs)
+
+
+class PostViewSet(ReactionContextMixin, viewsets.ModelViewSet):
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrAdminReadOnly]
+    # 🐜 목록은 커서 페이지네이션 (응답: {"next", "previous", "results"})
+    pagination_class = PostCursorPagination
+
+    def get_serializer_class(self):
+        # 목록은 본문/댓글 없는 가벼운 카드, 상세에서만 전체 내용
+        if self.action in ('list', 'mine', 'hot'):
+            return PostListSerializer
+        if self.action == 'search':
+            return PostSearchSerializer
+        return PostSerializer
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Post.objects.all().order_by('-created_at')
+        queryset = Post.objects.select_related('user').order_by('-created_at')
         
         category = self.request.query_params.get('category')
         if category and category != 'all':
@@ -27,12 +60,56 @@ class PostViewSet(viewsets.ModelViewSet):
             return queryset
         return queryset.filter(Q(is_secret=False) | Q(user=user))
     
+    # 🐜 댓글은 상세에서 첫 페이지만 같이 주고, 나머지는 posts/{id}/comments/?cursor= 로
+    def paginate_comments(self, request, post):
+        paginator = CommentCursorPagination()
+        page = paginator.paginate_queryset(post.comments.select_related('user'), request, view=self)
+        context = {**self.get_serializer_context(), 'reactions': user_reactions(request.user, comments=page)}
+        return paginator, CommentSerializer(page, many=True, context=context).data
+
+    def retrieve(self, request, *args, **kwargs):
+        post = self.get_object()
+        data = self.get_serializer(post).data
+        paginator, data['comments'] = self.paginate_comments(request, post)
+        next_link = paginator.get_next_link()
+        if next_link:
+            # 다음 페이지 링크는 상세가 아니라 댓글 목록 주소로
+            comments_url = request.build_absolute_uri(reverse('post-comments', args=[post.pk]))
+            next_link = f'{comments_url}?{urlsplit(next_link).query}'
+        data['comments_next'] = next_link
+        return Response(data)
+
+    @action(detail=True, methods=['get'])
+    def comments(self, request, pk=None):
+        paginator, data = self.paginate_comments(request, self.get_object())
+        return paginator.get_paginated_response(data)
+
     def perform_create(self, serializer):
         category = self.request.data.get('category')
         is_secret = self.request.data.get('is_secret', False)
         if category == 'inquiry': is_secret = True
         serializer.save(user=self.request.user, is_secret=is_secret)
 
+    # 🐜 전문 검색: posts/search/?q=삼성전자&category=free (SQLite FTS5 / Postgres GIN, community/search.py)
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': '검색어(q)를 입력해주세요.'}, status=status.HTTP_400_BAD_REQUEST)
+        paginator = SearchPagination()
+        page = paginator.paginate_queryset(search_posts(self.get_queryset(), query), request, view=self)
+        return paginator.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    # 🐜 인기글: 스케줄러가 미리 계산한 hot_score 인덱스 순서대로 상위 N개만 (community/hot.py)
+    @action(detail=False, methods=['get'])
+    def hot(self, request):
+        try:
+            limit = min(int(request.query_params.get('limit', HOT_PAGE_SIZE)), HOT_MAX_SIZE)
+        except ValueError:
+            return Response({'error': 'limit은 숫자여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        posts = self.get_queryset().filter(hot_score__gt=0).order_by('-hot_score', '-id')[:max(limit, 1)]
+        return Response({'results': self.get_serializer(posts, many=True).data})
+
     @action(detail=False, methods=['get'])
     def mine(self, request):
         posts = self.get_queryset().filter(user=request.user)
@@ -40,46 +117,35 @@ class PostViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     # 🐜 [수정] 좋아요/싫어요 토글 시 양쪽 카운트를 모두 반환
-    @action(detail=True, methods=['post'])
+    # 카운터는 저장된 컬럼을 트랜잭션 안에서 F() 로 증감 (community/counters.py)
+    # 반응은 작성자가 아니어도 로그인만 하면 가능 (IsOwnerOrAdminReadOnly 는 수정/삭제용)
+    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def like(self, request, pk=None):
-        post = self.get_object()
-        user = request.user
-        if post.like_users.filter(pk=user.pk).exists():
-            post.like_users.remove(user)
-            liked = False
-        else:
-            post.like_users.add(user)
-            post.dislike_users.remove(user)
-            liked = True
+        liked, like_count, dislike_count = toggle_reaction(self.get_object(), request.user, 'like')
         return Response({
             'liked': liked, 
-            'like_count': post.like_users.count(),
-            'dislike_count': post.dislike_users.count()
+            'like_count': like_count,
+            'dislike_count': dislike_count
         }, status=status.HTTP_200_OK)
 
-    @action(detail=True, methods=['post'])
+    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def dislike(self, request, pk=None):
-        post = self.get_object()
-        user = request.user
-        if post.dislike_users.filter(pk=user.pk).exists():
-            post.dislike_users.remove(user)
-            disliked = False
-        else:
-            post.dislike_users.add(user)
-            post.like_users.remove(user)
-            disliked = True
+        disliked, like_count, dislike_count = toggle_reaction(self.get_object(), request.user, 'dislike')
         return Response({
             'disliked': disliked, 
-            'like_count': post.like_users.count(),
-            'dislike_count': post.dislike_users.count()
+            'like_count': like_count,
+            'dislike_count': dislike_count
         }, status=status.HTTP_200_OK)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
-    queryset = Comment.objects.all().order_by('-created_at')
+class CommentViewSet(ReactionContextMixin, viewsets.ModelViewSet):
+    queryset = Comment.objects.select_related('user').order_by('-created_at')
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrAdminReadOnly]
 
+    def reaction_targets(self, comments):
+        return [], comments
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
     
@@ -90,36 +156,20 @@ class CommentViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     # 🐜 댓글도 동일하게 양쪽 카운트 반환 처리
-    @action(detail=True, methods=['post'])
+    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def like(self, request, pk=None):
-        comment = self.get_object()
-        user = request.user
-        if comment.like_users.filter(pk=user.pk).exists():
-            comment.like_users.remove(user)
-            liked = False
-        else:
-            comment.like_users.add(user)
-            comment.dislike_users.remove(user)
-            liked = True
+        liked, like_count, dislike_count = toggle_reaction(self.get_object(), request.user, 'like')
         return Response({
             'liked': liked, 
-            'like_count': comment.like_users.count(),
-            'dislike_count': comment.dislike_users.count()
+            'like_count': like_count,
+            'dislike_count': dislike_count
         })
 
-    @action(detail=True, methods=['post'])
+    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def dislike(self, request, pk=None):
-        comment = self.get_object()
-        user = request.user
-        if comment.dislike_users.filter(pk=user.pk).exists():
-            comment.dislike_users.remove(user)
-            disliked = False
-        else:
-            comment.dislike_users.add(user)
-            comment.like_users.remove(user)
-            disliked = True
+        disliked, like_count, dislike_count = toggle_reaction(self.get_object(), request.user, 'dislike')
         return Response({
             'disliked': disliked, 
-            'like_count': comment.like_users.count(),
-            'dislike_count': comment.dislike_users.count()
+            'like_count': like_count,
+            'dislike_count': dislike_count
         })
\ No newline at end of file
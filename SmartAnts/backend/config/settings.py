@@ -181,6 +181,50 @@ REST_FRAMEWORK = {
 }
 
 
+# =====================================================
+# CACHE (상품 목록/추천 응답 캐시)
+# =====================================================
+# 기본은 워커별 메모리. 워커/커맨드끼리 공유하려면 (warm_recommendations 등)
+# DJANGO_CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache, DJANGO_CACHE_LOCATION=/var/tmp/smartants_cache
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("DJANGO_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("DJANGO_CACHE_LOCATION", ""),
+    }
+}
+
+
+# =====================================================
+# MARKET DATA CACHE (yfinance 등 외부 시세 호출 캐시)
+# =====================================================
+# BACKEND: "local"(워커별 메모리 LRU) 또는 "django"(CACHES 공유 캐시)
+MARKET_DATA_CACHE = {
+    "BACKEND": os.environ.get("MARKET_DATA_CACHE_BACKEND", "local"),
+    "ALIAS": "default",
+    "MAX_ENTRIES": 1024,
+}
+
+# 종목 인덱스/KRX 매핑/섹터 맵/팩터 등 미리 만들어두는 스냅샷 파일 위치
+# ⚠️ Procfile 의 scheduler 프로세스가 여기에 쓰고 web 프로세스가 읽음 -> 두 프로세스가 같은 디렉터리를 봐야 함
+#    (같은 서버면 기본값 그대로 OK, 컨테이너/dyno 가 나뉘어 있으면 공유 볼륨 경로를 MARKET_SNAPSHOT_DIR 로 지정)
+#    안 보이면 web 은 계속 초기값(인기 종목 맵, 패키지 sectors.json)만 씀
+MARKET_SNAPSHOT_DIR = os.environ.get("MARKET_SNAPSHOT_DIR", str(BASE_DIR / "data" / "snapshots"))
+
+
+# =====================================================
+# LOGGING (스케줄러/동기화/스냅샷 로그를 콘솔로)
+# =====================================================
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "finlife": {"handlers": ["console"], "level": os.environ.get("APP_LOG_LEVEL", "INFO")},
+        "community": {"handlers": ["console"], "level": os.environ.get("APP_LOG_LEVEL", "INFO")},
+    },
+}
+
+
 # =====================================================
 # STATIC / MEDIA
 # =====================================================
@@ -1,6 +1,6 @@
 # backend/finlife/admin.py
 from django.contrib import admin
-from .models import DepositProduct, DepositOptions, SavingProduct, SavingOptions, ExchangeRate, AssetPrice
+from .models import DepositProduct, DepositOptions, SavingProduct, SavingOptions, ExchangeRate, AssetPrice, StockFactor, SyncJob
 
 # 1. 예금 옵션을 상품 페이지에서 바로 보기 위한 Inline 설정
 class DepositOptionsInline(admin.TabularInline):
@@ -32,8 +32,21 @@ class AssetPriceAdmin(admin.ModelAdmin):
     list_display = ('asset_type', 'date', 'price')
     list_filter = ('asset_type', 'date')
 
+# 5. 퀀트 팩터 스냅샷 (영업일별)
+class StockFactorAdmin(admin.ModelAdmin):
+    list_display = ('date', 'ticker', 'name', 'sector', 'close', 'per', 'pbr', 'div')
+    list_filter = ('market', 'date')
+    search_fields = ('ticker', 'name')
+
+# 6. 백그라운드 동기화 작업 상태
+class SyncJobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'started_at', 'finished_at', 'last_success_at', 'next_run_at', 'duration')
+    readonly_fields = ('result', 'error')
+
 # 모델 등록
 admin.site.register(DepositProduct, DepositProductAdmin)
 admin.site.register(SavingProduct, SavingProductAdmin)
 admin.site.register(ExchangeRate, ExchangeRateAdmin)
-admin.site.register(AssetPrice, AssetPriceAdmin)
\ No newline at end of file
+admin.site.register(AssetPrice, AssetPriceAdmin)
+admin.site.register(StockFactor, StockFactorAdmin)
+admin.site.register(SyncJob, SyncJobAdmin)
\ No newline at end of file
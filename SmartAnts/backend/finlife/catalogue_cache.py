@@ -0,0 +1,75 @@
+# backend/finlife/catalogue_cache.py
+import hashlib
+
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework.renderers import JSONRenderer
+
+from .models import SyncJob
+
+# =========================================================
+# 🐜 예금/적금 목록 응답 캐시 (렌더링된 JSON 바이트 그대로 저장)
+# =========================================================
+# - 키: 목록 종류 + 카탈로그 버전 + 쿼리 파라미터
+# - 카탈로그 버전 = 상품 동기화 작업(products)의 마지막 성공 시각
+#   -> 동기화가 끝나면 키가 바뀌어서 이전 캐시는 자연스럽게 버려짐
+# - ETag(응답 내용 해시) / Last-Modified(마지막 동기화 시각)로 조건부 GET 이면 본문 없이 304
+
+CATALOGUE_CACHE_TTL = 60 * 60 * 24
+CATALOGUE_SYNC_JOB = 'products'
+
+
+def catalogue_version():
+    """(버전 문자열, 마지막 갱신 시각 timestamp 또는 None)"""
+    synced_at = SyncJob.objects.filter(name=CATALOGUE_SYNC_JOB).values_list('last_success_at', flat=True).first()
+    if synced_at is None:
+        return '0', None
+    return str(int(synced_at.timestamp() * 1000)), int(synced_at.timestamp())
+
+
+def _cache_key(name, version, request):
+    # 페이지네이션 next/previous 링크에 호스트가 들어가므로 호스트도 키에 포함
+    params = '&'.join(f'{k}={v}' for k, v in sorted(request.GET.lists()))
+    digest = hashlib.md5(f'{request.get_host()}?{params}'.encode()).hexdigest()
+    return f'catalogue:{name}:{version}:{digest}'
+
+
+def _not_modified(request, entry):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        # If-None-Match 가 있으면 If-Modified-Since 는 보지 않음 (RFC 9110)
+        tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+        return '*' in tags or entry['etag'] in tags
+    since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return since is not None and entry['last_modified'] is not None and entry['last_modified'] <= since
+
+
+def _set_headers(response, entry):
+    response['ETag'] = entry['etag']
+    if entry['last_modified'] is not None:
+        response['Last-Modified'] = http_date(entry['last_modified'])
+    response['Cache-Control'] = 'public, no-cache'  # 브라우저가 저장은 하되 매번 재검증 (304)
+    return response
+
+
+def cached_catalogue_response(request, name, build_response):
+    """build_response() (DRF Response) 결과를 캐시해서 돌려줌. 200 이 아닌 응답은 캐시하지 않음"""
+    version, last_modified = catalogue_version()
+    key = _cache_key(name, version, request)
+    entry = cache.get(key)
+    if entry is None:
+        response = build_response()
+        if response.status_code != 200:
+            return response
+        content = JSONRenderer().render(response.data)
+        entry = {
+            'content': content,
+            'etag': f'"{hashlib.md5(content).hexdigest()}"',
+            'last_modified': last_modified,
+        }
+        cache.set(key, entry, CATALOGUE_CACHE_TTL)
+
+    if _not_modified(request, entry):
+        return _set_headers(HttpResponseNotModified(), entry)
+    return _set_headers(HttpResponse(entry['content'], content_type='application/json'), entry)
@@ -0,0 +1,69 @@
+# backend/finlife/jobs.py
+from .scheduler import register_job
+from .utils.exchange_sync import fetch_and_save_exchange_rates
+from .utils.external_api import refresh_krx_snapshot
+from .utils.product_sync import fetch_and_save_products
+from .utils.quant_analysis import build_latest_factor_snapshot
+from .utils.sector_map import refresh_sector_map
+from .utils.subscription_matrix import write_subscription_snapshot
+from .utils.user_index import write_user_index_snapshot
+
+# =========================================================
+# 🐜 finlife 백그라운드 작업 (finlife/scheduler.py 가 자동으로 찾아서 실행)
+# =========================================================
+HOUR = 60 * 60
+
+
+@register_job('products', interval=6 * HOUR)
+def sync_products():
+    # 성공 시각(SyncJob.last_success_at)이 곧 카탈로그 버전 -> deposits/ savings/ 응답 캐시가 무효화됨
+    stats = fetch_and_save_products()
+    if not stats:
+        raise ValueError("FINLIFE에서 받아온 상품이 없습니다.")
+    # 바뀐 금리 목록은 길 수 있어서 상태에는 개수만 남김
+    return {
+        kind: {**{k: v for k, v in row.items() if k != 'changed_rates'}, 'changed_rates': len(row['changed_rates'])}
+        for kind, row in stats.items()
+    }
+
+
+@register_job('exchange_rates', interval=HOUR)
+def sync_exchange_rates():
+    result = fetch_and_save_exchange_rates()
+    if not result['currencies']:
+        raise ValueError("최근 7일간 고시된 환율이 없습니다.")
+    return result
+
+
+@register_job('sector_map', interval=7 * 24 * HOUR)
+def sync_sector_map():
+    return refresh_sector_map()
+
+
+@register_job('krx_mapping', interval=24 * HOUR)
+def sync_krx_mapping():
+    snapshot = refresh_krx_snapshot()
+    return {'version': snapshot['version'], 'names': len(snapshot['mapping'])}
+
+
+@register_job('quant_snapshots', interval=3 * HOUR, lock_timeout=2 * HOUR)
+def sync_quant_snapshots():
+    # 장 마감 후 실행분이 그날 확정 데이터로 덮어씀 (같은 날짜는 upsert)
+    day, count = build_latest_factor_snapshot()
+    if not count:
+        raise ValueError("최근 영업일 팩터 데이터를 받지 못했습니다.")
+    return {'date': day.isoformat(), 'tickers': count}
+
+
+@register_job('user_index', interval=HOUR)
+def rebuild_user_index():
+    # 워커들이 signals 로 각자 반영한 프로필 변경을 공용 스냅샷으로 다시 합침 (날짜가 바뀌면 나이도 갱신)
+    index = write_user_index_snapshot()
+    return {'users': len(index)}
+
+
+@register_job('subscription_matrix', interval=HOUR)
+def rebuild_subscription_matrix():
+    # 워커별로 쌓인 가입/해지 delta 를 DB 기준으로 다시 합친 스냅샷
+    matrix = write_subscription_snapshot()
+    return {'users': matrix.shape[0], 'options': matrix.shape[1], 'subscriptions': int(matrix.matrix.nnz)}
@@ -0,0 +1,52 @@
+# backend/finlife/management/commands/benchmark_recommendations.py
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from finlife.utils.recommend_bench import ALGORITHMS, run_benchmark
+
+COLUMNS = ('algorithm', 'users', 'queries', 'precision@k', 'recall@k', 'prepare_s', 'p50_ms', 'p95_ms', 'p99_ms', 'peak_mb')
+
+
+class Command(BaseCommand):
+    help = 'Offline evaluation of recommend/ algorithms on synthetic users (precision@k, recall@k, latency, memory). No DB writes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, nargs='+', default=[1000, 10000], help='One run per size, e.g. --users 1000 100000 1000000')
+        parser.add_argument('--options', type=int, default=400, help='Number of synthetic deposit+saving options')
+        parser.add_argument('--queries', type=int, default=200, help='Held-out users evaluated per run')
+        parser.add_argument('--k', type=int, default=6, help='Recommendations per user (recommend/ returns 6)')
+        parser.add_argument('--algorithms', nargs='+', default=list(ALGORITHMS), choices=list(ALGORITHMS))
+        parser.add_argument('--baseline-max-users', type=int, default=5000, help='Skip the O(N^2) baseline above this size')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--json', action='store_true', help='Print raw results as JSON')
+
+    def handle(self, *args, **options):
+        if options['k'] < 1:
+            raise CommandError('--k must be >= 1')
+        runs = []
+        for n_users in options['users']:
+            self.stdout.write(f"🐜 {n_users} users ...")
+            run = run_benchmark(
+                n_users=n_users, n_options=options['options'], n_queries=options['queries'], k=options['k'],
+                algorithms=options['algorithms'], baseline_max_users=options['baseline_max_users'], seed=options['seed'],
+            )
+            runs.append(run)
+            for name, reason in run['skipped'].items():
+                self.stdout.write(self.style.WARNING(f"  {name} skipped: {reason}"))
+
+        if options['json']:
+            self.stdout.write(json.dumps(runs, ensure_ascii=False, indent=2))
+            return
+
+        k = options['k']
+        rows = [
+            [str(r.get(col.replace('@k', f'@{k}'), '-')) for col in COLUMNS]
+            for run in runs for r in run['results']
+        ]
+        header = [col.replace('@k', f'@{k}') for col in COLUMNS]
+        widths = [max(len(h), *(len(row[i]) for row in rows)) if rows else len(h) for i, h in enumerate(header)]
+        self.stdout.write('  '.join(h.ljust(w) for h, w in zip(header, widths)))
+        for row in rows:
+            self.stdout.write('  '.join(v.ljust(w) for v, w in zip(row, widths)))
+        self.stdout.write(self.style.SUCCESS(f"Done ({len(rows)} runs)"))
@@ -0,0 +1,53 @@
+# backend/finlife/management/commands/build_factor_snapshots.py
+from datetime import date, datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from finlife.models import StockFactor
+from finlife.utils.quant_analysis import build_latest_factor_snapshot, save_factor_snapshot
+
+
+def _parse(value):
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+class Command(BaseCommand):
+    help = 'Build daily quant factor snapshots (pykrx -> StockFactor). Run once per business day.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=_parse, help='Single business day (YYYY-MM-DD)')
+        parser.add_argument('--start', type=_parse, help='Backfill from this day (YYYY-MM-DD)')
+        parser.add_argument('--end', type=_parse, help='Backfill up to this day (default: today)')
+        parser.add_argument('--market', default='KOSPI')
+        parser.add_argument('--force', action='store_true', help='Rebuild days that already have a snapshot')
+
+    def build_day(self, day, market, force):
+        if not force and StockFactor.objects.filter(date=day, market=market).exists():
+            self.stdout.write(f"{day}: already stored, skip")
+            return True
+        count = save_factor_snapshot(day.strftime('%Y%m%d'), market)
+        if count:
+            self.stdout.write(self.style.SUCCESS(f"{day}: {count} tickers saved"))
+        return count > 0
+
+    def handle(self, *args, **options):
+        market, force = options['market'], options['force']
+
+        if options['date']:
+            if not self.build_day(options['date'], market, force):
+                self.stdout.write(self.style.ERROR(f"{options['date']}: no market data (holiday?)"))
+            return
+
+        if options['start']:
+            day, end = options['start'], options['end'] or date.today()
+            while day <= end:
+                if day.weekday() < 5 and not self.build_day(day, market, force):
+                    self.stdout.write(f"{day}: no market data, skip")  # 공휴일
+                day += timedelta(days=1)
+            return
+
+        # 기본: 가장 최근 영업일 하나 (오늘이 휴장일이면 하루씩 거슬러 올라감)
+        day, count = build_latest_factor_snapshot(market)
+        if count:
+            self.stdout.write(self.style.SUCCESS(f"{day}: {count} tickers saved"))
+        else:
+            self.stdout.write(self.style.ERROR("No business day with market data in the last 10 days"))
@@ -0,0 +1,16 @@
+# backend/finlife/management/commands/build_ticker_index.py
+from django.core.management.base import BaseCommand
+from finlife.utils.ticker_index import TICKER_INDEX_SNAPSHOT, build_ticker_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the stock name/code search index from the current KRX mapping snapshot'
+
+    def handle(self, *args, **options):
+        index = build_ticker_index()
+        if len(index) <= 500:
+            self.stdout.write(self.style.ERROR(
+                f"KRX mapping snapshot missing or incomplete ({len(index)} names), run refresh_krx_mapping first"
+            ))
+            return
+        self.stdout.write(self.style.SUCCESS(f"Saved {len(index)} names to {TICKER_INDEX_SNAPSHOT.path}"))
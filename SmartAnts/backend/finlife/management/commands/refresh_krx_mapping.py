@@ -0,0 +1,29 @@
+# backend/finlife/management/commands/refresh_krx_mapping.py
+import time
+
+from django.core.management.base import BaseCommand
+from finlife.utils.external_api import KRX_MAPPING_SNAPSHOT, refresh_krx_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the KRX ticker->name mapping snapshot shared by all workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', type=int, default=0, metavar='SECONDS',
+            help='Keep running and refresh every SECONDS (e.g. 86400 for daily)',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                snapshot = refresh_krx_snapshot()
+                self.stdout.write(self.style.SUCCESS(
+                    f"Snapshot {snapshot['version']}: {len(snapshot['mapping'])} names -> {KRX_MAPPING_SNAPSHOT.path}"
+                ))
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"Error refreshing KRX mapping: {e}"))
+
+            if not options['loop']:
+                break
+            time.sleep(options['loop'])
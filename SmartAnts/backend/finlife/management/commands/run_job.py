@@ -0,0 +1,23 @@
+# backend/finlife/management/commands/run_job.py
+from django.core.management.base import BaseCommand, CommandError
+from finlife.scheduler import autodiscover_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = 'Run one background sync job right now (ignores its schedule, still respects the lock)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', help='Job name (see finlife/jobs.py)')
+
+    def handle(self, *args, **options):
+        jobs = autodiscover_jobs()
+        if options['name'] not in jobs:
+            raise CommandError(f"Unknown job '{options['name']}'. Available: {', '.join(jobs)}")
+
+        row = run_job(options['name'], force=True)
+        if row is None:
+            self.stdout.write(self.style.ERROR(f"{options['name']} is already running in another worker"))
+        elif row.status == 'success':
+            self.stdout.write(self.style.SUCCESS(f"{row.name}: {row.result} ({row.duration}s)"))
+        else:
+            self.stdout.write(self.style.ERROR(f"{row.name} failed: {row.error}"))
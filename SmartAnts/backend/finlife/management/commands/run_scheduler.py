@@ -0,0 +1,24 @@
+# backend/finlife/management/commands/run_scheduler.py
+from django.core.management.base import BaseCommand
+from finlife.scheduler import autodiscover_jobs, run_forever, run_pending
+
+
+class Command(BaseCommand):
+    help = 'Run registered background sync jobs (products, exchange rates, sector map, quant snapshots ...) on schedule'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Run due jobs once and exit (for cron)')
+        parser.add_argument('--tick', type=int, default=30, help='Seconds between schedule checks')
+
+    def handle(self, *args, **options):
+        if not options['once']:
+            run_forever(options['tick'])
+            return
+
+        for name, row in zip(autodiscover_jobs(), run_pending()):
+            if row is None:
+                self.stdout.write(f"{name}: not due or locked by another worker")
+            elif row.status == 'success':
+                self.stdout.write(self.style.SUCCESS(f"{name}: {row.result}"))
+            else:
+                self.stdout.write(self.style.ERROR(f"{name}: {row.error.splitlines()[0]}"))
@@ -0,0 +1,45 @@
+# backend/finlife/management/commands/warm_recommendations.py
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from finlife.recommendations import get_recommendations
+
+
+class Command(BaseCommand):
+    help = 'Precompute recommend/ payloads for active users into the cache. Run off-peak (e.g. cron at 04:00).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help='Users who logged in within this many days (0: everyone)')
+        parser.add_argument('--limit', type=int, help='Warm at most this many users (most recent logins first)')
+        parser.add_argument('--refresh', action='store_true', help='Recompute even if a cached payload exists')
+
+    def handle(self, *args, **options):
+        if settings.CACHES['default']['BACKEND'].endswith('LocMemCache'):
+            # 메모리 캐시는 이 프로세스에만 남아서 웹 워커에는 보이지 않음
+            self.stdout.write(self.style.WARNING(
+                "CACHES['default'] is per-process (LocMemCache): warmed entries won't reach web workers. "
+                "Set DJANGO_CACHE_BACKEND to a shared backend."
+            ))
+        users = get_user_model().objects.filter(is_active=True).order_by('-last_login', 'pk')
+        if options['days']:
+            users = users.filter(last_login__gte=timezone.now() - timedelta(days=options['days']))
+        if options['limit']:
+            users = users[:options['limit']]
+
+        started, count, custom = time.monotonic(), 0, 0
+        for user in users.iterator(chunk_size=500):
+            payload = get_recommendations(user, refresh=options['refresh'])
+            count += 1
+            custom += payload['type'] == 'custom'
+            if count % 1000 == 0:
+                self.stdout.write(f"{count} users warmed...")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Warmed {count} users in {elapsed:.1f}s ({custom} custom, {count - custom} best_rate)"
+        ))
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finlife', '0002_stockbar'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockFactor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('ticker', models.CharField(max_length=6)),
+                ('market', models.CharField(default='KOSPI', max_length=10)),
+                ('name', models.CharField(max_length=100)),
+                ('sector', models.CharField(default='기타', max_length=50)),
+                ('close', models.FloatField(default=0)),
+                ('market_cap', models.FloatField(default=0)),
+                ('trading_value', models.FloatField(default=0)),
+                ('div', models.FloatField(default=0)),
+                ('eps', models.FloatField(default=0)),
+                ('bps', models.FloatField(default=0)),
+                ('per', models.FloatField(default=0)),
+                ('pbr', models.FloatField(default=0)),
+                ('dps', models.FloatField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['market', 'date'], name='stock_factor_market_date')],
+                'constraints': [models.UniqueConstraint(fields=('date', 'ticker'), name='unique_stock_factor')],
+            },
+        ),
+    ]
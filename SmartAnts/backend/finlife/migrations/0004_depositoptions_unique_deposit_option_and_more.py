@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finlife', '0003_stockfactor'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='depositoptions',
+            constraint=models.UniqueConstraint(fields=('product', 'intr_rate_type_nm', 'save_trm'), name='unique_deposit_option'),
+        ),
+        migrations.AddConstraint(
+            model_name='savingoptions',
+            constraint=models.UniqueConstraint(fields=('product', 'intr_rate_type_nm', 'save_trm'), name='unique_saving_option'),
+        ),
+    ]
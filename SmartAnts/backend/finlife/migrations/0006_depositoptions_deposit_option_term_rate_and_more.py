@@ -0,0 +1,31 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finlife', '0005_syncjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='depositoptions',
+            index=models.Index(fields=['save_trm', 'intr_rate2'], name='deposit_option_term_rate'),
+        ),
+        migrations.AddIndex(
+            model_name='depositproduct',
+            index=models.Index(fields=['kor_co_nm'], name='deposit_product_bank'),
+        ),
+        migrations.AddIndex(
+            model_name='savingoptions',
+            index=models.Index(fields=['save_trm', 'intr_rate2'], name='saving_option_term_rate'),
+        ),
+        migrations.AddIndex(
+            model_name='savingproduct',
+            index=models.Index(fields=['kor_co_nm'], name='saving_product_bank'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def seed_current_rates(apps, schema_editor):
+    # 이미 저장돼 있던 옵션은 현재 금리를 첫 이력으로 남김 (스파크라인 시작점)
+    today = timezone.localdate()
+    for option_name, history_name in (('DepositOptions', 'DepositRateHistory'), ('SavingOptions', 'SavingRateHistory')):
+        Option = apps.get_model('finlife', option_name)
+        History = apps.get_model('finlife', history_name)
+        History.objects.bulk_create([
+            History(option_id=pk, date=today, intr_rate=rate, intr_rate2=rate2)
+            for pk, rate, rate2 in Option.objects.values_list('pk', 'intr_rate', 'intr_rate2')
+        ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finlife', '0006_depositoptions_deposit_option_term_rate_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DepositRateHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('intr_rate', models.FloatField(null=True)),
+                ('intr_rate2', models.FloatField(null=True)),
+                ('prev_intr_rate', models.FloatField(null=True)),
+                ('prev_intr_rate2', models.FloatField(null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('option', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rate_history', to='finlife.depositoptions')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['option', 'date'], name='deposit_rate_history_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SavingRateHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('intr_rate', models.FloatField(null=True)),
+                ('intr_rate2', models.FloatField(null=True)),
+                ('prev_intr_rate', models.FloatField(null=True)),
+                ('prev_intr_rate2', models.FloatField(null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('option', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rate_history', to='finlife.savingoptions')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['option', 'date'], name='saving_rate_history_idx')],
+            },
+        ),
+        migrations.RunPython(seed_current_rates, migrations.RunPython.noop),
+    ]
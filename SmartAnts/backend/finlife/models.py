@@ -16,6 +16,9 @@ class DepositProduct(models.Model):
     join_way = models.TextField(blank=True, null=True) # 가입 방법
     spcl_cnd = models.TextField(blank=True, null=True) # 우대 조건
     
+    class Meta:
+        indexes = [models.Index(fields=['kor_co_nm'], name='deposit_product_bank')]
+
     def __str__(self):
         return f"[{self.kor_co_nm}] {self.fin_prdt_nm}"
 
@@ -37,6 +40,14 @@ class DepositOptions(models.Model):
         blank=True
     )
 
+    class Meta:
+        # 상품 동기화 upsert 기준 (같은 상품의 같은 금리유형/기간 옵션은 하나만)
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'intr_rate_type_nm', 'save_trm'], name='unique_deposit_option'),
+        ]
+        # 목록 필터 (기간 + 최고 우대금리)
+        indexes = [models.Index(fields=['save_trm', 'intr_rate2'], name='deposit_option_term_rate')]
+
 # --- [F03 추가] 적금 상품 및 옵션 ---
 # 2-1. 적금 상품 (기본 정보)
 class SavingProduct(models.Model):
@@ -49,6 +60,9 @@ class SavingProduct(models.Model):
     join_way = models.TextField(blank=True, null=True)
     spcl_cnd = models.TextField(blank=True, null=True)
     
+    class Meta:
+        indexes = [models.Index(fields=['kor_co_nm'], name='saving_product_bank')]
+
     def __str__(self):
         return f"[{self.kor_co_nm}] {self.fin_prdt_nm}"
     
@@ -67,6 +81,14 @@ class SavingOptions(models.Model):
         blank=True
     )
 
+    class Meta:
+        # 상품 동기화 upsert 기준 (같은 상품의 같은 금리유형/기간 옵션은 하나만)
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'intr_rate_type_nm', 'save_trm'], name='unique_saving_option'),
+        ]
+        # 목록 필터 (기간 + 최고 우대금리)
+        indexes = [models.Index(fields=['save_trm', 'intr_rate2'], name='saving_option_term_rate')]
+
 
 # --- [F03] 현물(금/은) 시세 데이터 ---
 # 3.
@@ -91,3 +113,109 @@ class ExchangeRate(models.Model):
     reference_date = models.DateField(null=True, blank=True) # 기준 날짜
     created_at = models.DateTimeField(auto_now_add=True)
 
+
+
+# --- [F05] 주식 일봉 저장소 ---
+# 5. 종목별 일봉(OHLCV). 주봉/월봉은 이 일봉을 리샘플링해서 만듦
+class StockBar(models.Model):
+    symbol = models.CharField(max_length=30)   # 야후 티커 (005930.KS, AAPL ...)
+    date = models.DateField()                   # 거래일 (거래소 현지 날짜)
+    open = models.FloatField()
+    high = models.FloatField()
+    low = models.FloatField()
+    close = models.FloatField()
+    volume = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['symbol', 'date'], name='unique_stock_bar'),
+        ]
+
+# 6. 종목별 저장 구간 (어디부터 받아놨는지, 마지막 동기화 시각)
+class StockBarSync(models.Model):
+    symbol = models.CharField(max_length=30, unique=True)
+    covered_from = models.DateField()           # 이 날짜 이후는 저장소에 다 있음
+    synced_at = models.DateTimeField()          # 마지막으로 꼬리(최신 봉)를 받아온 시각
+
+
+
+# --- [F06] 퀀트 팩터 스냅샷 ---
+# 7. 영업일별 종목 팩터 (가격/시총/거래대금/펀더멘털/섹터). 하루 1번 build_factor_snapshots 가 채움
+class StockFactor(models.Model):
+    date = models.DateField()                          # 기준 영업일
+    ticker = models.CharField(max_length=6)            # KRX 종목코드 (005930)
+    market = models.CharField(max_length=10, default='KOSPI')
+    name = models.CharField(max_length=100)
+    sector = models.CharField(max_length=50, default='기타')
+    close = models.FloatField(default=0)               # 종가
+    market_cap = models.FloatField(default=0)          # 시가총액
+    trading_value = models.FloatField(default=0)       # 거래대금
+    div = models.FloatField(default=0)                 # 배당수익률 (%)
+    eps = models.FloatField(default=0)
+    bps = models.FloatField(default=0)
+    per = models.FloatField(default=0)
+    pbr = models.FloatField(default=0)
+    dps = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'ticker'], name='unique_stock_factor'),
+        ]
+        indexes = [
+            models.Index(fields=['market', 'date'], name='stock_factor_market_date'),
+        ]
+
+
+
+# --- [F07] 백그라운드 동기화 작업 ---
+# 8. 스케줄러 작업별 실행 상태 + DB 잠금 (locked_until 이 지나기 전에는 다른 워커가 실행 못 함)
+class SyncJob(models.Model):
+    STATUS_CHOICES = [('idle', '대기'), ('running', '실행 중'), ('success', '성공'), ('failed', '실패')]
+    name = models.CharField(max_length=50, unique=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='idle')
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_success_at = models.DateTimeField(null=True, blank=True)
+    next_run_at = models.DateTimeField(null=True, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    duration = models.FloatField(null=True, blank=True)     # 마지막 실행 시간 (초)
+    result = models.JSONField(null=True, blank=True)        # 마지막 실행 결과 요약
+    error = models.TextField(blank=True, default='')
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+
+
+# --- [F08] 금리 변경 이력 ---
+# 9. 옵션별 금리 이력 (추가만 함). 상품 동기화에서 금리가 실제로 바뀌었을 때(또는 옵션이 새로 생겼을 때)만 한 줄씩 기록
+class RateHistoryBase(models.Model):
+    date = models.DateField()                               # 변경이 반영된 날짜
+    intr_rate = models.FloatField(null=True)
+    intr_rate2 = models.FloatField(null=True)
+    prev_intr_rate = models.FloatField(null=True)           # 직전 금리 (새 옵션이면 null)
+    prev_intr_rate2 = models.FloatField(null=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)  # 변경 피드(since) 조회용
+
+    class Meta:
+        abstract = True
+
+class DepositRateHistory(RateHistoryBase):
+    option = models.ForeignKey(DepositOptions, on_delete=models.CASCADE, related_name='rate_history')
+
+    class Meta:
+        indexes = [models.Index(fields=['option', 'date'], name='deposit_rate_history_idx')]
+
+class SavingRateHistory(RateHistoryBase):
+    option = models.ForeignKey(SavingOptions, on_delete=models.CASCADE, related_name='rate_history')
+
+    class Meta:
+        indexes = [models.Index(fields=['option', 'date'], name='saving_rate_history_idx')]
+
+
+# --- [F03 추가] 맞춤 추천 캐시 버전 ---
+# 10. 유저별 추천 캐시 버전. 프로필/가입 상품이 바뀌면 signals 에서 1 올림
+#     캐시(워커별 메모리일 수도 있음)에 넣은 추천은 이 버전과 다르면 버림 -> 어느 워커에서 바뀌어도 모든 워커에 반영
+class RecommendationVersion(models.Model):
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='recommendation_version')
+    version = models.PositiveIntegerField(default=0)
@@ -0,0 +1,13 @@
+# backend/finlife/pagination.py
+from rest_framework.pagination import CursorPagination
+
+
+class CataloguePagination(CursorPagination):
+    """예금/적금 목록 커서 페이지네이션 (정렬 키는 요청의 sort 에 따라 뷰가 넘겨줌)"""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def __init__(self, ordering=None):
+        if ordering:
+            self.ordering = ordering
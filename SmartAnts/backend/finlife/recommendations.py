@@ -0,0 +1,172 @@
+# backend/finlife/recommendations.py
+import logging
+
+from django.core.cache import cache
+from django.db.models import F
+
+from .catalogue_cache import catalogue_version
+from .models import DepositOptions, RecommendationVersion, SavingOptions
+from .serializers import DepositOptionsSerializer, SavingOptionsSerializer
+from .utils import subscription_matrix, user_index
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# 🐜 맞춤 예금/적금 추천 (recommend/ 응답 본문 생성 + 유저별 캐시)
+# =========================================================
+# - 키: recommend:<user id>, 값에 카탈로그 버전 + 유저 추천 버전을 같이 저장 -> 둘 중 하나라도 바뀌면 다음 요청에서 다시 계산
+# - 내 프로필(생일/연봉/자산/성향/닉네임)이나 내 가입 상품이 바뀌면 signals 에서 유저 추천 버전(DB)을 올림
+#   (캐시가 워커별 LocMem 이어도 버전은 DB 에 있어서 모든 워커가 다음 읽기에서 바로 버림)
+# - 이웃 유저들의 가입 변화는 TTL(1시간) 안에서만 늦게 반영됨
+# - 새벽에 warm_recommendations 커맨드로 활성 유저 전체를 미리 채워둘 수 있음
+
+RECOMMEND_CACHE_TTL = 60 * 60
+PROFILE_FIELDS = user_index.FEATURE_FIELDS | {'risk_appetite', 'nickname'}
+
+
+def _cache_key(user_id):
+    return f'recommend:{user_id}'
+
+
+def option_kind(option):
+    return 'deposit' if isinstance(option, DepositOptions) else 'saving'
+
+
+def joined_option_ids(user):
+    my_deposit_ids = set(user.subscribed_deposits.values_list('id', flat=True))
+    my_saving_ids = set(user.subscribed_savings.values_list('id', flat=True))
+    return my_deposit_ids, my_saving_ids
+
+
+# 🐜 헬퍼 함수: 베스트 상품 추천 (중복 제외 기능 추가됨)
+def best_products_payload(user, joined_ids, is_new_user=False, is_no_data=False):
+    # 내가 가입한 ID 제외하고 조회
+    top_deposits = DepositOptions.objects.exclude(id__in=joined_ids).order_by('-intr_rate2')[:3]
+    top_savings = SavingOptions.objects.exclude(id__in=joined_ids).order_by('-intr_rate2')[:3]
+
+    combined_data = (
+        DepositOptionsSerializer(top_deposits, many=True).data +
+        SavingOptionsSerializer(top_savings, many=True).data
+    )
+
+    msg = '최고 금리 상품들을 모아봤어요!'
+    if is_new_user:
+        msg = '프로필 정보를 입력하시면 더 정확한 맞춤 추천이 가능해요! 인기 상품부터 둘러보세요.'
+    elif is_no_data:
+        msg = '비슷한 유저 데이터가 부족하여 금리순으로 보여드려요!'
+
+    return {
+        'type': 'best_rate',
+        'message': msg,
+        'data': combined_data
+    }
+
+
+def build_recommendations(user):
+    # 🐜 1. 내가 이미 가입한 상품 ID 목록 추출 (중복 추천 방지용)
+    # related_name이 'subscribed_deposits', 'subscribed_savings'로 설정되어 있어야 함
+    my_deposit_ids, my_saving_ids = joined_option_ids(user)
+    my_joined_ids = my_deposit_ids | my_saving_ids # 합집합
+
+    # ----------------------------------------
+    # [알고리즘 1단계] 유사 유저 기반 필터링 (Collaborative Filtering)
+    # ----------------------------------------
+    # 전체 유저 N x N 유사도 대신, 미리 정규화해 둔 유저 인덱스에서 내 행 하나만 계산 (utils/user_index.py)
+    similar_user_ids = user_index.similar_user_ids(user, k=10)
+
+    # 내 정보가 없으면(신규) 베스트 상품
+    if similar_user_ids is None:
+        return best_products_payload(user, my_joined_ids, is_new_user=True)
+    # 비교할 다른 유저가 없으면 베스트 상품
+    if not similar_user_ids:
+        return best_products_payload(user, my_joined_ids, is_no_data=True)
+
+    # 유사 유저들의 가입 상품 집계: 가입 행렬에 이웃 벡터를 곱해서 한 번에 (utils/subscription_matrix.py)
+    # 키는 (kind, option_id) 라 예금/적금 id 가 같아도 섞이지 않음
+    my_joined_keys = {('deposit', pk) for pk in my_deposit_ids} | {('saving', pk) for pk in my_saving_ids}
+    most_common = subscription_matrix.get_subscription_matrix().neighbour_counts(
+        similar_user_ids, exclude=my_joined_keys, limit=10,  # 넉넉하게 10개 뽑음
+    )
+
+    # 추천할 게 없으면 베스트 상품
+    if not most_common:
+        return best_products_payload(user, my_joined_ids, is_no_data=True)
+
+    # 가장 많이 가입된 상품
+    counter = dict(most_common)
+    rec_deposits = list(DepositOptions.objects.filter(id__in=[pk for kind, pk in counter if kind == 'deposit']))
+    rec_savings = list(SavingOptions.objects.filter(id__in=[pk for kind, pk in counter if kind == 'saving']))
+
+    candidates = rec_deposits + rec_savings
+
+    # ----------------------------------------
+    # [알고리즘 2단계] 투자 성향(Risk Appetite) 반영 정렬
+    # ----------------------------------------
+    # user.risk_appetite: 1(안정) ~ 5(공격)
+    risk_score = user.risk_appetite if user.risk_appetite else 3
+
+    if risk_score >= 4:
+        # 공격형: 최고 우대 금리(intr_rate2) 높은 순
+        candidates.sort(key=lambda x: x.intr_rate2 if x.intr_rate2 else 0, reverse=True)
+        msg = f'{user.nickname}님의 공격적인 투자 성향에 맞춰 수익률이 높은 상품을 우선 추천해요! 🔥'
+
+    elif risk_score <= 2:
+        # 안정형: 기본 금리(intr_rate) 높은 순 (조건 없이 받는 돈 중요)
+        candidates.sort(key=lambda x: x.intr_rate if x.intr_rate else 0, reverse=True)
+        msg = f'{user.nickname}님의 신중한 성향을 고려해 기본 금리가 튼튼한 상품을 모았어요! 🛡️'
+
+    else:
+        # 중립형: 인기순(가입한 이웃 수) 유지
+        # candidates는 DB 쿼리 결과라 순서가 섞였을 수 있으니 가입 이웃 수로 재정렬
+        candidates.sort(key=lambda x: counter[(option_kind(x), x.id)], reverse=True)
+        msg = f'{user.nickname}님과 비슷한 자산/연령대 유저들이 가장 많이 선택한 상품이에요! 🐜'
+
+    # 최종 상위 5~6개만 슬라이싱
+    final_list = candidates[:6]
+
+    combined_data = (
+        DepositOptionsSerializer([x for x in final_list if isinstance(x, DepositOptions)], many=True).data +
+        SavingOptionsSerializer([x for x in final_list if isinstance(x, SavingOptions)], many=True).data
+    )
+
+    return {
+        'type': 'custom',
+        'message': msg,
+        'data': combined_data
+    }
+
+
+def get_recommendations(user, refresh=False):
+    """캐시된 추천 (없거나 카탈로그가 바뀌었으면 새로 계산). 알고리즘 에러 시 베스트 상품 (캐시 안 함)"""
+    user_version = RecommendationVersion.objects.filter(user_id=user.pk).values_list('version', flat=True).first() or 0
+    version = f'{catalogue_version()[0]}:{user_version}'
+    key = _cache_key(user.pk)
+    entry = None if refresh else cache.get(key)
+    if entry and entry['version'] == version:
+        return entry['payload']
+
+    try:
+        payload = build_recommendations(user)
+    except Exception as e:
+        logger.exception("추천 알고리즘 에러: %s", e)
+        # 에러 시에도 내가 가입한건 빼고 베스트 상품 추천
+        my_deposit_ids, my_saving_ids = joined_option_ids(user)
+        return best_products_payload(user, my_deposit_ids | my_saving_ids, is_no_data=True)
+
+    cache.set(key, {'version': version, 'payload': payload}, RECOMMEND_CACHE_TTL)
+    return payload
+
+
+def drop_cached_recommendations(user_ids):
+    cache.delete_many([_cache_key(user_id) for user_id in user_ids])
+
+
+def invalidate_recommendations(user_ids):
+    """유저들의 추천 버전을 올림 (없으면 1로 생성). 이 워커의 캐시는 바로 지우고, 다른 워커 캐시는 버전 비교로 버려짐"""
+    user_ids = set(user_ids)
+    drop_cached_recommendations(user_ids)
+    existing = set(RecommendationVersion.objects.filter(user_id__in=user_ids).values_list('user_id', flat=True))
+    RecommendationVersion.objects.filter(user_id__in=existing).update(version=F('version') + 1)
+    RecommendationVersion.objects.bulk_create(
+        [RecommendationVersion(user_id=user_id, version=1) for user_id in user_ids - existing], ignore_conflicts=True,
+    )
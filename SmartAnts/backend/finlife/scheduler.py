@@ -0,0 +1,118 @@
+# backend/finlife/scheduler.py
+import logging
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import SyncJob
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# 🐜 백그라운드 동기화 스케줄러
+# =========================================================
+# - 각 앱의 jobs.py 에서 @register_job 으로 작업 등록 (autodiscover_jobs 가 모두 import)
+# - 작업마다 SyncJob 행 하나: 조건부 UPDATE 로 locked_until 을 선점한 워커만 실행
+#   (여러 프로세스에서 run_scheduler 를 띄워도 같은 작업은 한 곳에서만 돎)
+# - 요청 처리 코드는 외부 API를 부르지 않고 이 작업들이 채운 DB만 읽음
+# 실행: python manage.py run_scheduler  /  한 작업만: python manage.py run_job products
+
+JOBS = {}
+RETRY_DELAY = 60 * 10  # 실패한 작업은 주기와 상관없이 10분 뒤 재시도
+
+
+class Job:
+    def __init__(self, name, func, interval, lock_timeout):
+        self.name = name
+        self.func = func
+        self.interval = interval            # 실행 주기 (초)
+        self.lock_timeout = lock_timeout    # 실행하다 죽은 워커의 잠금이 풀리는 시간 (초)
+
+
+def register_job(name, interval, lock_timeout=60 * 30):
+    def decorator(func):
+        JOBS[name] = Job(name, func, interval, lock_timeout)
+        return func
+    return decorator
+
+
+def autodiscover_jobs():
+    autodiscover_modules('jobs')
+    return JOBS
+
+
+def _acquire(job, now, force=False):
+    SyncJob.objects.get_or_create(name=job.name)
+    free = Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+    if not force:
+        free &= Q(next_run_at__isnull=True) | Q(next_run_at__lte=now)
+    # 조건부 UPDATE 한 번 -> 동시에 시도해도 한 워커만 1행을 갱신함
+    return SyncJob.objects.filter(name=job.name).filter(free).update(
+        status='running', started_at=now, locked_until=now + timedelta(seconds=job.lock_timeout),
+    ) == 1
+
+
+def run_job(name, force=False):
+    """작업 하나 실행. 다른 워커가 실행 중이거나 아직 주기가 안 됐으면 None"""
+    job = autodiscover_jobs()[name]
+    now = timezone.now()
+    if not _acquire(job, now, force):
+        return None
+
+    started = time.monotonic()
+    fields = {'locked_until': None, 'next_run_at': now + timedelta(seconds=job.interval)}
+    try:
+        result = job.func()
+        finished = timezone.now()
+        fields.update(status='success', result=result, error='', last_success_at=finished)
+        logger.info("🐜 [scheduler] %s 완료: %s", name, result)
+    except Exception as e:
+        finished = timezone.now()
+        fields.update(status='failed', error=f"{e}\n{traceback.format_exc()}"[-4000:])
+        fields['next_run_at'] = now + timedelta(seconds=min(job.interval, RETRY_DELAY))
+        logger.error("🚨 [scheduler] %s 실패: %s", name, e)
+    fields.update(finished_at=finished, duration=round(time.monotonic() - started, 3))
+    SyncJob.objects.filter(name=name).update(**fields)
+    return SyncJob.objects.get(name=name)
+
+
+def request_run(name):
+    """주기와 상관없이 다음 tick 에 돌도록 요청 (실행 중이면 끝난 뒤 잠금이 풀리면)"""
+    SyncJob.objects.filter(name=name).update(next_run_at=timezone.now())
+
+
+def run_pending():
+    """주기가 된 작업 전부 실행 (잠금은 작업별로 따로)"""
+    return [run_job(name) for name in autodiscover_jobs()]
+
+
+def run_forever(tick=30):
+    logger.info("🐜 [scheduler] 시작 (%s): %s", socket.gethostname(), ', '.join(autodiscover_jobs()))
+    while True:
+        run_pending()
+        time.sleep(tick)
+
+
+def job_status():
+    rows = {row.name: row for row in SyncJob.objects.all()}
+    result = []
+    for name, job in autodiscover_jobs().items():
+        row = rows.get(name)
+        result.append({
+            'name': name,
+            'interval': job.interval,
+            'status': row.status if row else 'idle',
+            'started_at': row.started_at if row else None,
+            'finished_at': row.finished_at if row else None,
+            'last_success_at': row.last_success_at if row else None,
+            'next_run_at': row.next_run_at if row else None,
+            'duration': row.duration if row else None,
+            'result': row.result if row else None,
+            'error': row.error.splitlines()[0] if row and row.error else '',
+        })
+    return result
@@ -1,3 +1,5 @@
+from django.db.models import Exists, Max, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
 from .models import DepositProduct, DepositOptions, SavingProduct, SavingOptions, ExchangeRate
 
@@ -45,47 +47,74 @@ class SavingOptionsSerializer(serializers.ModelSerializer):
 # ==========================================================
 # 3. 상품 상세 시리얼라이저 (옵션 리스트 포함)
 # ==========================================================
-class DepositProductSerializer(serializers.ModelSerializer):
-    # Simple 버전을 쓰지 않고, 위에서 정의한 OptionsSerializer 사용
-    options = DepositOptionsSerializer(many=True, read_only=True)
-    intr_rate = serializers.SerializerMethodField()
-    max_intr_rate = serializers.SerializerMethodField()
+# 목록 API는 with_option_rates() 로 만든 쿼리셋을 넘김
+# -> 옵션은 prefetch 한 번, 기본/최고 금리는 DB 주석(annotate)으로 받아서 상품 수와 상관없이 쿼리 2번
+OPTION_LIST_FIELDS = ('id', 'fin_prdt_cd', 'intr_rate_type_nm', 'save_trm', 'intr_rate', 'intr_rate2')
+
+
+def with_option_rates(queryset, OptionModel, option_filters=None):
+    """
+    상품 쿼리셋 + 옵션 prefetch + first_intr_rate(첫 옵션 기본금리) / max_intr_rate2(최고 우대금리)
+    option_filters (예: {'save_trm': 12}) 가 있으면 조건에 맞는 옵션이 있는 상품만 남기고,
+    최고 우대금리도 그 옵션들 기준으로 계산 (목록 정렬/필터용)
+    """
+    option_filters = option_filters or {}
+    first_option = OptionModel.objects.filter(product=OuterRef('pk')).order_by('pk')
+    if option_filters:
+        queryset = queryset.filter(Exists(OptionModel.objects.filter(product=OuterRef('pk'), **option_filters)))
+    max_filter = Q(**{f'options__{key}': value for key, value in option_filters.items()})
+    return queryset.annotate(
+        first_intr_rate=Subquery(first_option.values('intr_rate')[:1]),
+        max_intr_rate2=Coalesce(Max('options__intr_rate2', filter=max_filter), 0.0),
+    ).prefetch_related(
+        Prefetch('options', queryset=OptionModel.objects.order_by('pk').only(*OPTION_LIST_FIELDS, 'product'))
+    )
+
+
+# 상품 안에 넣는 옵션 (부모 상품/가입자 목록은 다시 싣지 않음)
+class DepositProductOptionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DepositOptions
+        fields = OPTION_LIST_FIELDS
 
+class SavingProductOptionSerializer(serializers.ModelSerializer):
     class Meta:
-        model = DepositProduct
-        fields = '__all__'
+        model = SavingOptions
+        fields = OPTION_LIST_FIELDS
+
 
+class ProductRateMixin:
+    # annotate 안 된 쿼리셋이 들어와도 동작하도록 옵션에서 직접 계산 (prefetch 돼 있으면 추가 쿼리 없음)
     def get_intr_rate(self, obj):
-        # 역참조 매니저 이름 확인 (depositoptions_set 또는 options)
-        options = getattr(obj, 'depositoptions_set', getattr(obj, 'options', None))
-        return options.first().intr_rate if (options and options.exists()) else 0
+        if hasattr(obj, 'first_intr_rate'):
+            return obj.first_intr_rate if obj.first_intr_rate is not None else 0
+        options = sorted(obj.options.all(), key=lambda opt: opt.pk)
+        return options[0].intr_rate if options else 0
 
     def get_max_intr_rate(self, obj):
-        options = getattr(obj, 'depositoptions_set', getattr(obj, 'options', None))
-        if options and options.exists():
-            rates = [opt.intr_rate2 for opt in options.all() if opt.intr_rate2 is not None]
-            return max(rates) if rates else 0
-        return 0
-
-class SavingProductSerializer(serializers.ModelSerializer):
-    options = SavingOptionsSerializer(many=True, read_only=True)
+        if hasattr(obj, 'max_intr_rate2'):
+            return obj.max_intr_rate2
+        rates = [opt.intr_rate2 for opt in obj.options.all() if opt.intr_rate2 is not None]
+        return max(rates) if rates else 0
+
+
+class DepositProductSerializer(ProductRateMixin, serializers.ModelSerializer):
+    options = DepositProductOptionSerializer(many=True, read_only=True)
     intr_rate = serializers.SerializerMethodField()
     max_intr_rate = serializers.SerializerMethodField()
 
     class Meta:
-        model = SavingProduct
+        model = DepositProduct
         fields = '__all__'
 
-    def get_intr_rate(self, obj):
-        options = getattr(obj, 'savingoptions_set', getattr(obj, 'options', None))
-        return options.first().intr_rate if (options and options.exists()) else 0
+class SavingProductSerializer(ProductRateMixin, serializers.ModelSerializer):
+    options = SavingProductOptionSerializer(many=True, read_only=True)
+    intr_rate = serializers.SerializerMethodField()
+    max_intr_rate = serializers.SerializerMethodField()
 
-    def get_max_intr_rate(self, obj):
-        options = getattr(obj, 'savingoptions_set', getattr(obj, 'options', None))
-        if options and options.exists():
-            rates = [opt.intr_rate2 for opt in options.all() if opt.intr_rate2 is not None]
-            return max(rates) if rates else 0
-        return 0
+    class Meta:
+        model = SavingProduct
+        fields = '__all__'
 
 
 # ==========================================================
@@ -103,4 +132,21 @@ class JoinedSavingOptionSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = SavingOptions
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+# ==========================================================
+# 5. 함께 가입한 상품용 (공개 API라 가입자 목록 contract_user 는 빼고 내보냄)
+# ==========================================================
+class RelatedDepositOptionSerializer(serializers.ModelSerializer):
+    product = SimpleDepositProductSerializer(read_only=True)
+
+    class Meta:
+        model = DepositOptions
+        fields = OPTION_LIST_FIELDS + ('product',)
+
+class RelatedSavingOptionSerializer(serializers.ModelSerializer):
+    product = SimpleSavingProductSerializer(read_only=True)
+
+    class Meta:
+        model = SavingOptions
+        fields = OPTION_LIST_FIELDS + ('product',)
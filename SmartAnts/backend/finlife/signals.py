@@ -0,0 +1,62 @@
+# backend/finlife/signals.py
+import logging
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from .models import DepositOptions, SavingOptions
+from .recommendations import PROFILE_FIELDS, drop_cached_recommendations, invalidate_recommendations
+from .utils.subscription_matrix import update_subscriptions
+from .utils.user_index import FEATURE_FIELDS, update_user_in_index, remove_user_from_index
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+# 🐜 프로필(생일/연봉/자산)이 바뀐 유저만 유사 유저 인덱스에 바로 반영 + 내 추천 캐시 삭제
+@receiver(post_save, sender=User)
+def sync_user_index(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not PROFILE_FIELDS & set(update_fields):
+        return  # last_login 갱신 같은 저장은 무시
+    invalidate_recommendations([instance.pk])
+    if update_fields and not FEATURE_FIELDS & set(update_fields):
+        return  # 성향/닉네임만 바뀌면 인덱스는 그대로
+    try:
+        update_user_in_index(instance)
+    except Exception as e:
+        logger.warning("User index update error: %s", e)
+
+
+@receiver(post_delete, sender=User)
+def drop_user_index(sender, instance, **kwargs):
+    remove_user_from_index(instance.pk)
+    drop_cached_recommendations([instance.pk])   # 추천 버전 행은 유저와 같이 삭제됨 (CASCADE)
+
+
+# 🐜 가입/해지(option.contract_user.add/remove, user.subscribed_*.add/remove 모두)를 가입 행렬에 반영
+#    + 가입 상품이 바뀐 유저의 추천 캐시 삭제
+def sync_subscription_matrix(kind, OptionModel):
+    def handler(sender, instance, action, reverse, pk_set, **kwargs):
+        if action not in ('post_add', 'post_remove', 'pre_clear'):
+            return
+        if action == 'pre_clear':
+            # clear 는 pk_set 이 없어서 지우기 전에 현재 연결을 읽음
+            if reverse:
+                manager = instance.subscribed_deposits if kind == 'deposit' else instance.subscribed_savings
+            else:
+                manager = instance.contract_user
+            pk_set = set(manager.values_list('pk', flat=True))
+        user_ids, option_ids = ([instance.pk], pk_set) if reverse else (pk_set, [instance.pk])
+        invalidate_recommendations(user_ids)
+        try:
+            update_subscriptions(user_ids, [(kind, pk) for pk in option_ids], joined=action == 'post_add')
+        except Exception as e:
+            logger.warning("Subscription matrix update error: %s", e)
+    m2m_changed.connect(handler, sender=OptionModel.contract_user.through, weak=False,
+                        dispatch_uid=f'subscription_matrix_{kind}')
+
+
+sync_subscription_matrix('deposit', DepositOptions)
+sync_subscription_matrix('saving', SavingOptions)
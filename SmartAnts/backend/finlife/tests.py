@@ -1,3 +1,807 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import DepositProduct, DepositOptions, SavingProduct, SavingOptions, SyncJob
+
+
+def make_catalogue(ProductModel, OptionModel, count, start=0):
+    for i in range(start, start + count):
+        product = ProductModel.objects.create(fin_prdt_cd=f'P{i:04d}', kor_co_nm=f'은행{i % 5}', fin_prdt_nm=f'상품{i}')
+        for trm, rate in ((6, 2.0), (12, 3.0), (24, 3.5)):
+            OptionModel.objects.create(
+                product=product, fin_prdt_cd=product.fin_prdt_cd, intr_rate_type_nm='단리',
+                save_trm=trm, intr_rate=rate + i / 100, intr_rate2=rate + 1 + i / 100,
+            )
+
+
+class ProductListQueryCountTest(TestCase):
+    """deposits/ savings/ 쿼리 수는 상품 수와 상관없이 일정해야 함 (N+1 회귀 방지)"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def count_queries(self, url):
+        cache.clear()  # 응답 캐시 말고 실제 목록 쿼리 수를 잼
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        return len(ctx), res.json()
+
+    def check_constant(self, url, ProductModel, OptionModel):
+        make_catalogue(ProductModel, OptionModel, 2)
+        small, _ = self.count_queries(url)
+        make_catalogue(ProductModel, OptionModel, 30, start=2)
+        large, data = self.count_queries(url)
+
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, 3)  # 카탈로그 버전 1 + 상품 1 + 옵션 prefetch 1
+        self.assertEqual(len(data), 32)
+        first = next(p for p in data if p['fin_prdt_cd'] == 'P0001')
+        self.assertEqual(first['intr_rate'], 2.01)       # 첫 옵션(6개월) 기본 금리
+        self.assertEqual(first['max_intr_rate'], 4.51)   # 옵션 중 최고 우대 금리
+        self.assertEqual([opt['save_trm'] for opt in first['options']], [6, 12, 24])
+        self.assertNotIn('product', first['options'][0])
+
+    def test_deposits(self):
+        self.check_constant('/api/finlife/deposits/', DepositProduct, DepositOptions)
+
+    def test_savings(self):
+        self.check_constant('/api/finlife/savings/', SavingProduct, SavingOptions)
+
+
+class ProductCatalogueFilterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        make_catalogue(DepositProduct, DepositOptions, 25)
+
+    def test_filters(self):
+        data = self.client.get('/api/finlife/deposits/', {'bank': '은행1,은행2', 'min_rate': 4.2}).json()
+        self.assertEqual({p['kor_co_nm'] for p in data}, {'은행1', '은행2'})
+        self.assertTrue(all(p['max_intr_rate'] >= 4.2 for p in data))
+
+        data = self.client.get('/api/finlife/deposits/', {'save_trm': 12, 'sort': 'rate'}).json()
+        self.assertEqual(data[0]['fin_prdt_cd'], 'P0024')
+        self.assertEqual(data[0]['max_intr_rate'], 4.24)  # 12개월 옵션 기준 최고 우대금리
+
+        self.assertEqual(self.client.get('/api/finlife/deposits/', {'save_trm': 'x'}).status_code, 400)
+        for bad in ('nan', 'inf', '-Infinity'):
+            self.assertEqual(self.client.get('/api/finlife/deposits/', {'min_rate': bad}).status_code, 400)
+        self.assertEqual(self.client.get('/api/finlife/deposits/', {'sort': 'nope'}).status_code, 400)
+
+    def test_cursor_pagination(self):
+        seen, url, params = [], '/api/finlife/deposits/', {'page_size': 10, 'sort': 'rate'}
+        while url:
+            res = self.client.get(url, params).json()
+            self.assertLessEqual(len(res['results']), 10)
+            seen += [p['fin_prdt_cd'] for p in res['results']]
+            url, params = res['next'], None
+        self.assertEqual(seen, [f'P{i:04d}' for i in reversed(range(25))])
+
+
+class ProductCatalogueCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        make_catalogue(DepositProduct, DepositOptions, 3)
+        SyncJob.objects.create(name='products', last_success_at=timezone.now() - timedelta(hours=1))
+
+    def test_conditional_get_and_invalidation(self):
+        first = self.client.get('/api/finlife/deposits/')
+        etag = first['ETag']
+        self.assertTrue(first.has_header('Last-Modified'))
+
+        with self.assertNumQueries(1):  # 캐시 적중: 카탈로그 버전 조회만
+            res = self.client.get('/api/finlife/deposits/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+        res = self.client.get('/api/finlife/deposits/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(res.status_code, 304)
+
+        # 동기화 전에는 DB가 바뀌어도 캐시된 응답, 동기화(버전 변경) 후에는 새 응답
+        make_catalogue(DepositProduct, DepositOptions, 1, start=3)
+        self.assertEqual(len(self.client.get('/api/finlife/deposits/').json()), 3)
+        SyncJob.objects.filter(name='products').update(last_success_at=timezone.now())
+        res = self.client.get('/api/finlife/deposits/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.json()), 4)
+        self.assertNotEqual(res['ETag'], etag)
+
+
+class ProductSimulatorTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        deposit = DepositProduct.objects.create(fin_prdt_cd='D1', kor_co_nm='은행', fin_prdt_nm='예금')
+        DepositOptions.objects.create(product=deposit, fin_prdt_cd='D1', intr_rate_type_nm='단리', save_trm=12, intr_rate=3.0, intr_rate2=4.0)
+        DepositOptions.objects.create(product=deposit, fin_prdt_cd='D1', intr_rate_type_nm='복리', save_trm=12, intr_rate=3.0, intr_rate2=None)
+        saving = SavingProduct.objects.create(fin_prdt_cd='S1', kor_co_nm='은행', fin_prdt_nm='적금')
+        SavingOptions.objects.create(product=saving, fin_prdt_cd='S1', intr_rate_type_nm='단리', save_trm=12, intr_rate=5.0, intr_rate2=6.0)
+
+    def test_simulation(self):
+        res = self.client.get('/api/finlife/simulate/', {'principal': 10000000, 'monthly': 1000000, 'months': 12}).json()
+        by_key = {(r['kind'], r['intr_rate_type_nm']): r for r in res['results']}
+
+        # 예금 단리 4%: 이자 400,000 / 세금 15.4% 61,600
+        self.assertEqual(by_key[('deposit', '단리')]['net_interest'], 338400)
+        # 예금 월복리 3% (우대금리 없음 -> 기본금리): 10,000,000 * ((1 + 0.0025)^12 - 1)
+        self.assertEqual(by_key[('deposit', '복리')]['interest'], 304159)
+        # 적금 단리 6%: 1,000,000 * 0.005 * 78 = 390,000
+        self.assertEqual(by_key[('saving', '단리')]['interest'], 390000)
+        self.assertEqual(by_key[('saving', '단리')]['maturity_amount'], 12000000 + 390000 - 60060)
+        self.assertEqual([r['net_interest'] for r in res['results']], sorted((r['net_interest'] for r in res['results']), reverse=True))
+
+        self.assertEqual(self.client.get('/api/finlife/simulate/', {'months': 12}).status_code, 400)
+
+        # limit 은 1~500 으로 잘림 (음수를 넣어도 뒤에서 잘린 목록이 오지 않음)
+        for limit, expected in ((-1, 1), (0, 1), (2, 2)):
+            res = self.client.get('/api/finlife/simulate/', {'principal': 10000000, 'months': 12, 'limit': limit}).json()
+            self.assertEqual(len(res['results']), expected)
+
+        res = self.client.get('/api/finlife/simulate/', {'principal': 10000000, 'months': 12, 'sort': 'yield'})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self.client.get('/api/finlife/simulate/', {'principal': 10000000, 'sort': 'rate'}).status_code, 400)
+
+
+class RateHistoryTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def sync(self, rate2):
+        from .utils.product_sync import save_products
+        from .models import DepositRateHistory
+        bases = [{'fin_prdt_cd': 'D1', 'kor_co_nm': '은행', 'fin_prdt_nm': '예금'}]
+        options = [
+            {'fin_prdt_cd': 'D1', 'intr_rate_type_nm': '단리', 'save_trm': '12', 'intr_rate': 3.0, 'intr_rate2': rate2},
+            {'fin_prdt_cd': 'D1', 'intr_rate_type_nm': '단리', 'save_trm': '6', 'intr_rate': 2.0, 'intr_rate2': 2.5},
+        ]
+        return save_products(DepositProduct, DepositOptions, DepositRateHistory, bases, options)
+
+    def test_history_written_only_on_change(self):
+        from .models import DepositRateHistory
+        self.sync(3.5)
+        self.assertEqual(DepositRateHistory.objects.count(), 2)   # 새 옵션 2개
+        self.sync(3.5)
+        self.assertEqual(DepositRateHistory.objects.count(), 2)   # 변경 없음 -> 기록 없음
+        stats = self.sync(3.8)
+        self.assertEqual(len(stats['changed_rates']), 1)
+        self.assertEqual(DepositRateHistory.objects.count(), 3)
+
+        feed = self.client.get('/api/finlife/rates/changes/', {'since': '2000-01-01'}).json()
+        self.assertEqual(feed['count'], 1)
+        self.assertEqual(feed['results'][0]['old']['intr_rate2'], 3.5)
+        self.assertEqual(feed['results'][0]['new']['intr_rate2'], 3.8)
+        self.assertEqual(self.client.get('/api/finlife/rates/changes/', {'since': 'yesterday'}).status_code, 400)
+
+        option = DepositOptions.objects.get(save_trm=12)
+        spark = self.client.get(f'/api/finlife/deposits/options/{option.pk}/rates/').json()
+        self.assertEqual([p['intr_rate2'] for p in spark['points']], [3.5, 3.8])
+
+
+def make_users(count):
+    import random
+    from datetime import date
+    from django.contrib.auth import get_user_model
+    rng = random.Random(7)
+    return [
+        get_user_model().objects.create_user(
+            username=f'user{i}', password='pw', nickname=f'개미{i}',
+            birth_date=date(rng.randint(1960, 2004), 1, 1),
+            salary=rng.randint(2000, 12000) * 10000, money=rng.randint(0, 50000) * 10000,
+        )
+        for i in range(count)
+    ]
+
+
+class SnapshotTestCase(TestCase):
+    """유저 인덱스/가입 행렬 스냅샷을 테스트마다 빈 임시 폴더에서 새로 만듦"""
+
+    def setUp(self):
+        import tempfile
+        from django.test import override_settings
+        from .utils.subscription_matrix import SUBSCRIPTION_SNAPSHOT
+        from .utils.user_index import USER_INDEX_SNAPSHOT
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(MARKET_SNAPSHOT_DIR=tmp.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        for snapshot in (USER_INDEX_SNAPSHOT, SUBSCRIPTION_SNAPSHOT):
+            snapshot._value = snapshot._mtime = None
+            self.addCleanup(setattr, snapshot, '_value', None)
+        cache.clear()
+
+
+class UserIndexTest(SnapshotTestCase):
+
+    def test_top_k_matches_brute_force_cosine(self):
+        import numpy as np
+        from .utils.user_index import similar_user_ids, user_features
+        users = make_users(40)
+        features = np.array([user_features(u.birth_date, u.salary, u.money) for u in users])
+        unit = features / np.linalg.norm(features, axis=1, keepdims=True)
+        me = users[0]
+        expected = [users[i].pk for i in np.argsort(-(unit @ unit[0]), kind='stable') if i != 0][:10]
+        self.assertEqual(similar_user_ids(me, k=10), expected)
+
+        # 프로필을 바꾸면 signals 로 인덱스 행이 바로 바뀜
+        twin = users[-1]
+        twin.birth_date, twin.salary, twin.money = me.birth_date, me.salary, me.money
+        twin.save()
+        self.assertEqual(similar_user_ids(me, k=1), [twin.pk])
+        twin.delete()
+        self.assertNotIn(twin.pk, similar_user_ids(me, k=40))
+
+    def test_updates_publish_a_new_state_instead_of_mutating(self):
+        import numpy as np
+        from .utils.user_index import UserIndex
+        index = UserIndex([1, 2], [[30, 100, 10], [40, 200, 20]])
+        before = index._state
+        user_ids, matrix, active, pos = before
+        frozen = (user_ids.copy(), matrix.copy(), active.copy(), dict(pos))
+
+        index.upsert(3, [50, 300, 30])
+        index.upsert(1, [60, 100, 10])
+        index.remove(2)
+        # 갱신 전에 상태를 잡은 조회는 끝까지 같은 (ids, 행렬, 위치) 를 봄
+        self.assertIsNot(index._state, before)
+        for old, snap in zip(before[:3], frozen[:3]):
+            np.testing.assert_array_equal(old, snap)
+        self.assertEqual(before[3], frozen[3])
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.top_k([50, 300, 30], k=5)[0], [3, 1])
+
+    def test_stale_snapshot_is_served_and_rebuild_is_queued(self):
+        from unittest import mock
+        from .utils import user_index
+        users = make_users(5)
+        user_index.write_user_index_snapshot()
+        snapshot = user_index.USER_INDEX_SNAPSHOT.get()
+        user_index.USER_INDEX_SNAPSHOT.write({**snapshot, 'built_on': '2000-01-01'})
+        SyncJob.objects.create(name='user_index', next_run_at=timezone.now() + timedelta(hours=1))
+        self.addCleanup(setattr, user_index, '_rebuild_requested_for', None)
+
+        with mock.patch.object(user_index, 'build_user_index') as build:
+            self.assertEqual(len(user_index.get_user_index()), 5)
+            self.assertEqual(len(user_index.similar_user_ids(users[0], k=10)), 4)
+            build.assert_not_called()
+        self.assertLessEqual(SyncJob.objects.get(name='user_index').next_run_at, timezone.now())
+
+    def test_recommend_uses_neighbour_subscriptions(self):
+        users = make_users(5)
+        make_catalogue(DepositProduct, DepositOptions, 1)
+        option = DepositOptions.objects.first()
+        for u in users[1:]:
+            option.contract_user.add(u)
+        client = APIClient()
+        client.force_authenticate(users[0])
+        res = client.get('/api/finlife/recommend/').json()
+        self.assertEqual(res['type'], 'custom')
+        self.assertEqual([row['id'] for row in res['data']], [option.pk])
+
+
+class SubscriptionMatrixTest(SnapshotTestCase):
+    def setUp(self):
+        super().setUp()
+        from django.contrib.auth import get_user_model
+        self.users = [get_user_model().objects.create_user(username=f'member{i}', password='pw') for i in range(4)]
+        make_catalogue(DepositProduct, DepositOptions, 2)
+        make_catalogue(SavingProduct, SavingOptions, 2)
+        self.deposits = list(DepositOptions.objects.order_by('pk'))
+        self.savings = list(SavingOptions.objects.order_by('pk'))
+        self.client = APIClient()
+
+    def join(self, user, kind, option):
+        self.client.force_authenticate(user)
+        return self.client.post(f'/api/finlife/{kind}s/join/{option.pk}/').json()
+
+    def test_counts_follow_joins(self):
+        from .utils.subscription_matrix import get_subscription_matrix
+        a, b, c, _ = self.users
+        d0, s0 = self.deposits[0], self.savings[0]
+        self.assertEqual(d0.pk, s0.pk)  # 예금/적금 id 가 같아도 다른 열
+        self.join(a, 'deposit', d0)
+        get_subscription_matrix()     # 스냅샷 생성 이후 가입은 delta 로 반영
+        self.join(b, 'deposit', d0)
+        self.join(b, 'saving', s0)
+        self.join(c, 'saving', s0)
+        self.join(c, 'deposit', self.deposits[1])
+
+        matrix = get_subscription_matrix()
+        self.assertEqual(
+            matrix.neighbour_counts([a.pk, b.pk, c.pk], exclude={('deposit', self.deposits[1].pk)}),
+            [(('deposit', d0.pk), 2), (('saving', s0.pk), 2)],
+        )
+        self.join(b, 'deposit', d0)   # 해지
+        self.assertEqual(matrix.joined(b.pk), {('saving', s0.pk)})
+        self.assertEqual(matrix.neighbour_counts([b.pk, c.pk])[0], (('saving', s0.pk), 2))
+
+        res = self.client.get(f'/api/finlife/savings/options/{s0.pk}/also-joined/').json()
+        self.assertEqual(res['joined_users'], 2)
+        self.assertEqual([(r['kind'], r['id'], r['co_joined']) for r in res['results']], [('deposit', self.deposits[1].pk, 1)])
+        self.assertNotIn('contract_user', res['results'][0])
+
+
+class RecommendationCacheTest(SnapshotTestCase):
+    def test_cached_until_profile_subscription_or_catalogue_changes(self):
+        from unittest import mock
+        from . import recommendations
+        users = make_users(4)
+        make_catalogue(DepositProduct, DepositOptions, 2)
+        first, second = DepositOptions.objects.order_by('pk')[:2]
+        for u in users[1:]:
+            first.contract_user.add(u)
+        me = users[0]
+        client = APIClient()
+        client.force_authenticate(me)
+
+        with mock.patch.object(recommendations, 'build_recommendations', wraps=recommendations.build_recommendations) as build:
+            def fetch():
+                return client.get('/api/finlife/recommend/').json()
+
+            self.assertEqual([row['id'] for row in fetch()['data']], [first.pk])
+            fetch()
+            self.assertEqual(build.call_count, 1)               # 두 번째는 캐시
+
+            client.post(f'/api/finlife/deposits/join/{first.pk}/')   # 내 가입 변경 -> 무효화
+            self.assertEqual(fetch()['type'], 'best_rate')
+            self.assertEqual(build.call_count, 2)
+
+            me.risk_appetite = 5
+            me.save(update_fields=['risk_appetite'])             # 프로필 변경 -> 무효화
+            me.save(update_fields=['last_login'])                # 관계없는 저장은 그대로
+            fetch()
+            fetch()
+            self.assertEqual(build.call_count, 3)
+
+            SyncJob.objects.create(name='products', last_success_at=timezone.now())   # 상품 동기화
+            fetch()
+            self.assertEqual(build.call_count, 4)
+
+    def test_invalidation_reaches_other_workers(self):
+        from unittest import mock
+        from django.core.cache.backends.locmem import LocMemCache
+        from . import recommendations
+        users = make_users(4)
+        make_catalogue(DepositProduct, DepositOptions, 2)
+        first = DepositOptions.objects.order_by('pk').first()
+        for u in users[1:]:
+            first.contract_user.add(u)
+        me = users[0]
+        other_worker = LocMemCache('other-worker', {})   # 다른 gunicorn 워커의 프로세스 메모리 캐시
+
+        with mock.patch.object(recommendations, 'build_recommendations', wraps=recommendations.build_recommendations) as build:
+            with mock.patch.object(recommendations, 'cache', other_worker):
+                recommendations.get_recommendations(me)
+                recommendations.get_recommendations(me)
+            self.assertEqual(build.call_count, 1)
+
+            me.risk_appetite = 5
+            me.save(update_fields=['risk_appetite'])   # 이 워커에서 변경 -> 다른 워커 캐시는 못 지움
+            with mock.patch.object(recommendations, 'cache', other_worker):
+                recommendations.get_recommendations(me)
+                self.assertEqual(build.call_count, 2)   # DB 버전이 달라서 다시 계산
+                first.contract_user.add(me)
+                self.assertEqual(recommendations.get_recommendations(me)['type'], 'best_rate')
+                self.assertEqual(build.call_count, 3)
+
+
+class RecommendationBenchmarkTest(TestCase):
+    def test_small_run(self):
+        from .utils.recommend_bench import run_benchmark
+        run = run_benchmark(n_users=300, n_options=60, n_queries=30, baseline_max_users=300)
+        by_name = {r['algorithm']: r for r in run['results']}
+        self.assertEqual(set(by_name), {'baseline', 'index', 'best_rate'})
+        self.assertTrue(all(r['queries'] == 30 and r['p50_ms'] is not None for r in by_name.values()))
+        # 같은 특성/같은 집계라 예전 방식과 품질이 거의 같아야 함 (동점 처리만 다름)
+        self.assertAlmostEqual(by_name['index']['recall@6'], by_name['baseline']['recall@6'], delta=0.1)
+
+        skipped = run_benchmark(n_users=300, n_options=60, n_queries=5, baseline_max_users=100)['skipped']
+        self.assertIn('baseline', skipped)
+
+
+class MarketDataCacheTest(TestCase):
+    """외부 시세 캐시: 동시 miss 합치기 / stale-while-revalidate / LRU"""
+
+    def setUp(self):
+        from unittest import mock
+        from .utils.cache import LocalLRUBackend, MarketDataCache
+        self.cache = MarketDataCache(LocalLRUBackend(max_entries=2))
+        self.addCleanup(self.cache._refresher.shutdown, wait=True)
+        self.now = 1000.0
+        clock = mock.patch('finlife.utils.cache.time')
+        clock.start().time.side_effect = lambda: self.now
+        self.addCleanup(clock.stop)
+        self.calls = 0
+
+    def fetcher(self, value, gate=None, started=None):
+        def fetch():
+            self.calls += 1
+            if started: started.set()
+            if gate: gate.wait(5)
+            return value
+        return fetch
+
+    def wait_for(self, condition):
+        import time
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_concurrent_misses_share_one_fetch(self):
+        import threading
+        gate, started, results = threading.Event(), threading.Event(), []
+        fetch = self.fetcher('v1', gate, started)
+
+        def call():
+            results.append(self.cache.get_or_fetch('quote', ('005930',), fetch, ttl=60))
+
+        threads = [threading.Thread(target=call)]
+        threads[0].start()
+        started.wait(5)
+        threads += [threading.Thread(target=call) for _ in range(4)]
+        for t in threads[1:]:
+            t.start()
+        self.wait_for(lambda: self.cache.stats().get('quote', {}).get('coalesced') == 4)
+        gate.set()
+        for t in threads:
+            t.join(5)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, ['v1'] * 5)
+        self.assertEqual(self.cache.stats()['quote']['misses'], 5)
+
+    def test_stale_value_served_while_refreshing_once(self):
+        import threading
+        self.cache.get_or_fetch('quote', ('x',), self.fetcher('v1'), ttl=10, stale_ttl=60)
+        self.now += 15   # fresh 지남, stale 구간
+
+        gate = threading.Event()
+        refresh = self.fetcher('v2', gate)
+        self.assertEqual(self.cache.get_or_fetch('quote', ('x',), refresh, ttl=10, stale_ttl=60), 'v1')
+        self.assertEqual(self.cache.get_or_fetch('quote', ('x',), refresh, ttl=10, stale_ttl=60), 'v1')
+        gate.set()
+        self.wait_for(lambda: self.cache.stats()['quote'].get('refreshes') == 1)
+
+        self.assertEqual(self.cache.get_or_fetch('quote', ('x',), self.fetcher('v3'), ttl=10, stale_ttl=60), 'v2')
+        self.assertEqual(self.calls, 2)   # 처음 1번 + 백그라운드 갱신 1번
+        self.assertEqual(self.cache.stats()['quote']['stale_hits'], 2)
+
+        self.now += 100  # stale 구간도 지나면 직접 조회
+        self.assertEqual(self.cache.get_or_fetch('quote', ('x',), self.fetcher('v4'), ttl=10, stale_ttl=60), 'v4')
+
+    def test_lru_eviction_and_failed_results_not_cached(self):
+        for key in ('a', 'b'):
+            self.cache.get_or_fetch('quote', (key,), self.fetcher(key), ttl=60)
+        self.cache.get_or_fetch('quote', ('a',), self.fetcher('a'), ttl=60)   # a 를 최근 사용으로
+        self.cache.get_or_fetch('quote', ('c',), self.fetcher('c'), ttl=60)   # b 가 밀려남
+        self.assertEqual(self.calls, 3)
+        self.cache.get_or_fetch('quote', ('a',), self.fetcher('a'), ttl=60)
+        self.assertEqual(self.calls, 3)
+        self.cache.get_or_fetch('quote', ('b',), self.fetcher('b'), ttl=60)
+        self.assertEqual(self.calls, 4)
+
+        for _ in range(2):
+            self.cache.get_or_fetch('quote', ('empty',), self.fetcher([]), ttl=60)
+        self.assertEqual(self.calls, 6)
+
+
+def daily_frame(start, end):
+    """영업일 일봉 픽스처: i 번째 날 Open=i, High=i+1, Low=i-1, Close=i+0.5, Volume=100"""
+    import numpy as np
+    import pandas as pd
+    index = pd.bdate_range(start, end)
+    i = np.arange(len(index), dtype=float)
+    return pd.DataFrame({'Open': i, 'High': i + 1, 'Low': i - 1, 'Close': i + 0.5, 'Volume': 100}, index=index)
+
+
+class BarStoreTest(TestCase):
+    def setUp(self):
+        from unittest import mock
+        from .utils import bar_store
+        self.bar_store = bar_store
+        self.downloads = []
+
+        def download(symbol, start, end=None):
+            self.downloads.append((start, end))
+            return daily_frame(start, end - timedelta(days=1))
+
+        patcher = mock.patch.object(bar_store, '_download_daily', side_effect=download)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_gap_ranges_and_tail_throttle(self):
+        from datetime import date
+        from .models import StockBar, StockBarSync
+        tomorrow = date.today() + timedelta(days=1)
+        start = date.today() - timedelta(days=30)
+
+        self.assertTrue(self.bar_store.ensure_daily_bars('AAA', start))
+        self.assertEqual(self.downloads, [(start, tomorrow)])           # 처음: 요청 구간 전체
+        self.assertTrue(self.bar_store.ensure_daily_bars('AAA', start))
+        self.assertEqual(len(self.downloads), 1)                         # 10분 안에는 다시 안 받음
+
+        StockBarSync.objects.filter(symbol='AAA').update(synced_at=timezone.now() - timedelta(minutes=11))
+        self.bar_store.ensure_daily_bars('AAA', start + timedelta(days=5))
+        last = StockBar.objects.filter(symbol='AAA').latest('date').date
+        self.assertEqual(self.downloads[-1], (last, tomorrow))          # 꼬리: 마지막 저장일부터
+        self.assertEqual(len(self.downloads), 2)
+
+        earlier = start - timedelta(days=60)
+        self.bar_store.ensure_daily_bars('AAA', earlier)
+        self.assertEqual(self.downloads[-1], (earlier, tomorrow))       # 앞쪽이 모자라면 새 시작일부터
+        self.assertEqual(StockBarSync.objects.get(symbol='AAA').covered_from, earlier)
+        self.assertEqual(StockBar.objects.filter(symbol='AAA').count(), len(daily_frame(earlier, date.today())))
+
+    def test_weekly_and_monthly_resample(self):
+        daily = daily_frame('2024-01-01', '2024-02-09')   # 월요일 시작, 6주
+        weekly = self.bar_store.resample_bars(daily, 'week')
+        self.assertEqual([d.strftime('%Y-%m-%d') for d in weekly.index[:2]], ['2024-01-01', '2024-01-08'])
+        self.assertEqual(len(weekly), 6)
+        self.assertEqual(weekly.iloc[1].to_dict(), {'Open': 5.0, 'High': 10.0, 'Low': 4.0, 'Close': 9.5, 'Volume': 500})
+
+        monthly = self.bar_store.resample_bars(daily, 'month')
+        self.assertEqual([d.strftime('%Y-%m-%d') for d in monthly.index], ['2024-01-01', '2024-02-01'])
+        jan = daily.loc['2024-01']
+        self.assertEqual(monthly.iloc[0]['Open'], jan['Open'].iloc[0])
+        self.assertEqual(monthly.iloc[0]['Close'], jan['Close'].iloc[-1])
+        self.assertEqual(monthly.iloc[0]['High'], jan['High'].max())
+        self.assertEqual(monthly.iloc[0]['Volume'], 100 * len(jan))
+        self.assertIs(self.bar_store.resample_bars(daily, 'day'), daily)
+
+
+class TickerIndexTest(SnapshotTestCase):
+    def setUp(self):
+        super().setUp()
+        from .utils import ticker_index
+        from .utils.external_api import KRX_MAPPING_SNAPSHOT
+        for snapshot in (ticker_index.TICKER_INDEX_SNAPSHOT, KRX_MAPPING_SNAPSHOT):
+            snapshot._value = snapshot._mtime = None
+            self.addCleanup(setattr, snapshot, '_value', None)
+        ticker_index._fallback_index = None
+
+    def test_request_path_never_builds_and_serves_stale_index(self):
+        import os
+        from unittest import mock
+        from .utils import ticker_index
+        from .utils.external_api import KRX_MAPPING_SNAPSHOT
+
+        with mock.patch('finlife.utils.external_api.build_krx_mapping') as build:
+            index = ticker_index.get_ticker_index()
+            self.assertEqual(index.exact('삼성전자'), '005930.KS')   # 인기 종목 메모리 인덱스
+            self.assertFalse(os.path.exists(ticker_index.TICKER_INDEX_SNAPSHOT.path))
+            build.assert_not_called()
+
+            ticker_index.write_index_snapshot('v1', {'삼성전자': '005930.KS', '삼성SDI': '006400.KS'})
+            KRX_MAPPING_SNAPSHOT.write({'version': 'v2', 'mapping': {'삼성전자': '005930.KS'}})
+            self.assertEqual(len(ticker_index.get_ticker_index()), 2)   # 버전이 지나도 그대로 씀
+            build.assert_not_called()
+
+        client = APIClient()
+        self.assertEqual(len(client.get('/api/finlife/stocks/autocomplete/', {'q': '삼성', 'limit': -5}).json()), 1)
+        self.assertEqual(len(client.get('/api/finlife/stocks/autocomplete/', {'q': '삼성'}).json()), 2)
+
+
+class KrxMappingTest(SnapshotTestCase):
+    def test_missing_snapshot_falls_back_without_building(self):
+        from unittest import mock
+        from .utils.external_api import KOREAN_POPULAR_MAP, KRX_MAPPING_SNAPSHOT, get_krx_mapping
+        KRX_MAPPING_SNAPSHOT._value = KRX_MAPPING_SNAPSHOT._mtime = None
+        self.addCleanup(setattr, KRX_MAPPING_SNAPSHOT, '_value', None)
+        with mock.patch('finlife.utils.external_api.build_krx_mapping') as build:
+            self.assertEqual(get_krx_mapping(), KOREAN_POPULAR_MAP)
+            build.assert_not_called()
+        KRX_MAPPING_SNAPSHOT.write({'version': 'v1', 'mapping': {'삼성전자': '005930.KS'}})
+        self.assertEqual(get_krx_mapping(), {'삼성전자': '005930.KS'})
+
+
+class SectorMapTest(SnapshotTestCase):
+    def test_refresh_writes_snapshot_dir_and_readers_pick_it_up(self):
+        import os
+        from unittest import mock
+        from django.conf import settings
+        from .utils import sector_map
+        sector_map.SECTOR_SNAPSHOT._value = sector_map.SECTOR_SNAPSHOT._mtime = None
+        self.addCleanup(setattr, sector_map.SECTOR_SNAPSHOT, '_value', None)
+
+        self.assertEqual(sector_map.load_sector_map(), sector_map._load_seed())   # 아직 안 돌았으면 패키지 초기값
+        with open(sector_map.SECTOR_SEED_PATH, 'rb') as f:
+            seed_bytes = f.read()
+
+        crawled = {f'{i:06d}': 'IT' for i in range(3)}
+        with mock.patch.object(sector_map, 'crawl_naver_sectors', return_value=crawled):
+            self.assertEqual(sector_map.refresh_sector_map(min_entries=3), {'codes': 3})
+        self.assertEqual(os.path.dirname(sector_map.SECTOR_SNAPSHOT.path), settings.MARKET_SNAPSHOT_DIR)
+        self.assertEqual(sector_map.load_sector_map(), crawled)
+        with open(sector_map.SECTOR_SEED_PATH, 'rb') as f:
+            self.assertEqual(f.read(), seed_bytes)   # 패키지 파일은 안 건드림
+
+        with mock.patch.object(sector_map, 'crawl_naver_sectors', return_value={'000001': 'IT'}):
+            with self.assertRaises(ValueError):
+                sector_map.refresh_sector_map(min_entries=3)
+        self.assertEqual(sector_map.load_sector_map(), crawled)
+
+
+class SchedulerLeaseTest(TestCase):
+    def setUp(self):
+        from unittest import mock
+        from . import scheduler
+        self.func = mock.Mock(return_value={'rows': 1})
+        scheduler.register_job('test_job', interval=3600, lock_timeout=600)(self.func)
+        self.addCleanup(scheduler.JOBS.pop, 'test_job', None)
+
+    def test_held_lease_blocks_second_run(self):
+        from .scheduler import run_job
+        SyncJob.objects.create(name='test_job', status='running', locked_until=timezone.now() + timedelta(minutes=5))
+        self.assertIsNone(run_job('test_job'))
+        self.assertIsNone(run_job('test_job', force=True))   # force 는 주기만 무시, 잠금은 못 뚫음
+        self.func.assert_not_called()
+        self.assertEqual(SyncJob.objects.get(name='test_job').status, 'running')
+
+    def test_expired_lease_is_taken_over(self):
+        from .scheduler import run_job
+        SyncJob.objects.create(name='test_job', status='running', locked_until=timezone.now() - timedelta(seconds=1))
+        row = run_job('test_job')
+        self.func.assert_called_once()
+        self.assertEqual(row.status, 'success')
+        self.assertIsNone(row.locked_until)
+
+    def test_success_and_failure_are_recorded(self):
+        from .scheduler import RETRY_DELAY, run_job
+        before = timezone.now()
+        row = run_job('test_job')
+        self.assertEqual((row.status, row.result, row.error), ('success', {'rows': 1}, ''))
+        self.assertGreaterEqual(row.last_success_at, before)
+        self.assertGreaterEqual(row.next_run_at, before + timedelta(seconds=3600))
+        self.assertIsNone(run_job('test_job'))   # 주기 전에는 안 돎
+        self.func.assert_called_once()
+
+        last_success = row.last_success_at
+        self.func.side_effect = RuntimeError('FINLIFE 503')
+        row = run_job('test_job', force=True)
+        self.assertEqual(row.status, 'failed')
+        self.assertTrue(row.error.startswith('FINLIFE 503'))
+        self.assertEqual(row.last_success_at, last_success)   # 마지막 성공 시각은 그대로
+        self.assertIsNone(row.locked_until)
+        self.assertLess(row.next_run_at, timezone.now() + timedelta(seconds=RETRY_DELAY + 1))
+
+
+class BacktestTest(TestCase):
+    def setUp(self):
+        from .utils.cache import market_cache
+        market_cache.clear()
+        self.addCleanup(market_cache.clear)
+
+    def test_zero_close_is_missing_and_metrics_stay_finite(self):
+        import json
+        from datetime import date
+        from .models import StockFactor
+        from .utils.backtest import run_backtest
+        # (날짜, {종목: (종가, 배당)})  A: 1월 보유, 1/4 종가 누락(0)  B: 2월부터 보유  C: 1/2 거래정지(0) 인데 배당 최고
+        days = [
+            (date(2024, 1, 2), {'A': (100, 5), 'B': (50, 3), 'C': (0, 9)}),
+            (date(2024, 1, 3), {'A': (110, 5), 'B': (50, 3), 'C': (10, 9)}),
+            (date(2024, 1, 4), {'A': (0, 5), 'B': (50, 3), 'C': (10, 9)}),
+            (date(2024, 2, 1), {'A': (121, 1), 'B': (50, 6), 'C': (0, 0)}),
+            (date(2024, 2, 2), {'A': (121, 1), 'B': (55, 6), 'C': (0, 0)}),
+            (date(2024, 3, 4), {'A': (121, 1), 'B': (55, 6), 'C': (0, 0)}),
+        ]
+        StockFactor.objects.bulk_create([
+            StockFactor(date=day, ticker=ticker, name=f'종목{ticker}', close=close, div=div,
+                        trading_value=1e9, eps=100, bps=1000, per=10, pbr=1)
+            for day, row in days for ticker, (close, div) in row.items()
+        ])
+
+        result = run_backtest(weights={'w_div': 1, 'w_roe': 0, 'w_per': 0, 'w_pbr': 0}, top_n=1)
+        json.dumps(result, allow_nan=False)
+        self.assertEqual([[h['ticker'] for h in r['holdings']] for r in result['rebalances']], [['A'], ['B'], ['B']])
+        # 1/3 +10%, 1/4 누락(보합), 2/1 +10%, 2/2 +10%
+        self.assertEqual([p['value'] for p in result['equity']], [1.0, 1.1, 1.1, 1.21, 1.331, 1.331])
+        metrics = result['metrics']
+        self.assertEqual(metrics['total_return'], 0.331)
+        self.assertEqual(metrics['max_drawdown'], 0.0)
+        self.assertEqual(metrics['avg_turnover'], 0.5)   # 2월 A -> B 전부 교체, 3월 그대로
+        self.assertEqual(metrics['rebalances'], 3)
+
+    def test_empty_universe_period_is_held_as_cash(self):
+        from datetime import date
+        from .models import StockFactor
+        from .utils.backtest import run_backtest
+        # (날짜, 종가, 거래대금)  2/1 리밸런싱일엔 거래대금 0 -> 유니버스가 비어서 2월은 현금
+        days = [
+            (date(2024, 1, 2), 100, 1e9), (date(2024, 1, 3), 110, 1e9), (date(2024, 1, 4), 121, 1e9),
+            (date(2024, 2, 1), 133.1, 0), (date(2024, 2, 2), 200, 1e9), (date(2024, 3, 4), 50, 1e9),
+        ]
+        StockFactor.objects.bulk_create([
+            StockFactor(date=day, ticker='A', name='종목A', close=close, div=3, trading_value=tv,
+                        eps=100, bps=1000, per=10, pbr=1)
+            for day, close, tv in days
+        ])
+
+        result = run_backtest(weights={'w_div': 1, 'w_roe': 0, 'w_per': 0, 'w_pbr': 0}, top_n=1)
+        self.assertEqual([[h['ticker'] for h in r['holdings']] for r in result['rebalances']], [['A'], [], ['A']])
+        # 1월 +10% x 3, 2월은 A 가 오르든 내리든 보합
+        self.assertEqual([p['value'] for p in result['equity']], [1.0, 1.1, 1.21, 1.331, 1.331, 1.331])
+        self.assertEqual(result['metrics']['total_return'], 0.331)
+
+
+class WeightSweepValidationTest(TestCase):
+    def test_rejects_oversized_or_malformed_requests_before_generating(self):
+        from unittest import mock
+        from .utils.quant_analysis import MAX_SWEEP_VECTORS, weight_grid, weight_grid_size
+        self.assertEqual(weight_grid_size(0.1), len(weight_grid(0.1)))
+        client = APIClient()
+
+        def post(body):
+            return client.post('/api/finlife/recommend-stocks/sweep/', body, format='json')
+
+        with mock.patch('finlife.views.weight_samples') as samples, mock.patch('finlife.views.weight_grid') as grid:
+            self.assertEqual(post({'samples': 10 ** 9}).status_code, 400)
+            self.assertEqual(post({'samples': 0}).status_code, 400)
+            self.assertEqual(post({'samples': 'many'}).status_code, 400)
+            self.assertEqual(post({'grid_step': 0.02}).status_code, 400)   # 23,426개
+            self.assertEqual(post({'weights': [{'w_div': 1}] * (MAX_SWEEP_VECTORS + 1)}).status_code, 400)
+            samples.assert_not_called()
+            grid.assert_not_called()
+        self.assertEqual(post({'samples': 10}).status_code, 404)   # 검증 통과, 스냅샷 없음
+
+
+class ProductSyncTest(TestCase):
+    def finlife_page(self, page, max_page, codes):
+        bases = [{'fin_prdt_cd': code, 'kor_co_nm': '은행', 'fin_prdt_nm': f'상품{code}'} for code in codes]
+        options = [
+            {'fin_prdt_cd': code, 'intr_rate_type_nm': '단리', 'save_trm': trm, 'intr_rate': 3.0, 'intr_rate2': 3.5}
+            for code in codes for trm in ('6', '12')
+        ]
+        return {'result': {'err_cd': '000', 'max_page_no': max_page, 'now_page_no': page,
+                           'baseList': bases, 'optionList': options}}
+
+    def test_pages_follow_max_page_no(self):
+        from unittest import mock
+        from .utils.product_sync import fetch_product_pages
+        pages = {1: ['D1', 'D2'], 2: ['D3'], 3: ['D4']}
+
+        def get(url, params, timeout):
+            response = mock.Mock()
+            response.json.return_value = self.finlife_page(params['pageNo'], 3, pages[params['pageNo']])
+            return response
+
+        with mock.patch('finlife.utils.product_sync.requests.get', side_effect=get) as request:
+            bases, options = fetch_product_pages('depositProductsSearch.json', '020000')
+        self.assertEqual([call.kwargs['params']['pageNo'] for call in request.call_args_list], [1, 2, 3])
+        self.assertEqual([b['fin_prdt_cd'] for b in bases], ['D1', 'D2', 'D3', 'D4'])
+        self.assertEqual(len(options), 8)
+
+    def test_rerun_is_idempotent_and_updates_in_place(self):
+        from .models import DepositRateHistory
+        from .utils.product_sync import save_products
+        page = self.finlife_page(1, 1, ['D1', 'D2'])['result']
+
+        def sync(base_list, option_list):
+            return save_products(DepositProduct, DepositOptions, DepositRateHistory, base_list, option_list)
+
+        sync(page['baseList'], page['optionList'])
+        ids = set(DepositOptions.objects.values_list('pk', flat=True))
+        for _ in range(2):
+            stats = sync(page['baseList'], page['optionList'])
+            self.assertEqual((DepositProduct.objects.count(), DepositOptions.objects.count()), (2, 4))
+            self.assertEqual(stats['new_options'], 0)
 
-# Create your tests here.
+        # 중복 옵션(같은 상품/유형/기간)은 하나로, 금리가 바뀐 옵션은 같은 행이 갱신됨
+        changed = [dict(opt) for opt in page['optionList']]
+        changed[0]['intr_rate2'] = 4.0
+        bases = [{**page['baseList'][0], 'fin_prdt_nm': '이름 변경'}] + page['baseList'][1:]
+        stats = sync(bases, changed + [changed[1]])
+        self.assertEqual((DepositProduct.objects.count(), DepositOptions.objects.count()), (2, 4))
+        self.assertEqual(len(stats['changed_rates']), 1)
+        option = DepositOptions.objects.get(fin_prdt_cd='D1', save_trm=6)
+        self.assertEqual(option.intr_rate2, 4.0)
+        self.assertIn(option.pk, ids)
+        self.assertEqual(DepositProduct.objects.get(fin_prdt_cd='D1').fin_prdt_nm, '이름 변경')
+        self.assertEqual(set(DepositOptions.objects.values_list('pk', flat=True)), ids)
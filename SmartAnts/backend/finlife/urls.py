@@ -7,16 +7,25 @@ urlpatterns = [
     path('deposits/', views.DepositProductListAPIView.as_view(), name='deposit_list'),
     path('savings/', views.SavingProductListAPIView.as_view(), name='saving_list'),
     path('recommend/', views.recommend_products, name='recommend_products'),
+    path('simulate/', views.simulate_products, name='simulate_products'),
+    path('rates/changes/', views.rate_changes, name='rate_changes'),
+    path('deposits/options/<int:option_pk>/rates/', views.option_rate_history, {'kind': 'deposit'}, name='deposit_rate_history'),
+    path('savings/options/<int:option_pk>/rates/', views.option_rate_history, {'kind': 'saving'}, name='saving_rate_history'),
     
     # 주식 데이터 (Class-based)
     path('stocks/top/', views.StockTopAPIView.as_view(), name='stock_top'),
     path('market/stock/<str:symbol>/', views.stock_detail_api, name='stock_detail'),
+    path('stocks/autocomplete/', views.stock_autocomplete, name='stock_autocomplete'),
     # 상품 가입 및 추천 (Function-based)
     path('deposits/join/<int:option_pk>/', views.join_deposit_option, name='join_deposit'),
     path('savings/join/<int:option_pk>/', views.join_saving_option, name='join_saving'),
+    path('deposits/options/<int:option_pk>/also-joined/', views.also_joined_options, {'kind': 'deposit'}, name='deposit_also_joined'),
+    path('savings/options/<int:option_pk>/also-joined/', views.also_joined_options, {'kind': 'saving'}, name='saving_also_joined'),
     
     path('joined-products/', views.joined_products, name='joined_products'),
     path('recommend-stocks/', views.recommend_stocks, name='recommend_stocks'),
+    path('recommend-stocks/sweep/', views.sweep_stock_weights, name='sweep_stock_weights'),
+    path('quant/backtest/', views.backtest_stocks, name='backtest_stocks'),
     
     path('exchange-history/', views.exchange_history, name='exchange_history'),
     path('spot-history/', views.spot_price_history, name='spot_price_history'),
@@ -26,5 +35,7 @@ urlpatterns = [
     path('news/', views.finance_news_view, name='finance_news'),
     path('bank-products/', views.get_bank_products, name='bank_products'),
     path('market-status/', views.get_market_status, name='market_status'),
+    path('market-cache/stats/', views.market_cache_stats, name='market_cache_stats'),
+    path('sync-status/', views.sync_status, name='sync_status'),
     path('youtube/', views.youtube_search, name='youtube_search'),
 ]
\ No newline at end of file
@@ -0,0 +1,193 @@
+# backend/finlife/utils/backtest.py
+import numpy as np
+import pandas as pd
+from typing import Dict, Any
+
+from finlife.models import StockFactor
+from .cache import market_cache
+from .quant_analysis import CFG, WEIGHT_KEYS, FACTOR_CFG_KEYS, latest_snapshot_date
+
+# =========================================================
+# 🐜 팩터 백테스트 (저장된 StockFactor 스냅샷 재생)
+# =========================================================
+# - 스냅샷 전체를 (날짜 x 종목) 행렬로 한 번 펼쳐두고 날짜별 루프 없이 계산
+# - 리밸런싱일 종가 기준으로 상위 N 종목 동일가중 매수 -> 다음 리밸런싱일까지 보유(buy & hold)
+# - 종목 유니버스/백분위 규칙은 rank_factor_frame 과 동일 (우선주/스팩 제외, 거래대금 필터, 거래대금 상위 top_n_div)
+
+PANEL_CACHE_TTL = 60 * 60 * 12
+REBALANCE_MONTHS = {"monthly": 1, "quarterly": 3}
+PANEL_FIELDS = ["close", "trading_value", "div", "eps", "bps", "per", "pbr"]
+
+
+def load_factor_panel(market="KOSPI", start=None, end=None):
+    """StockFactor -> {"dates", "tickers", "names", 필드별 (날짜 x 종목) 행렬}"""
+    qs = StockFactor.objects.filter(market=market)
+    if start: qs = qs.filter(date__gte=start)
+    if end: qs = qs.filter(date__lte=end)
+    rows = list(qs.order_by("date").values_list("date", "ticker", "name", *PANEL_FIELDS))
+    if not rows:
+        return None
+
+    cols = list(zip(*rows))
+    dates, d_idx = np.unique(np.array(cols[0], dtype="datetime64[D]"), return_inverse=True)
+    tickers, t_idx = np.unique(np.array(cols[1]), return_inverse=True)
+
+    panel = {"dates": dates, "tickers": tickers}
+    # 종목명은 가장 최근 스냅샷 기준 (정렬돼 있으니 뒤에 쓴 값이 최신)
+    names = np.empty(len(tickers), dtype=object)
+    names[t_idx] = cols[2]
+    panel["names"] = names
+    for i, field in enumerate(PANEL_FIELDS):
+        matrix = np.full((len(dates), len(tickers)), np.nan)
+        matrix[d_idx, t_idx] = np.asarray(cols[3 + i], dtype=float)
+        panel[field] = matrix
+    # 스냅샷은 빠진 값을 0 으로 저장함 -> 종가 0(거래정지/누락)은 없는 값으로 보고
+    # 유니버스에서 빼고, 보유 중이면 직전 종가로 이어감 (-100% / inf 수익률 방지)
+    panel["close"][panel["close"] <= 0] = np.nan
+    return panel
+
+
+def get_factor_panel(market="KOSPI", start=None, end=None):
+    # 새 스냅샷이 쌓이면 키가 바뀌도록 최신 스냅샷 날짜를 키에 포함
+    latest = latest_snapshot_date(market)
+    parts = (market, str(start), str(end), str(latest))
+    return market_cache.get_or_fetch(
+        "quant_panel", parts, lambda: load_factor_panel(market, start, end), ttl=PANEL_CACHE_TTL,
+    )
+
+
+def percentile_matrix(panel, current_cfg: Dict[str, Any]):
+    """(날짜 x 종목 x 4팩터) 백분위 텐서 + 유니버스 마스크. 팩터 순서는 FACTOR_COLUMNS 와 같음"""
+    trading_value = panel["trading_value"]
+    universe = ~np.isnan(panel["close"]) & (np.nan_to_num(trading_value) >= current_cfg["min_trading_value_krw"])
+
+    names = pd.Series(panel["names"]).fillna("-").astype(str)
+    name_ok = (names != "-").to_numpy()
+    if current_cfg["exclude_pref_spac"]:
+        name_ok &= ~(names.str.endswith("우") | names.str.contains("스팩|SPAC")).to_numpy()
+    universe &= name_ok[None, :]
+
+    # 날짜별 거래대금 상위 top_n_div 만 남김 (행마다 정렬 순위를 한 번에 계산)
+    masked_tv = np.where(universe, trading_value, -np.inf)
+    order = np.argsort(-masked_tv, axis=1, kind="stable")
+    tv_rank = np.empty_like(order)
+    np.put_along_axis(tv_rank, order, np.arange(order.shape[1])[None, :], axis=1)
+    universe &= tv_rank < int(current_cfg["top_n_div"])
+
+    bps, eps = np.nan_to_num(panel["bps"]), np.nan_to_num(panel["eps"])
+    roe = np.where(bps > 0, eps / np.where(bps > 0, bps, 1) * 100, 0)
+
+    def pct(matrix, higher):
+        values = pd.DataFrame(np.where(universe, np.nan_to_num(matrix), np.nan))
+        ranks = values.rank(axis=1, pct=True).to_numpy()
+        return (ranks if higher else 1 - ranks) * 100
+
+    factors = np.stack([
+        pct(panel["div"], True), pct(roe, True), pct(panel["per"], False), pct(panel["pbr"], False),
+    ], axis=-1)
+    return factors, universe
+
+
+def rebalance_rows(dates, rebalance="monthly"):
+    """각 리밸런싱 구간(월/분기)의 첫 스냅샷 행 번호"""
+    months = dates.astype("datetime64[M]").astype(int)
+    period = months // REBALANCE_MONTHS[rebalance]
+    return np.flatnonzero(np.r_[True, period[1:] != period[:-1]])
+
+
+def select_top_n(scores, top_n):
+    """행마다 상위 N 종목 동일가중 비중 (argpartition, 점수 없는 종목 제외)"""
+    n_rows, n_tickers = scores.shape
+    top_n = min(int(top_n), n_tickers)
+    weights = np.zeros_like(scores)
+    if top_n <= 0:
+        return weights
+    filled = np.where(np.isfinite(scores), scores, -np.inf)
+    picks = np.argpartition(-filled, top_n - 1, axis=1)[:, :top_n]
+    valid = np.isfinite(np.take_along_axis(filled, picks, axis=1))
+    counts = valid.sum(axis=1, keepdims=True)
+    np.put_along_axis(weights, picks, np.where(valid, 1.0 / np.maximum(counts, 1), 0.0), axis=1)
+    return weights
+
+
+def run_backtest(weights=None, top_n=20, rebalance="monthly", start=None, end=None, market="KOSPI"):
+    current_cfg = {**CFG, "market": market}
+    if weights:
+        current_cfg.update({k: float(v) for k, v in weights.items() if k in WEIGHT_KEYS})
+    if rebalance not in REBALANCE_MONTHS:
+        raise ValueError(f"rebalance는 {list(REBALANCE_MONTHS)} 중 하나여야 합니다.")
+
+    panel = get_factor_panel(market, start, end)
+    if panel is None or len(panel["dates"]) < 2:
+        return None
+    dates = panel["dates"]
+
+    # 1) 전 기간 점수 = 백분위 텐서 x 가중치 (einsum 한 번)
+    factors, universe = percentile_matrix(panel, current_cfg)
+    w = np.array([current_cfg[k] for k in WEIGHT_KEYS], dtype=float)
+    scores = np.where(universe, np.round(np.einsum("dtf,f->dt", np.nan_to_num(factors), w), 2), -np.inf)
+
+    # 2) 리밸런싱일 포트폴리오 (R x 종목)
+    reb = rebalance_rows(dates, rebalance)
+    target = select_top_n(scores[reb], top_n)
+
+    # 3) 일별 수익률 -> 종목별 누적 성장률 G. 구간 내 비중은 G[d] / G[리밸런싱일] 만큼 자연스럽게 변함
+    close = pd.DataFrame(panel["close"]).ffill().to_numpy()
+    daily = np.nan_to_num(close[1:] / close[:-1] - 1, nan=0.0, posinf=0.0, neginf=0.0)
+    growth = np.vstack([np.ones(close.shape[1]), np.cumprod(1 + daily, axis=0)])
+
+    days = np.arange(reb[0] + 1, len(dates))
+    seg = np.searchsorted(reb, days - 1, side="right") - 1     # 전날 종가 기준 보유 포트폴리오
+    held = target[seg]
+    value = (held * growth[days] / growth[reb[seg]]).sum(axis=1)
+    prev_value = np.where(np.isin(days - 1, reb), 1.0, np.r_[1.0, value[:-1]])
+    # 보유 종목이 하나도 없던 구간(유니버스 비어 있음)은 현금 (수익률 0)
+    invested = held.sum(axis=1) > 0
+    port_ret = np.where(invested, value / np.where(invested, prev_value, 1.0) - 1, 0.0)
+
+    equity = np.r_[1.0, np.cumprod(1 + port_ret)]
+    curve_dates = dates[reb[0]:]
+    years = max((curve_dates[-1] - curve_dates[0]).astype(int) / 365.25, 1 / 365.25)
+    periods_per_year = len(port_ret) / years
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+
+    # 4) 회전율: 리밸런싱 직전(가격 변동 반영) 비중 -> 새 목표 비중으로 바뀐 양 (편도)
+    drifted = target[:-1] * growth[reb[1:]] / growth[reb[:-1]]
+    totals = drifted.sum(axis=1, keepdims=True)
+    drifted = np.divide(drifted, totals, out=np.zeros_like(drifted), where=totals > 0)
+    turnover = np.abs(target[1:] - drifted).sum(axis=1) / 2
+
+    volatility = float(np.std(port_ret, ddof=1) * np.sqrt(periods_per_year)) if len(port_ret) > 1 else 0.0
+    cagr = float(equity[-1] ** (1 / years) - 1)
+    tickers, names = panel["tickers"], panel["names"]
+    return {
+        "params": {
+            **{k: current_cfg[k] for k in WEIGHT_KEYS + FACTOR_CFG_KEYS},
+            "top_n": int(top_n), "rebalance": rebalance,
+            "start": str(curve_dates[0]), "end": str(curve_dates[-1]),
+        },
+        "metrics": {
+            "total_return": round(float(equity[-1] - 1), 4),
+            "cagr": round(cagr, 4),
+            "volatility": round(volatility, 4),
+            "sharpe": round(cagr / volatility, 2) if volatility else 0.0,
+            "max_drawdown": round(float(drawdown.min()), 4),
+            "avg_turnover": round(float(turnover.mean()), 4) if len(turnover) else 0.0,
+            "annual_turnover": round(float(turnover.sum() / years), 4),
+            "rebalances": int(len(reb)),
+        },
+        "equity": [
+            {"date": str(d), "value": round(float(v), 4), "drawdown": round(float(dd), 4)}
+            for d, v, dd in zip(curve_dates, equity, drawdown)
+        ],
+        "rebalances": [
+            {
+                "date": str(dates[r]),
+                "holdings": [
+                    {"ticker": str(tickers[t]), "name": names[t], "weight": round(float(target[i, t]), 4)}
+                    for t in np.flatnonzero(target[i])
+                ],
+            }
+            for i, r in enumerate(reb)
+        ],
+    }
@@ -0,0 +1,122 @@
+# backend/finlife/utils/bar_store.py
+import pandas as pd
+import yfinance as yf
+from datetime import date, datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from finlife.models import StockBar, StockBarSync
+
+# =========================================================
+# 🐜 로컬 일봉 저장소
+# =========================================================
+# - 일봉만 DB(StockBar)에 저장하고, 요청 시 저장된 구간을 읽어서 반환
+# - 야후에서는 "마지막 저장일 이후" 꼬리 부분만 받아옴
+# - 주봉/월봉은 받아오지 않고 일봉을 리샘플링해서 만듦
+
+# 기간별 조회 범위 (기존 yfinance period: 1y / 2y / 5y 와 동일)
+PERIOD_LOOKBACK_DAYS = {"day": 365, "week": 730, "month": 1826}
+RESAMPLE_RULES = {"week": "W-MON", "month": "MS"}
+TAIL_REFRESH_INTERVAL = timedelta(minutes=10)  # 꼬리 재조회 최소 간격
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def _parse_date(value):
+    if value is None or isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+
+
+def _period_start(period, today):
+    start = today - timedelta(days=PERIOD_LOOKBACK_DAYS[period])
+    # 첫 주봉/월봉이 중간에서 잘리지 않도록 시작일을 주/월 초로 당김
+    if period == "week": start -= timedelta(days=start.weekday())
+    elif period == "month": start = start.replace(day=1)
+    return start
+
+
+def _download_daily(symbol, start, end=None):
+    try:
+        hist = yf.Ticker(symbol).history(start=start, end=end, interval="1d")
+    except: return pd.DataFrame()
+    return hist
+
+
+def _save_bars(symbol, hist):
+    hist = hist.dropna(subset=["Open", "High", "Low", "Close"])
+    bars = [
+        StockBar(
+            symbol=symbol, date=dt.date(),
+            open=float(row["Open"]), high=float(row["High"]),
+            low=float(row["Low"]), close=float(row["Close"]),
+            volume=int(row["Volume"]) if pd.notna(row["Volume"]) else 0,
+        )
+        for dt, row in hist.iterrows()
+    ]
+    StockBar.objects.bulk_create(
+        bars, update_conflicts=True,
+        unique_fields=["symbol", "date"],
+        update_fields=["open", "high", "low", "close", "volume"],
+    )
+
+
+def ensure_daily_bars(symbol, start):
+    """start 이후 일봉이 저장소에 있도록 보장 (없는 앞/뒤 구간만 야후에서 받음)"""
+    now = timezone.now()
+    tomorrow = date.today() + timedelta(days=1)
+    sync = StockBarSync.objects.filter(symbol=symbol).first()
+
+    if sync is None or sync.covered_from > start:
+        # 1) 저장된 구간이 요청보다 짧으면 요청 구간 전체를 한 번에 채움
+        hist = _download_daily(symbol, start, tomorrow)
+        if hist.empty: return False
+        with transaction.atomic():
+            _save_bars(symbol, hist)
+            StockBarSync.objects.update_or_create(
+                symbol=symbol, defaults={"covered_from": start, "synced_at": now},
+            )
+        return True
+
+    if now - sync.synced_at >= TAIL_REFRESH_INTERVAL:
+        # 2) 마지막 저장일(장중이면 미완성 봉)부터 오늘까지만 다시 받음
+        last = StockBar.objects.filter(symbol=symbol).aggregate(last=Max("date"))["last"] or start
+        hist = _download_daily(symbol, last, tomorrow)
+        with transaction.atomic():
+            if not hist.empty: _save_bars(symbol, hist)
+            StockBarSync.objects.filter(pk=sync.pk).update(synced_at=now)
+    return True
+
+
+def read_daily_bars(symbol, start, end=None):
+    qs = StockBar.objects.filter(symbol=symbol, date__gte=start)
+    if end: qs = qs.filter(date__lt=end)  # yfinance와 동일하게 end는 미포함
+    rows = list(qs.order_by("date").values_list("date", "open", "high", "low", "close", "volume"))
+    if not rows:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    df = pd.DataFrame(rows, columns=["Date"] + OHLCV_COLUMNS)
+    df.index = pd.DatetimeIndex(pd.to_datetime(df.pop("Date")))
+    return df
+
+
+def resample_bars(daily, period):
+    rule = RESAMPLE_RULES.get(period)
+    if not rule or daily.empty:
+        return daily
+    closed = "left" if period == "week" else None
+    label = "left" if period == "week" else None
+    bars = daily.resample(rule, closed=closed, label=label).agg({
+        "Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum",
+    })
+    return bars.dropna(subset=["Close"])
+
+
+def load_history(symbol, period, start_date=None, end_date=None):
+    """get_stock_data에서 쓰는 일/주/월봉 히스토리 (yfinance history()와 같은 모양의 DataFrame)"""
+    start = _parse_date(start_date) or _period_start(period, date.today())
+    end = _parse_date(end_date) if start_date and end_date else None
+    if not ensure_daily_bars(symbol, start):
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    return resample_bars(read_daily_bars(symbol, start, end), period)
@@ -0,0 +1,247 @@
+# backend/finlife/utils/cache.py
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import wraps
+
+from django.conf import settings
+from django.db import connection
+
+# =========================================================
+# 🐜 외부 시세 API 공용 캐시 (TTL + stale-while-revalidate)
+# =========================================================
+# - fresh 구간: 캐시 그대로 반환 (hit)
+# - stale 구간: 일단 이전 값을 반환하고 백그라운드에서 갱신 (stale hit)
+# - 만료/없음: 직접 조회 (miss). 같은 키로 동시에 들어온 요청은 한 번만 조회 (coalesced)
+# 설정 예시 (settings.py)
+# MARKET_DATA_CACHE = {"BACKEND": "local", "MAX_ENTRIES": 1024, "TTL": {"stock_data": 120}}
+
+DEFAULT_CONFIG = {
+    "BACKEND": "local",      # "local" (프로세스 내 LRU) | "django" (CACHES 설정 사용)
+    "ALIAS": "default",      # BACKEND="django"일 때 사용할 캐시 alias
+    "MAX_ENTRIES": 1024,     # BACKEND="local"일 때 최대 보관 개수
+    "KEY_PREFIX": "mdc",
+    "TTL": {},               # 네임스페이스별 fresh TTL 덮어쓰기 (초)
+    "STALE_TTL": {},         # 네임스페이스별 stale 구간 덮어쓰기 (초)
+}
+
+
+class LocalLRUBackend:
+    """프로세스 메모리 LRU 저장소 (워커마다 따로 가짐)"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key, entry, timeout):
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class DjangoCacheBackend:
+    """Django 캐시 프레임워크 위임 (Redis/Memcached 등 워커 간 공유 가능)"""
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+
+    @property
+    def _cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, entry, timeout):
+        self._cache.set(key, entry, timeout=max(int(timeout), 1))
+
+    def delete(self, key):
+        self._cache.delete(key)
+
+    def clear(self):
+        self._cache.clear()
+
+
+def _default_cache_if(value):
+    # 실패 결과(None, 빈 리스트 등)는 캐시하지 않아야 다음 요청에서 재시도됨
+    if value is None:
+        return False
+    if isinstance(value, (list, dict, tuple)) and len(value) == 0:
+        return False
+    return True
+
+
+class MarketDataCache:
+    def __init__(self, backend, key_prefix="mdc", ttl_overrides=None, stale_overrides=None):
+        self.backend = backend
+        self.key_prefix = key_prefix
+        self.ttl_overrides = ttl_overrides or {}
+        self.stale_overrides = stale_overrides or {}
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self._stats = defaultdict(lambda: defaultdict(int))
+        self._stats_lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mdc-refresh")
+
+    # -----------------------------------------------------
+    # 통계 (hit/miss 카운터)
+    # -----------------------------------------------------
+    def _count(self, namespace, field):
+        with self._stats_lock:
+            self._stats[namespace][field] += 1
+
+    def stats(self):
+        with self._stats_lock:
+            result = {}
+            for namespace, counters in self._stats.items():
+                row = dict(counters)
+                served = row.get("hits", 0) + row.get("stale_hits", 0) + row.get("misses", 0)
+                cached = row.get("hits", 0) + row.get("stale_hits", 0)
+                row["hit_rate"] = round(cached / served, 4) if served else 0.0
+                result[namespace] = row
+            return result
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats.clear()
+
+    # -----------------------------------------------------
+    # 조회
+    # -----------------------------------------------------
+    def make_key(self, namespace, parts):
+        return f"{self.key_prefix}:{namespace}:{parts!r}"
+
+    def get_or_fetch(self, namespace, parts, fetch, ttl, stale_ttl=0, cache_if=_default_cache_if):
+        ttl = self.ttl_overrides.get(namespace, ttl)
+        stale_ttl = self.stale_overrides.get(namespace, stale_ttl)
+        key = self.make_key(namespace, parts)
+        now = time.time()
+
+        entry = self.backend.get(key)
+        if entry is not None:
+            value, fresh_until, stale_until = entry
+            if now < fresh_until:
+                self._count(namespace, "hits")
+                return value
+            if now < stale_until:
+                self._count(namespace, "stale_hits")
+                self._refresh_in_background(namespace, key, fetch, ttl, stale_ttl, cache_if)
+                return value
+
+        self._count(namespace, "misses")
+        return self._fetch_coalesced(namespace, key, fetch, ttl, stale_ttl, cache_if)
+
+    def _store(self, key, value, ttl, stale_ttl):
+        now = time.time()
+        self.backend.set(key, (value, now + ttl, now + ttl + stale_ttl), ttl + stale_ttl)
+
+    def _fetch_coalesced(self, namespace, key, fetch, ttl, stale_ttl, cache_if):
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            # 🐜 같은 키를 이미 누가 조회 중이면 그 결과를 같이 씀
+            self._count(namespace, "coalesced")
+            return future.result()
+
+        try:
+            value = fetch()
+        except Exception as e:
+            self._count(namespace, "errors")
+            future.set_exception(e)
+            raise
+        else:
+            if cache_if(value):
+                self._store(key, value, ttl, stale_ttl)
+            future.set_result(value)
+            return value
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _refresh_in_background(self, namespace, key, fetch, ttl, stale_ttl, cache_if):
+        with self._inflight_lock:
+            if key in self._inflight:
+                return
+            future = Future()
+            self._inflight[key] = future
+
+        def job():
+            try:
+                value = fetch()
+                if cache_if(value):
+                    self._store(key, value, ttl, stale_ttl)
+                self._count(namespace, "refreshes")
+                future.set_result(value)
+            except Exception as e:
+                self._count(namespace, "errors")
+                future.set_exception(e)
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(key, None)
+                # fetch 가 bar_store 등 DB를 쓰면 이 풀 스레드에 연결이 남으므로 닫아줌
+                connection.close()
+
+        self._refresher.submit(job)
+
+    def invalidate(self, namespace, parts):
+        self.backend.delete(self.make_key(namespace, parts))
+
+    def clear(self):
+        self.backend.clear()
+
+
+def build_cache_from_settings():
+    config = {**DEFAULT_CONFIG, **getattr(settings, "MARKET_DATA_CACHE", {})}
+    if config["BACKEND"] == "django":
+        backend = DjangoCacheBackend(config["ALIAS"])
+    else:
+        backend = LocalLRUBackend(config["MAX_ENTRIES"])
+    return MarketDataCache(
+        backend,
+        key_prefix=config["KEY_PREFIX"],
+        ttl_overrides=config["TTL"],
+        stale_overrides=config["STALE_TTL"],
+    )
+
+
+market_cache = build_cache_from_settings()
+
+
+def cached(namespace, ttl, stale_ttl=0, cache_if=_default_cache_if):
+    """함수 인자 기준으로 결과를 캐시하는 데코레이터 (원본은 func.uncached)"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            parts = (args, tuple(sorted(kwargs.items())))
+            return market_cache.get_or_fetch(
+                namespace, parts, lambda: func(*args, **kwargs),
+                ttl=ttl, stale_ttl=stale_ttl, cache_if=cache_if,
+            )
+        wrapper.uncached = func
+        return wrapper
+    return decorator
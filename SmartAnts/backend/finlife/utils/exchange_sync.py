@@ -0,0 +1,49 @@
+# backend/finlife/utils/exchange_sync.py
+import logging
+import requests
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+
+from finlife.models import ExchangeRate
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# 🐜 한국수출입은행 환율 동기화 (스케줄러 작업에서만 호출)
+# =========================================================
+EXIM_API_KEY = getattr(settings, 'EXIM_API_KEY', "VMyu0svCx0AhAHQms9zCgdFuWrfIUFiu")
+EXIM_URL = 'https://www.koreaexim.go.kr/site/program/financial/exchangeJSON'
+
+
+def fetch_and_save_exchange_rates(lookback_days=7):
+    """가장 최근 고시일 환율로 ExchangeRate 테이블 교체 (주말/공휴일이면 하루씩 거슬러 올라감)"""
+    for i in range(lookback_days):
+        search_day = datetime.now() - timedelta(days=i)
+        try:
+            res = requests.get(
+                EXIM_URL, params={'authkey': EXIM_API_KEY, 'data': 'AP01', 'searchdate': search_day.strftime('%Y%m%d')},
+                verify=False, timeout=5,
+            )
+            data = res.json()
+        except Exception as e:
+            logger.warning("Exchange rate fetch error (%s): %s", f"{search_day:%Y%m%d}", e)
+            continue
+        if not data:
+            continue
+
+        with transaction.atomic():
+            ExchangeRate.objects.all().delete()
+            ExchangeRate.objects.bulk_create([
+                ExchangeRate(
+                    cur_unit=item.get('cur_unit'), cur_nm=item.get('cur_nm'),
+                    ttb=item.get('ttb', ''), tts=item.get('tts', ''),
+                    deal_bas_r=item.get('deal_bas_r', '0').replace(',', ''),
+                    bkpr=item.get('bkpr', ''),
+                    reference_date=search_day.date(),
+                )
+                for item in data
+            ])
+        return {'reference_date': search_day.strftime('%Y-%m-%d'), 'currencies': len(data)}
+    return {'reference_date': None, 'currencies': 0}
@@ -1,9 +1,16 @@
+import time
 import requests
 import yfinance as yf
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pykrx import stock
 
+from .bar_store import PERIOD_LOOKBACK_DAYS, load_history
+from .cache import cached
+from .snapshots import SnapshotFile
+from .ticker_index import get_ticker_index
+
 # =========================================================
 # 1. 매핑 데이터 (유지)
 # =========================================================
@@ -29,7 +36,8 @@ KOREAN_POPULAR_MAP = {
     "로켓랩": "RKLB", "아이온큐": "IONQ", "팔란티어": "PLTR", "비트코인": "BTC-USD"
 }
 
-_KRX_TICKER_CACHE = {}
+# 전 종목 매핑은 refresh_krx_mapping 커맨드(또는 스케줄러)가 만든 스냅샷에서 읽음
+KRX_MAPPING_SNAPSHOT = SnapshotFile("krx_mapping.json", fmt="json")
 
 # =========================================================
 # 2. 유틸리티 함수 (유지)
@@ -43,35 +51,84 @@ def get_latest_valid_date():
         except: continue
     return datetime.now().strftime("%Y%m%d")
 
+def build_krx_mapping(target_date=None):
+    """pykrx로 KOSPI/KOSDAQ 전 종목 {종목명: 야후 심볼} 생성 (오래 걸림 -> 스냅샷 갱신 때만 호출)"""
+    target_date = target_date or get_latest_valid_date()
+    mapping = {}
+    for ticker in stock.get_market_ticker_list(target_date, market="KOSPI"):
+        mapping[stock.get_market_ticker_name(ticker)] = f"{ticker}.KS"
+    for ticker in stock.get_market_ticker_list(target_date, market="KOSDAQ"):
+        mapping[stock.get_market_ticker_name(ticker)] = f"{ticker}.KQ"
+    if mapping: mapping.update(KOREAN_POPULAR_MAP)
+    return target_date, mapping
+
+def refresh_krx_snapshot():
+    """매핑을 새로 만들어 버전 붙은 스냅샷으로 저장 (종목 검색 인덱스도 같은 버전으로 재생성)"""
+    from .ticker_index import write_index_snapshot
+
+    base_date, mapping = build_krx_mapping()
+    if len(mapping) <= 500:
+        raise RuntimeError(f"KRX mapping looks incomplete ({len(mapping)} names)")
+    version = f"{base_date}-{int(time.time())}"
+    snapshot = {
+        "version": version, "base_date": base_date,
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+        "mapping": mapping,
+    }
+    KRX_MAPPING_SNAPSHOT.write(snapshot)
+    write_index_snapshot(version, mapping)
+    return snapshot
+
 def get_krx_mapping():
-    global _KRX_TICKER_CACHE
-    if len(_KRX_TICKER_CACHE) > 500: return _KRX_TICKER_CACHE
+    # 🐜 워커마다 pykrx로 다시 만들지 않고, 공용 스냅샷 파일을 읽음 (갱신되면 자동 교체)
+    snapshot = KRX_MAPPING_SNAPSHOT.get()
+    if snapshot: return snapshot["mapping"]
+    # 스냅샷이 아직 없으면 인기 종목으로 버팀 (만드는 건 krx_mapping 작업 / refresh_krx_mapping 커맨드, 요청 중엔 안 함)
+    return KOREAN_POPULAR_MAP
+
+MARKET_FETCH_WORKERS = 9  # 개별 조회로 떨어졌을 때 동시에 보낼 최대 요청 수
+
+def _summarize_market_close(close, symbol):
+    close = close.dropna()
+    if len(close) < 2: return None
+    curr, prev = float(close.iloc[-1]), float(close.iloc[-2])
+    change, rate = curr - prev, ((curr - prev) / prev) * 100
+    return {
+        "value": f"{curr:,.2f}", "change": f"{change:+.2f}",
+        "rate": f"{rate:+.2f}%", "isUp": change > 0, "symbol": symbol
+    }
+
+def _fetch_market_close_single(symbol):
     try:
-        target_date = get_latest_valid_date()
-        new_cache = {}
-        for ticker in stock.get_market_ticker_list(target_date, market="KOSPI"):
-            new_cache[stock.get_market_ticker_name(ticker)] = f"{ticker}.KS"
-        for ticker in stock.get_market_ticker_list(target_date, market="KOSDAQ"):
-            new_cache[stock.get_market_ticker_name(ticker)] = f"{ticker}.KQ"
-        if new_cache:
-            _KRX_TICKER_CACHE = new_cache
-            _KRX_TICKER_CACHE.update(KOREAN_POPULAR_MAP)
-        return _KRX_TICKER_CACHE
-    except: return KOREAN_POPULAR_MAP
+        hist = yf.Ticker(symbol).history(period="7d", timeout=5)
+        return hist['Close'] if not hist.empty else None
+    except: return None
 
+def _fetch_market_closes(symbols):
+    """🐜 지수 전체를 한 번의 multi-ticker 다운로드로 가져옴 (실패한 심볼만 병렬 개별 조회)"""
+    closes = {}
+    try:
+        df = yf.download(symbols, period="7d", group_by="ticker", threads=True, progress=False, timeout=10)
+        for symbol in symbols:
+            if df is not None and symbol in df.columns.get_level_values(0):
+                close = df[symbol]['Close'].dropna()
+                if not close.empty: closes[symbol] = close
+    except: pass
+
+    missing = [s for s in symbols if s not in closes]
+    if missing and len(missing) == len(symbols):
+        # 배치 호출 자체가 실패한 경우에만 개별 조회로 대체 (한 심볼이 느려도 나머지는 영향 없음)
+        with ThreadPoolExecutor(max_workers=min(MARKET_FETCH_WORKERS, len(missing))) as pool:
+            for symbol, close in zip(missing, pool.map(_fetch_market_close_single, missing)):
+                if close is not None: closes[symbol] = close
+    return closes
+
+@cached("global_market", ttl=60, stale_ttl=300, cache_if=lambda r: any(r.values()))
 def get_global_market_data():
+    closes = _fetch_market_closes(list(MARKET_TICKER_MAP.values()))
     results = {}
     for name, symbol in MARKET_TICKER_MAP.items():
-        try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="7d")
-            if not hist.empty and len(hist) >= 2:
-                curr, prev = hist['Close'].iloc[-1], hist['Close'].iloc[-2]
-                change, rate = curr - prev, ((curr - prev) / prev) * 100
-                results[name] = {
-                    "value": f"{curr:,.2f}", "change": f"{change:+.2f}",
-                    "rate": f"{rate:+.2f}%", "isUp": change > 0, "symbol": symbol
-                }
+        try: results[name] = _summarize_market_close(closes[symbol], symbol) if symbol in closes else None
         except: results[name] = None
     return results
 
@@ -90,17 +147,19 @@ def search_ticker_from_yahoo(keyword):
 # =========================================================
 # 3. 핵심: 주식 상세 조회 (봉차트 지원 업그레이드)
 # =========================================================
+@cached("stock_data", ttl=120, stale_ttl=600)
 def get_stock_data(query, period="1d", start_date=None, end_date=None):
     query = query.strip()
     ticker_symbol = None
     
-    krx_map = get_krx_mapping()
+    # 🐜 종목명 -> 티커 변환은 미리 만들어둔 인덱스로 (전체 종목 선형 탐색 X)
+    index = get_ticker_index()
     if query in KOREAN_POPULAR_MAP: ticker_symbol = KOREAN_POPULAR_MAP[query]
-    elif query in krx_map: ticker_symbol = krx_map[query]
+    elif query in index.mapping: ticker_symbol = index.mapping[query]
     elif query in MARKET_TICKER_MAP.values(): ticker_symbol = query
+    elif query.isdigit(): ticker_symbol = index.exact(query)  # 종목코드 -> .KS/.KQ 구분
     elif not query.replace('.','').isdigit() and not query.encode().isalpha():
-        candidates = [name for name in krx_map.keys() if query in name]
-        if candidates: ticker_symbol = krx_map[sorted(candidates, key=len)[0]]
+        ticker_symbol = index.best_match(query)
     
     if not ticker_symbol:
         ticker_symbol = f"{query}.KS" if query.isdigit() else query.upper()
@@ -115,6 +174,10 @@ def get_stock_data(query, period="1d", start_date=None, end_date=None):
     elif period == "1d":    yf_params = {"period": "1d", "interval": "5m"}   # 당일 (5일치 가져와서 자름)
     
     def fetch_data(symbol):
+        # 🐜 일/주/월봉은 로컬 일봉 저장소에서 읽고, 새로 생긴 봉만 야후에서 받아옴
+        if period in PERIOD_LOOKBACK_DAYS:
+            return load_history(symbol, period, start_date, end_date)
+
         ticker = yf.Ticker(symbol)
         try:
             # period가 1d(당일)일 경우, 장 시작 직후 데이터가 없을 수 있으므로 넉넉히 5d를 가져와서 오늘 것만 필터링
@@ -183,6 +246,7 @@ def get_stock_data(query, period="1d", start_date=None, end_date=None):
     }
 
 # (나머지 exchange, spot 함수는 그대로 두시면 됩니다)
+@cached("exchange_history", ttl=600, stale_ttl=3600)
 def get_exchange_history_data(code, period="1mo", start_date=None, end_date=None):
     ticker_symbol = EXCHANGE_TICKER_MAP.get(code)
     try:
@@ -194,6 +258,7 @@ def get_exchange_history_data(code, period="1mo", start_date=None, end_date=None
         return [] 
     except: return []
 
+@cached("spot_history", ttl=600, stale_ttl=3600)
 def get_spot_history_data(symbol_type, start_date=None, end_date=None):
     map_code = {'GOLD': 'GC=F', 'SILVER': 'SI=F'}
     try:
@@ -0,0 +1,154 @@
+# backend/finlife/utils/product_sync.py
+import logging
+import requests
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from finlife.models import (
+    DepositProduct, DepositOptions, SavingProduct, SavingOptions, DepositRateHistory, SavingRateHistory,
+)
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# 🐜 금융상품통합비교공시(FINLIFE) 예금/적금 동기화
+# =========================================================
+# - 모든 페이지(pageNo 1 ~ max_page_no)를 먼저 다 받아온 뒤 DB 작업 시작
+# - 옵션은 fin_prdt_cd 기준으로 한 번만 훑어서 묶음 (상품마다 옵션 전체를 다시 뒤지지 않음)
+# - 상품/옵션 모두 bulk_create(update_conflicts=True) -> 상품 종류당 쿼리 몇 번으로 끝남
+# - 기존 금리와 비교해서 바뀐 옵션(+새 옵션)만 금리 이력 테이블에 한 줄씩 추가
+
+FINLIFE_API_KEY = getattr(settings, 'FINLIFE_API_KEY', "3c4cbc25442ea93a9a4361c35eb0cf14")
+FINLIFE_URL = 'http://finlife.fss.or.kr/finlifeapi/{filename}'
+TOP_FIN_GRP_NOS = ['020000', '030300']  # 은행, 저축은행
+PRODUCT_TYPES = [
+    ('deposit', 'depositProductsSearch.json', DepositProduct, DepositOptions, DepositRateHistory),
+    ('saving', 'savingProductsSearch.json', SavingProduct, SavingOptions, SavingRateHistory),
+]
+PRODUCT_FIELDS = ['kor_co_nm', 'fin_prdt_nm', 'etc_note', 'join_deny', 'join_member', 'join_way', 'spcl_cnd']
+
+
+def fetch_product_pages(filename, top_no):
+    """한 권역(topFinGrpNo)의 모든 페이지 -> (baseList, optionList)"""
+    base_list, option_list = [], []
+    page, max_page = 1, 1
+    while page <= max_page:
+        res = requests.get(
+            FINLIFE_URL.format(filename=filename),
+            params={'auth': FINLIFE_API_KEY, 'topFinGrpNo': top_no, 'pageNo': page},
+            timeout=10,
+        ).json()
+        result = res.get('result', {})
+        if result.get('err_cd') != '000':
+            raise ValueError(f"FINLIFE error {result.get('err_cd')}: {result.get('err_msg')}")
+        base_list += result.get('baseList', [])
+        option_list += result.get('optionList', [])
+        max_page = int(result.get('max_page_no') or 1)
+        page += 1
+    return base_list, option_list
+
+
+def _option_key(fin_prdt_cd, intr_rate_type_nm, save_trm):
+    return (fin_prdt_cd, intr_rate_type_nm, int(save_trm))
+
+
+def _rate(value):
+    return float(value) if value not in (None, '') else None
+
+
+def save_products(ProductModel, OptionModel, HistoryModel, base_list, option_list):
+    """받아온 목록을 상품/옵션 테이블에 upsert. 호출하는 쪽에서 transaction.atomic 으로 감쌈"""
+    # 1. 상품 (같은 코드가 여러 권역/페이지에 나오면 처음 것만)
+    bases = {}
+    for base in base_list:
+        bases.setdefault(base['fin_prdt_cd'], base)
+
+    # 2. 옵션을 한 번만 훑어서 (상품코드, 금리유형, 기간) 기준으로 중복 제거 (처음 것 유지)
+    options = {}
+    for opt in option_list:
+        if opt.get('fin_prdt_cd') not in bases or opt.get('save_trm') in (None, ''):
+            continue
+        options.setdefault(_option_key(opt['fin_prdt_cd'], opt['intr_rate_type_nm'], opt['save_trm']), opt)
+
+    # 3. 기존 금리 (바뀐 금리 기록용) - 쿼리 1번
+    old_rates = {
+        _option_key(code, type_nm, trm): (rate, rate2)
+        for code, type_nm, trm, rate, rate2 in OptionModel.objects.values_list(
+            'fin_prdt_cd', 'intr_rate_type_nm', 'save_trm', 'intr_rate', 'intr_rate2'
+        )
+    }
+
+    ProductModel.objects.bulk_create(
+        [ProductModel(fin_prdt_cd=code, **{f: base.get(f) for f in PRODUCT_FIELDS}) for code, base in bases.items()],
+        batch_size=500, update_conflicts=True,
+        unique_fields=['fin_prdt_cd'], update_fields=PRODUCT_FIELDS,
+    )
+    product_ids = dict(ProductModel.objects.filter(fin_prdt_cd__in=bases).values_list('fin_prdt_cd', 'id'))
+
+    rows, created, changed, history = [], 0, [], {}
+    for key, opt in options.items():
+        rate, rate2 = _rate(opt.get('intr_rate')), _rate(opt.get('intr_rate2'))
+        rows.append(OptionModel(
+            product_id=product_ids[key[0]], fin_prdt_cd=key[0],
+            intr_rate_type_nm=key[1], save_trm=key[2], intr_rate=rate, intr_rate2=rate2,
+        ))
+        if key not in old_rates:
+            created += 1
+            history[key] = (rate, rate2, None, None)
+        elif old_rates[key] != (rate, rate2):
+            history[key] = (rate, rate2) + old_rates[key]
+            changed.append({
+                'fin_prdt_cd': key[0], 'intr_rate_type_nm': key[1], 'save_trm': key[2],
+                'old': {'intr_rate': old_rates[key][0], 'intr_rate2': old_rates[key][1]},
+                'new': {'intr_rate': rate, 'intr_rate2': rate2},
+            })
+
+    OptionModel.objects.bulk_create(
+        rows, batch_size=500, update_conflicts=True,
+        unique_fields=['product', 'intr_rate_type_nm', 'save_trm'],
+        update_fields=['fin_prdt_cd', 'intr_rate', 'intr_rate2'],
+    )
+
+    if history:
+        # 새로 생긴 옵션은 id 를 모르니 upsert 후에 한 번에 조회
+        option_ids = {
+            _option_key(code, type_nm, trm): pk
+            for code, type_nm, trm, pk in OptionModel.objects.filter(fin_prdt_cd__in={k[0] for k in history})
+            .values_list('fin_prdt_cd', 'intr_rate_type_nm', 'save_trm', 'pk')
+        }
+        today = timezone.localdate()
+        HistoryModel.objects.bulk_create([
+            HistoryModel(
+                option_id=option_ids[key], date=today, intr_rate=rate, intr_rate2=rate2,
+                prev_intr_rate=prev, prev_intr_rate2=prev2,
+            )
+            for key, (rate, rate2, prev, prev2) in history.items()
+        ], batch_size=500)
+    return {'products': len(bases), 'options': len(rows), 'new_options': created, 'changed_rates': changed}
+
+
+def fetch_and_save_products():
+    """예금/적금 전체 갱신. 네트워크 조회를 다 끝낸 뒤 한 트랜잭션으로 저장"""
+    fetched = {}
+    for kind, filename, ProductModel, OptionModel, HistoryModel in PRODUCT_TYPES:
+        base_list, option_list = [], []
+        for top_no in TOP_FIN_GRP_NOS:
+            try:
+                bases, options = fetch_product_pages(filename, top_no)
+                base_list += bases
+                option_list += options
+            except Exception as e:
+                logger.warning("Error fetching %s (%s): %s", ProductModel.__name__, top_no, e)
+        fetched[kind] = (ProductModel, OptionModel, HistoryModel, base_list, option_list)
+
+    stats = {}
+    with transaction.atomic():
+        for kind, (ProductModel, OptionModel, HistoryModel, base_list, option_list) in fetched.items():
+            if not base_list:
+                continue  # 받아온 게 없으면 기존 데이터 유지
+            stats[kind] = save_products(ProductModel, OptionModel, HistoryModel, base_list, option_list)
+            logger.info("🐜 [%s] 상품 %s개 / 옵션 %s개 (신규 %s, 금리 변경 %s)", kind, stats[kind]['products'],
+                        stats[kind]['options'], stats[kind]['new_options'], len(stats[kind]['changed_rates']))
+    return stats
@@ -1,26 +1,16 @@
-import json
-import os
 import pandas as pd
 import numpy as np
 from pykrx import stock
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from typing import Dict, Any
 
-# =========================================================
-# 🐜 경로 설정
-# =========================================================
-BASE_PATH = os.path.dirname(os.path.abspath(__file__))
-SECTOR_FILE_PATH = os.path.join(BASE_PATH, "sectors.json")
+from django.db import transaction
+from django.db.models import Max
 
-def load_sector_map():
-    if not os.path.exists(SECTOR_FILE_PATH):
-        return {}
-    try:
-        with open(SECTOR_FILE_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except: return {}
+from finlife.models import StockFactor
+from .cache import market_cache
+from .sector_map import load_sector_map
 
-STATIC_SECTOR_MAP = load_sector_map()
 
 # 설정값
 CFG = {
@@ -29,6 +19,13 @@ CFG = {
     "exclude_pref_spac": True, "min_trading_value_krw": 5e8,
 }
 
+# 팩터 순서와 가중치 순서는 반드시 같아야 함 (내적 계산)
+FACTOR_COLUMNS = ["div_pct", "roe_pct", "per_pct", "pbr_pct"]
+WEIGHT_KEYS = ["w_div", "w_roe", "w_per", "w_pbr"]
+# 팩터 테이블에 영향을 주는 설정 (가중치는 제외 -> 가중치가 바뀌어도 캐시 재사용)
+FACTOR_CFG_KEYS = ["market", "top_n_div", "exclude_pref_spac", "min_trading_value_krw"]
+FACTOR_CACHE_TTL = 60 * 60 * 12
+
 def pct_rank(s: pd.Series, higher=True) -> pd.Series:
     s = s.copy()
     pct = s.rank(pct=True, ascending=True)
@@ -39,11 +36,9 @@ def pct_rank(s: pd.Series, higher=True) -> pd.Series:
 # -----------------------------------------------------------
 # 📌 만능 데이터 처리 엔진 (영어/한글 자동 변환)
 # -----------------------------------------------------------
-def calculate_ranking_logic(current_cfg: Dict[str, Any]):
-    
-    # 1. 날짜 강제 고정 (2025년 1월 10일)
-    BASE_DATE = "20250110" 
-    print(f"🐜 [퀀트] Real Data 수집 시작 ({BASE_DATE})...")
+def collect_factor_frame(base_date: str, market: str = "KOSPI"):
+    """pykrx에서 하루치 가격/펀더멘털/종목명/섹터를 모음 (느림 -> 스냅샷 파이프라인에서만 호출)"""
+    print(f"🐜 [퀀트] Real Data 수집 시작 ({base_date})...")
 
     final_df = pd.DataFrame()
 
@@ -51,11 +46,11 @@ def calculate_ranking_logic(current_cfg: Dict[str, Any]):
     # [1단계] 시가총액/가격 데이터 (영어 컬럼 대응)
     # =======================================================
     try:
-        cap_df = stock.get_market_cap_by_ticker(BASE_DATE, market=current_cfg["market"])
+        cap_df = stock.get_market_cap_by_ticker(base_date, market=market)
         
         if cap_df.empty:
             print("🚨 [심각] 데이터가 비어있습니다.")
-            return None, None
+            return None
             
         # 🐜 [핵심] 컬럼 이름 강제 통일 (영어 -> 한글)
         # 어떤 버전이든 다 대응하도록 매핑 테이블 작성
@@ -80,13 +75,13 @@ def calculate_ranking_logic(current_cfg: Dict[str, Any]):
     except Exception as e:
         print(f"🚨 [1단계 실패] {e}")
         # 여기서 실패하면 더 이상 진행 불가 (Mock Data 리턴해야 함)
-        return None, None
+        return None
 
     # =======================================================
     # [2단계] 펀더멘털 데이터 병합 (영어 컬럼 대응)
     # =======================================================
     try:
-        fund_df = stock.get_market_fundamental_by_ticker(BASE_DATE, market=current_cfg["market"])
+        fund_df = stock.get_market_fundamental_by_ticker(base_date, market=market)
         
         if not fund_df.empty:
             fund_df.index = fund_df.index.astype(str).str.zfill(6)
@@ -108,7 +103,7 @@ def calculate_ranking_logic(current_cfg: Dict[str, Any]):
         print(f"⚠️ [2단계 에러] 펀더멘털 스킵: {e}")
 
     # =======================================================
-    # [3단계] 데이터 보정 및 점수 산출
+    # [3단계] 데이터 보정
     # =======================================================
     df = final_df.copy()
 
@@ -121,7 +116,7 @@ def calculate_ranking_logic(current_cfg: Dict[str, Any]):
 
     # 2. 종목명 추가
     try:
-        name_df = stock.get_market_price_change_by_ticker(BASE_DATE, BASE_DATE)
+        name_df = stock.get_market_price_change_by_ticker(base_date, base_date)
         name_df.index = name_df.index.astype(str).str.zfill(6)
         
         # 종목명 컬럼도 영어일 수 있으니 확인
@@ -136,8 +131,13 @@ def calculate_ranking_logic(current_cfg: Dict[str, Any]):
         df["name"] = df.index
 
     # 3. 섹터 맵핑
-    df["Sector"] = df.index.map(STATIC_SECTOR_MAP).fillna("기타")
+    # 섹터 맵은 스케줄러가 주기적으로 갱신하므로 스냅샷 만들 때마다 새로 읽음
+    df["Sector"] = df.index.map(load_sector_map()).fillna("기타")
+    return df
 
+
+def rank_factor_frame(df: pd.DataFrame, current_cfg: Dict[str, Any]) -> pd.DataFrame:
+    """하루치 팩터 프레임 -> 필터링 + 거래대금 상위 N + 백분위 팩터 (가중치와 무관)"""
     # 4. 필터링
     df = df[df["name"] != "-"]
     if current_cfg["exclude_pref_spac"]:
@@ -158,34 +158,125 @@ def calculate_ranking_logic(current_cfg: Dict[str, Any]):
     df_top["per_pct"] = pct_rank(df_top["PER"], False)
     df_top["pbr_pct"] = pct_rank(df_top["PBR"], False)
 
-    score = (
-        current_cfg["w_div"] * df_top["div_pct"] +
-        current_cfg["w_roe"] * df_top["roe_pct"] +
-        current_cfg["w_per"] * df_top["per_pct"] +
-        current_cfg["w_pbr"] * df_top["pbr_pct"]
-    )
-    df_top["score"] = score.round(2)
     df_top["ticker"] = df_top.index
-    ranked = df_top.sort_values("score", ascending=False).reset_index(drop=True)
-    
+    return df_top.reset_index(drop=True)
+
+
+# -----------------------------------------------------------
+# 📌 팩터 스냅샷 (하루 1번 파이프라인이 저장 -> 요청은 DB만 읽음)
+# -----------------------------------------------------------
+# StockFactor 필드 -> 팩터 프레임 컬럼
+SNAPSHOT_FIELD_MAP = {
+    "name": "name", "sector": "Sector", "close": "종가", "market_cap": "시가총액",
+    "trading_value": "거래대금", "div": "DIV", "eps": "EPS", "bps": "BPS",
+    "per": "PER", "pbr": "PBR", "dps": "DPS",
+}
+
+
+def save_factor_snapshot(base_date: str, market: str = "KOSPI") -> int:
+    """pykrx로 하루치 팩터를 모아 StockFactor에 저장 (이미 있으면 덮어씀). 저장한 종목 수 반환"""
+    df = collect_factor_frame(base_date, market)
+    if df is None or df.empty:
+        return 0
+
+    snapshot_date = datetime.strptime(base_date, "%Y%m%d").date()
+    for col in SNAPSHOT_FIELD_MAP.values():
+        if col not in df.columns: df[col] = 0
+    df = df.replace([np.inf, -np.inf], np.nan)
+    numeric_cols = [c for f, c in SNAPSHOT_FIELD_MAP.items() if f not in ("name", "sector")]
+    df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors="coerce").fillna(0)
+    df["name"] = df["name"].fillna("-").astype(str)
+
+    rows = [
+        StockFactor(
+            date=snapshot_date, ticker=ticker, market=market,
+            **{field: record[col] for field, col in SNAPSHOT_FIELD_MAP.items()},
+        )
+        for ticker, record in zip(df.index, df.to_dict(orient="records"))
+    ]
+    with transaction.atomic():
+        StockFactor.objects.bulk_create(
+            rows, batch_size=500, update_conflicts=True,
+            unique_fields=["date", "ticker"],
+            update_fields=["market"] + list(SNAPSHOT_FIELD_MAP),
+        )
+    return len(rows)
+
+
+def build_latest_factor_snapshot(market: str = "KOSPI", lookback_days: int = 10):
+    """가장 최근 영업일 스냅샷 저장 (오늘이 휴장일이면 하루씩 거슬러 올라감). (기준일, 종목 수) 반환"""
+    day = date.today()
+    for _ in range(lookback_days):
+        if day.weekday() < 5:
+            count = save_factor_snapshot(day.strftime("%Y%m%d"), market)
+            if count: return day, count
+        day -= timedelta(days=1)
+    return None, 0
+
+
+def latest_snapshot_date(market: str = "KOSPI"):
+    return StockFactor.objects.filter(market=market).aggregate(latest=Max("date"))["latest"]
+
+
+def load_factor_frame(snapshot_date, market: str = "KOSPI") -> pd.DataFrame:
+    fields = ["ticker"] + list(SNAPSHOT_FIELD_MAP)
+    rows = list(StockFactor.objects.filter(date=snapshot_date, market=market).values_list(*fields))
+    df = pd.DataFrame(rows, columns=fields).set_index("ticker")
+    return df.rename(columns=SNAPSHOT_FIELD_MAP)
+
+
+def build_factor_table(current_cfg: Dict[str, Any], snapshot_date):
+    """저장된 스냅샷으로 백분위 팩터 테이블 생성 (pykrx 호출 없음)"""
+    df = load_factor_frame(snapshot_date, current_cfg["market"])
+    if df.empty:
+        return snapshot_date.strftime("%Y%m%d"), None
+    return snapshot_date.strftime("%Y%m%d"), rank_factor_frame(df, current_cfg)
+
+
+def get_factor_table(current_cfg: Dict[str, Any], snapshot_date=None):
+    """🐜 가중치와 무관한 팩터 테이블은 기준일별로 한 번만 계산 (기본: 가장 최근 스냅샷)"""
+    snapshot_date = snapshot_date or latest_snapshot_date(current_cfg["market"])
+    if snapshot_date is None:
+        return None, None
+    parts = (snapshot_date.isoformat(),) + tuple(current_cfg[k] for k in FACTOR_CFG_KEYS)
+    return market_cache.get_or_fetch(
+        "quant_factors", parts, lambda: build_factor_table(current_cfg, snapshot_date),
+        ttl=FACTOR_CACHE_TTL, cache_if=lambda r: r[1] is not None and not r[1].empty,
+    )
+
+
+def score_factor_table(df_top: pd.DataFrame, current_cfg: Dict[str, Any]) -> pd.DataFrame:
+    """가중치 벡터 하나로 점수 계산 (백분위 행렬 x 가중치 내적 한 번)"""
+    weights = np.array([float(current_cfg[k]) for k in WEIGHT_KEYS])
+    score = np.round(df_top[FACTOR_COLUMNS].to_numpy(dtype=float) @ weights, 2)
+    order = np.argsort(-score, kind="stable")[:int(current_cfg["report_top"])]
+
+    ranked = df_top.iloc[order].copy()
+    ranked["score"] = score[order]
     cols = ["ticker", "name", "score", "DIV", "ROE_est", "PER", "PBR", "Sector"]
     final_cols = [c for c in cols if c in ranked.columns]
-    
-    return BASE_DATE, ranked[final_cols].head(int(current_cfg["report_top"]))
+    return ranked[final_cols].reset_index(drop=True)
+
 
+def calculate_ranking_logic(current_cfg: Dict[str, Any], snapshot_date=None):
+    base_date, df_top = get_factor_table(current_cfg, snapshot_date)
+    if df_top is None or df_top.empty:
+        return base_date, df_top
+    return base_date, score_factor_table(df_top, current_cfg)
 
-# API 호출 래퍼
-def get_stock_ranking(limit=200, weights=None):
+
+# API 호출 래퍼 (snapshot_date: 과거 스냅샷 조회용 date, 없으면 최신)
+def get_stock_ranking(limit=200, weights=None, snapshot_date=None):
     current_cfg = CFG.copy()
     if weights:
         for k, v in weights.items():
             if k in current_cfg: current_cfg[k] = v 
     try:
-        base_date, df = calculate_ranking_logic(current_cfg)
+        base_date, df = calculate_ranking_logic(current_cfg, snapshot_date)
         
         if df is None or df.empty:
-            print("⚠️ 퀀트 데이터 로드 완전 실패 -> 빈 배열 반환")
-            return {"base_date": "2025-01-10", "rows": []}
+            print("⚠️ 퀀트 스냅샷 없음 (build_factor_snapshots 실행 필요) -> 빈 배열 반환")
+            return {"base_date": "-", "rows": []}
         
         if limit: df = df.head(limit)
         df = df.fillna(0)
@@ -197,6 +288,89 @@ def get_stock_ranking(limit=200, weights=None):
     except Exception as e:
         print(f"Quant Error: {e}")
         return {"base_date": "-", "rows": []}
+
+
+# -----------------------------------------------------------
+# 📌 가중치 스윕 (가중치 벡터 여러 개를 행렬곱 한 번으로 평가)
+# -----------------------------------------------------------
+MAX_SWEEP_VECTORS = 5000
+
+
+def weight_grid_size(step=0.1):
+    """weight_grid(step) 이 만들 조합 수 (만들기 전에 크기 확인용): C(n+3, 3)"""
+    n = int(round(1 / step))
+    return (n + 1) * (n + 2) * (n + 3) // 6
+
+
+def weight_grid(step=0.1):
+    """합이 1인 4개 가중치 조합 전체 (step 간격, 음수 없음)"""
+    n = int(round(1 / step))
+    a, b, c = np.meshgrid(np.arange(n + 1), np.arange(n + 1), np.arange(n + 1), indexing="ij")
+    a, b, c = a.ravel(), b.ravel(), c.ravel()
+    keep = a + b + c <= n
+    grid = np.stack([a[keep], b[keep], c[keep], n - (a + b + c)[keep]], axis=1)
+    return grid / n
+
+
+def weight_samples(n, seed=None):
+    """합이 1인 무작위 가중치 n개 (디리클레 분포에서 균등 샘플)"""
+    return np.random.default_rng(seed).dirichlet(np.ones(len(WEIGHT_KEYS)), size=n)
+
+
+def sweep_weights(weight_vectors, k=20, snapshot_date=None):
+    """(종목 x 4) 백분위 행렬 @ (4 x V) 가중치 -> 벡터별 상위 k + 안정성 지표"""
+    W = np.asarray(weight_vectors, dtype=float).reshape(-1, len(WEIGHT_KEYS))
+    base_date, df_top = get_factor_table(CFG.copy(), snapshot_date)
+    if df_top is None or df_top.empty:
+        return None
+
+    P = df_top[FACTOR_COLUMNS].to_numpy(dtype=float)
+    default_w = np.array([CFG[key] for key in WEIGHT_KEYS], dtype=float)
+    scores = np.round(P @ np.vstack([default_w, W]).T, 2)            # (종목 x (1 + V)), 0번 열 = 기본 가중치
+    k = min(int(k), len(P))
+
+    # 열마다 상위 k (argpartition) 후 그 k개만 점수순 정렬
+    top = np.argpartition(-scores, k - 1, axis=0)[:k]
+    top_scores = np.take_along_axis(scores, top, axis=0)
+    top = np.take_along_axis(top, np.argsort(-top_scores, axis=0, kind="stable"), axis=0)
+    mean_scores = top_scores.mean(axis=0)
+
+    # 선택 여부 행렬 (종목 x 벡터) -> 기본 가중치 대비 자카드 / 종목별 등장 빈도
+    picked = np.zeros(scores.shape, dtype=bool)
+    np.put_along_axis(picked, top, True, axis=0)
+    overlap = (picked[:, 1:] & picked[:, [0]]).sum(axis=0)
+    jaccard = overlap / (2 * k - overlap)
+    frequency = picked[:, 1:].mean(axis=1)
+
+    tickers, names = df_top["ticker"].to_numpy(), df_top["name"].to_numpy()
+    freq_order = np.argsort(-frequency, kind="stable")
+    freq_order = freq_order[frequency[freq_order] > 0]
+    fmt_date = f"{base_date[:4]}-{base_date[4:6]}-{base_date[6:]}" if len(base_date) == 8 else base_date
+    return {
+        "base_date": fmt_date,
+        "k": k,
+        "vectors": int(len(W)),
+        "default_top": tickers[top[:, 0]].tolist(),
+        "results": [
+            {
+                "weights": dict(zip(WEIGHT_KEYS, np.round(w, 4).tolist())),
+                "top": tickers[top[:, i + 1]].tolist(),
+                "mean_score": round(float(mean_scores[i + 1]), 2),
+                "jaccard_vs_default": round(float(jaccard[i]), 4),
+            }
+            for i, w in enumerate(W)
+        ],
+        "stability": {
+            "mean_jaccard": round(float(jaccard.mean()), 4),
+            "min_jaccard": round(float(jaccard.min()), 4),
+            # 모든 가중치 조합에서 항상 상위 k에 드는 종목 = 가중치에 둔감한 종목
+            "always_top": tickers[frequency == 1].tolist(),
+            "ticker_frequency": [
+                {"ticker": tickers[i], "name": names[i], "frequency": round(float(frequency[i]), 4)}
+                for i in freq_order[:50]
+            ],
+        },
+    }
 # import json
 # import os
 # import pandas as pd
@@ -0,0 +1,205 @@
+# backend/finlife/utils/recommend_bench.py
+import time
+import tracemalloc
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from .subscription_matrix import SubscriptionMatrix
+from .user_index import UserIndex
+
+# =========================================================
+# 🐜 추천 알고리즘 오프라인 평가/벤치마크 (benchmark_recommendations 커맨드)
+# =========================================================
+# - DB 없이 메모리에서 가짜 유저/상품/가입 데이터를 만듦 (1천 ~ 100만 명)
+#   유저는 몇 개 그룹(연령/연봉/자산대)에서 뽑고, 같은 그룹은 비슷한 상품에 가입 -> 유사 유저 추천이 맞출 수 있는 신호
+# - 평가 유저마다 가입 상품 일부(20%, 최소 1개)를 숨기고, 추천 상위 k 개가 숨긴 상품을 얼마나 맞추는지 (precision@k / recall@k)
+# - 알고리즘
+#   baseline   : 예전 recommend_products (전체 DataFrame + N x N cosine_similarity + 이웃별 루프 + Counter)
+#   index      : 지금 구조 (UserIndex.top_k + SubscriptionMatrix.neighbour_counts)
+#   best_rate  : get_best_products_response 와 같은 규칙 (예금/적금 우대금리 상위 3개씩, 가입한 건 제외)
+# - 지연 시간은 요청 1건 기준 p50/p95/p99, 메모리는 tracemalloc 최대치 (준비 + 요청 5건, 지연 시간과 따로 측정)
+
+NEIGHBOURS = 10
+CANDIDATES = 10   # 이웃 집계에서 뽑는 후보 수 (뷰와 같음)
+
+
+def generate_dataset(n_users=10000, n_options=400, n_segments=20, seed=42):
+    rng = np.random.default_rng(seed)
+    # 그룹 중심: [나이, 연봉, 자산]
+    centers = np.column_stack([
+        rng.uniform(22, 65, n_segments),
+        rng.uniform(2.5e7, 1.5e8, n_segments),
+        rng.uniform(0, 1e9, n_segments),
+    ])
+    segment = rng.integers(0, n_segments, n_users)
+    features = centers[segment] * rng.lognormal(0, 0.1, (n_users, 3))
+    features[:, 0] = np.round(features[:, 0])
+
+    # 상품: 앞 절반 예금, 뒤 절반 적금 (id 는 종류별로 1부터 -> 예금/적금 id 가 겹치는 실제 상황과 같음)
+    half = n_options // 2
+    keys = [('deposit', i + 1) for i in range(half)] + [('saving', i + 1) for i in range(n_options - half)]
+    rates = rng.uniform(2.0, 6.0, n_options).round(2)
+
+    # 그룹마다 선호 상품 15개 (80%는 선호 상품에서, 20%는 아무 상품)
+    preferred = np.array([rng.choice(n_options, 15, replace=False) for _ in range(n_segments)])
+    counts = rng.integers(1, 7, n_users)
+    subscriptions = []
+    for u in range(n_users):
+        from_pref = rng.random(counts[u]) < 0.8
+        picks = np.where(from_pref, rng.choice(preferred[segment[u]], counts[u]), rng.integers(0, n_options, counts[u]))
+        subscriptions.append(sorted(set(picks.tolist())))
+
+    return {
+        'user_ids': np.arange(1, n_users + 1), 'features': features, 'segment': segment,
+        'keys': keys, 'rates': rates, 'subscriptions': subscriptions,
+    }
+
+
+def split_holdout(dataset, n_queries=200, holdout=0.2, seed=42):
+    """평가 유저(가입 2개 이상)를 뽑아 가입 일부를 숨긴 학습용 가입 목록 + 정답"""
+    rng = np.random.default_rng(seed + 1)
+    subscriptions = [list(s) for s in dataset['subscriptions']]
+    eligible = np.flatnonzero([len(s) >= 2 for s in subscriptions])
+    queries = rng.choice(eligible, min(n_queries, len(eligible)), replace=False)
+    truth = {}
+    for u in queries:
+        items = rng.permutation(subscriptions[u])
+        n_hidden = max(1, int(len(items) * holdout))
+        truth[int(u)] = set(items[:n_hidden].tolist())
+        subscriptions[u] = sorted(items[n_hidden:].tolist())
+    return subscriptions, truth
+
+
+# ---------------------------------------------------------
+# 알고리즘 (prepare -> recommend(row) 가 상품 번호 리스트 반환)
+# ---------------------------------------------------------
+class BaselineRecommender:
+    """예전 recommend_products 를 DB 없이 그대로 재현 (요청마다 전체 유사도 행렬을 새로 만듦)"""
+
+    def prepare(self, dataset, subscriptions):
+        # 예전 views.py 는 모듈 위에서 import 했으므로 요청 시간에는 넣지 않음
+        from sklearn.metrics.pairwise import cosine_similarity
+        self.cosine_similarity = cosine_similarity
+        self.dataset, self.subscriptions = dataset, subscriptions
+
+    def recommend(self, row, k):
+        ids = self.dataset['user_ids']
+        features = self.dataset['features']
+        df = pd.DataFrame({'id': ids, 'salary': features[:, 1], 'money': features[:, 2], 'age': features[:, 0]})
+        df = df.set_index('id')
+        df.fillna(0, inplace=True)
+        similarity_matrix = self.cosine_similarity(df)
+        user_idx = df.index.get_loc(ids[row])
+        similar_indices = similarity_matrix[user_idx].argsort()[::-1][1:NEIGHBOURS + 1]
+
+        mine = set(self.subscriptions[row])
+        option_ids = []
+        for u in similar_indices:
+            for opt in self.subscriptions[u]:
+                if opt not in mine:
+                    option_ids.append(opt)
+        return [opt for opt, _ in Counter(option_ids).most_common(CANDIDATES)][:k]
+
+
+class IndexRecommender:
+    """지금 구조: 정규화된 유저 인덱스 + 희소 가입 행렬"""
+
+    def prepare(self, dataset, subscriptions):
+        ids = dataset['user_ids']
+        self.dataset, self.subscriptions = dataset, subscriptions
+        self.index = UserIndex(ids, dataset['features'])
+        keys = dataset['keys']
+        self.matrix = SubscriptionMatrix([(int(ids[u]), keys[o]) for u, opts in enumerate(subscriptions) for o in opts])
+        self.key_pos = {key: i for i, key in enumerate(keys)}
+
+    def recommend(self, row, k):
+        ids, keys = self.dataset['user_ids'], self.dataset['keys']
+        neighbours, _ = self.index.top_k(self.dataset['features'][row], k=NEIGHBOURS, exclude=int(ids[row]))
+        mine = {keys[o] for o in self.subscriptions[row]}
+        counts = self.matrix.neighbour_counts(neighbours, exclude=mine, limit=CANDIDATES)
+        return [self.key_pos[key] for key, _ in counts][:k]
+
+
+class BestRateRecommender:
+    """get_best_products_response 규칙 (종류별 우대금리 상위 3개)"""
+
+    def prepare(self, dataset, subscriptions):
+        self.subscriptions = subscriptions
+        kinds = np.array([kind for kind, _ in dataset['keys']])
+        order = np.argsort(-dataset['rates'], kind='stable')
+        self.ranked = {kind: [o for o in order if kinds[o] == kind] for kind in ('deposit', 'saving')}
+
+    def recommend(self, row, k):
+        mine = set(self.subscriptions[row])
+        picks = []
+        for kind in ('deposit', 'saving'):
+            picks += [o for o in self.ranked[kind] if o not in mine][:3]
+        return picks[:k]
+
+
+ALGORITHMS = {'baseline': BaselineRecommender, 'index': IndexRecommender, 'best_rate': BestRateRecommender}
+
+
+def _percentile(values, q):
+    return round(float(np.percentile(values, q)) * 1000, 3) if len(values) else None
+
+
+def peak_memory(name, dataset, subscriptions, queries, k):
+    """준비 + 요청 몇 건 동안 tracemalloc 최대치 (bytes). 추적 비용이 커서 지연 시간 측정과 따로 돌림"""
+    recommender = ALGORITHMS[name]()
+    tracemalloc.start()
+    try:
+        recommender.prepare(dataset, subscriptions)
+        for row in queries[:5]:
+            recommender.recommend(row, k)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def evaluate(name, dataset, subscriptions, truth, k=6):
+    recommender = ALGORITHMS[name]()
+    queries = list(truth)
+
+    started = time.perf_counter()
+    recommender.prepare(dataset, subscriptions)
+    prepare_seconds = time.perf_counter() - started
+    recommender.recommend(queries[0], k)   # 첫 호출(지연 로딩 등)은 지연 시간에서 뺌
+
+    latencies, precision, recall = [], [], []
+    for row in queries:
+        t0 = time.perf_counter()
+        recs = recommender.recommend(row, k)
+        latencies.append(time.perf_counter() - t0)
+        hits = len(set(recs) & truth[row])
+        precision.append(hits / k)
+        recall.append(hits / len(truth[row]))
+    del recommender
+
+    return {
+        'algorithm': name, 'users': len(dataset['user_ids']), 'queries': len(queries), 'k': k,
+        f'precision@{k}': round(float(np.mean(precision)), 4),
+        f'recall@{k}': round(float(np.mean(recall)), 4),
+        'prepare_s': round(prepare_seconds, 3),
+        'p50_ms': _percentile(latencies, 50), 'p95_ms': _percentile(latencies, 95), 'p99_ms': _percentile(latencies, 99),
+        'peak_mb': round(peak_memory(name, dataset, subscriptions, queries, k) / 1024 / 1024, 1),
+    }
+
+
+def run_benchmark(n_users=10000, n_options=400, n_queries=200, k=6, algorithms=('baseline', 'index', 'best_rate'),
+                  baseline_max_users=5000, seed=42):
+    """같은 데이터/같은 평가 유저로 알고리즘별 결과를 돌려줌"""
+    dataset = generate_dataset(n_users, n_options, seed=seed)
+    subscriptions, truth = split_holdout(dataset, n_queries, seed=seed)
+    results, skipped = [], {}
+    if not truth:
+        return {'results': results, 'skipped': {name: 'no user with 2+ subscriptions' for name in algorithms}}
+    for name in algorithms:
+        # baseline 은 N x N float64 행렬을 요청마다 만듦 -> 유저 수가 크면 메모리/시간 때문에 건너뜀
+        if name == 'baseline' and n_users > baseline_max_users:
+            skipped[name] = f'{n_users} users > baseline_max_users={baseline_max_users} (N x N = {n_users ** 2 * 8 / 1e9:.1f} GB)'
+            continue
+        results.append(evaluate(name, dataset, subscriptions, truth, k=k))
+    return {'results': results, 'skipped': skipped}
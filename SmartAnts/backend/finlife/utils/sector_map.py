@@ -0,0 +1,100 @@
+# backend/finlife/utils/sector_map.py
+import json
+import logging
+import os
+
+import requests
+from bs4 import BeautifulSoup
+
+from .snapshots import SnapshotFile
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# 🐜 네이버 업종 -> GICS 11개 섹터 매핑 (sectors.json)
+# =========================================================
+# 스케줄러(sector_map 작업)가 주기적으로 다시 긁어서 MARKET_SNAPSHOT_DIR/sectors.json 에 저장하고,
+# 퀀트 팩터 스냅샷을 만들 때 이 파일을 읽음 (다른 스냅샷처럼 원자적 교체 + mtime 보고 자동 재로딩)
+# 아직 한 번도 안 돌았으면 패키지에 같이 들어있는 sectors.json(초기값)을 씀
+
+SECTOR_SNAPSHOT = SnapshotFile("sectors.json", fmt="json")
+SECTOR_SEED_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sectors.json")
+NAVER_UPJONG_URL = "https://finance.naver.com/sise/sise_group.naver?type=upjong"
+
+# 위에서부터 먼저 걸리는 섹터로 분류
+GICS_KEYWORDS = [
+    ("IT", ["반도체", "IT", "소프트웨어", "전자", "디스플레이", "컴퓨터", "통신장비", "핸드셋", "전자제품"]),
+    ("헬스케어", ["제약", "바이오", "생명", "헬스", "건강", "의료"]),
+    ("금융", ["은행", "증권", "보험", "금융", "캐피탈", "투자", "지주"]),  # 지주사는 보통 금융으로 분류
+    ("커뮤니케이션", ["통신", "미디어", "엔터", "게임", "광고", "방송", "출판", "영화", "인터넷", "SNS"]),
+    ("산업재", ["건설", "조선", "기계", "운송", "해운", "항공", "방산", "상사", "물류", "전선", "건축", "엔지니어링", "전기장비", "무역"]),
+    ("소재", ["화학", "철강", "금속", "비철", "시멘트", "제지", "비료", "유리", "광물", "포장", "섬유"]),
+    ("필수소비재", ["음식료", "식품", "담배", "생활용품", "화장품", "음료"]),
+    ("경기소비재", ["자동차", "부품", "유통", "백화점", "의류", "호텔", "레저", "교육", "가구", "가전", "소매", "면세"]),
+    ("에너지", ["에너지", "정유", "석유", "가스", "LPG"]),
+    ("유틸리티", ["전력", "가스유틸", "수도", "환경", "폐기물"]),
+    ("부동산", ["부동산", "리츠"]),
+]
+
+
+def map_naver_to_gics(naver_sector):
+    s = naver_sector.replace(" ", "")
+    for gics, keywords in GICS_KEYWORDS:
+        if any(k in s for k in keywords):
+            return gics
+    return "기타"
+
+
+def _get_soup(url):
+    res = requests.get(url, timeout=10)
+    res.encoding = 'euc-kr'  # 한글 깨짐 방지
+    return BeautifulSoup(res.text, 'html.parser')
+
+
+def crawl_naver_sectors():
+    """네이버 금융 업종 페이지를 돌며 {종목코드: GICS 섹터} 생성"""
+    links = _get_soup(NAVER_UPJONG_URL).find('table', {'class': 'type_1'}).find_all('a')
+    sector_map = {}
+    for link in links:
+        sector_name = link.text.strip()
+        gics_sector = map_naver_to_gics(sector_name)
+        try:
+            stocks = _get_soup("https://finance.naver.com" + link['href']).find('table', {'class': 'type_5'}).find_all('a')
+            for stock in stocks:
+                if 'code=' in stock['href']:
+                    sector_map[stock['href'].split('code=')[1]] = gics_sector
+        except Exception as e:
+            logger.warning("❌ %s 크롤링 실패: %s", sector_name, e)
+    return sector_map
+
+
+_seed_map = None
+
+
+def _load_seed():
+    global _seed_map
+    if _seed_map is None:
+        try:
+            with open(SECTOR_SEED_PATH, "r", encoding="utf-8") as f:
+                _seed_map = json.load(f)
+        except Exception:
+            _seed_map = {}
+    return _seed_map
+
+
+def load_sector_map():
+    sector_map = SECTOR_SNAPSHOT.get()
+    return sector_map if sector_map is not None else _load_seed()
+
+
+def save_sector_map(sector_map):
+    SECTOR_SNAPSHOT.write(sector_map)
+
+
+def refresh_sector_map(min_entries=500):
+    """다시 긁어서 sectors.json 교체. 결과가 너무 적으면(차단/구조 변경) 기존 파일 유지"""
+    sector_map = crawl_naver_sectors()
+    if len(sector_map) < min_entries:
+        raise ValueError(f"sector map too small ({len(sector_map)} codes), keeping the old file")
+    save_sector_map(sector_map)
+    return {'codes': len(sector_map)}
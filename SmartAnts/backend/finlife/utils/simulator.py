@@ -0,0 +1,109 @@
+# backend/finlife/utils/simulator.py
+import numpy as np
+
+from finlife.catalogue_cache import catalogue_version
+from finlife.models import DepositOptions, SavingOptions
+from .cache import market_cache
+
+# =========================================================
+# 🐜 예금/적금 만기 시뮬레이터 (전체 옵션을 NumPy 배열로 한 번에 계산)
+# =========================================================
+# - 예금: 원금(principal)을 한 번에 넣고 만기까지
+#     단리 = P * r * n/12                 복리(월복리) = P * ((1 + r/12)^n - 1)
+# - 적금: 매월 초 monthly 씩 n번 납입
+#     단리 = M * r/12 * n(n+1)/2          복리(월복리) = M * ((1 + r/12) * ((1 + r/12)^n - 1) / (r/12) - n)
+# - 이자에만 세금 (일반 15.4%, 세금우대 9.5%, 비과세 0%)
+# 옵션 배열은 카탈로그 버전(상품 동기화 시각)별로 한 번만 만들어서 재사용
+
+TAX_RATES = {'general': 0.154, 'preferential': 0.095, 'none': 0.0}
+KINDS = ('deposit', 'saving')
+SORT_KEYS = ('interest', 'yield')     # 세후 이자 | 세후 연 수익률
+OPTION_ARRAY_TTL = 60 * 60 * 24
+
+
+def load_option_arrays():
+    columns = {k: [] for k in ('kind', 'id', 'product_id', 'fin_prdt_cd', 'kor_co_nm', 'fin_prdt_nm',
+                               'intr_rate_type_nm', 'save_trm', 'intr_rate', 'intr_rate2')}
+    for kind, OptionModel in (('deposit', DepositOptions), ('saving', SavingOptions)):
+        rows = OptionModel.objects.values_list(
+            'id', 'product_id', 'product__fin_prdt_cd', 'product__kor_co_nm', 'product__fin_prdt_nm',
+            'intr_rate_type_nm', 'save_trm', 'intr_rate', 'intr_rate2',
+        )
+        for row in rows:
+            columns['kind'].append(kind)
+            for key, value in zip(list(columns)[1:], row):
+                columns[key].append(value)
+
+    arrays = {key: np.array(values, dtype=object) for key, values in columns.items()}
+    arrays['is_saving'] = arrays['kind'] == 'saving'
+    arrays['is_compound'] = np.array(['복리' in (t or '') for t in columns['intr_rate_type_nm']], dtype=bool)
+    arrays['save_trm'] = np.array(columns['save_trm'], dtype=float)
+    arrays['intr_rate'] = np.array(columns['intr_rate'], dtype=float)      # None -> nan
+    arrays['intr_rate2'] = np.array(columns['intr_rate2'], dtype=float)
+    return arrays
+
+
+def get_option_arrays():
+    version, _ = catalogue_version()
+    return market_cache.get_or_fetch(
+        "option_arrays", (version,), load_option_arrays, ttl=OPTION_ARRAY_TTL,
+        cache_if=lambda arrays: len(arrays['id']) > 0,
+    )
+
+
+def maturity_interest(rate, months, is_saving, is_compound, principal, monthly):
+    """세전 이자 (배열 연산). rate 는 연 % 단위"""
+    i = rate / 100 / 12
+    n = months
+    growth = np.power(1 + i, n)
+    deposit = np.where(is_compound, principal * (growth - 1), principal * i * n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        saving_compound = monthly * ((1 + i) * (growth - 1) / i - n)
+    saving_compound = np.where(i > 0, saving_compound, 0.0)
+    saving = np.where(is_compound, saving_compound, monthly * i * n * (n + 1) / 2)
+    return np.where(is_saving, saving, deposit)
+
+
+def simulate_options(principal=0, monthly=0, months=12, rate='max', tax='general', kind=None, limit=50, sort='interest'):
+    if sort not in SORT_KEYS:
+        raise ValueError(f"sort는 {list(SORT_KEYS)} 중 하나여야 합니다.")
+    arrays = get_option_arrays()
+    if arrays is None:
+        return []
+
+    # 이 기간(save_trm)의 옵션만, 예금은 원금이 / 적금은 월 납입액이 있을 때만
+    mask = arrays['save_trm'] == months
+    mask &= np.where(arrays['is_saving'], monthly > 0, principal > 0)
+    if kind in KINDS:
+        mask &= arrays['kind'] == kind
+
+    # 우대금리가 없는 옵션은 기본금리로
+    rates = arrays['intr_rate2'] if rate == 'max' else arrays['intr_rate']
+    rates = np.where(np.isnan(rates), arrays['intr_rate'], rates)
+    mask &= ~np.isnan(rates)
+    idx = np.flatnonzero(mask)
+    if not len(idx):
+        return []
+
+    is_saving = arrays['is_saving'][idx]
+    paid = np.where(is_saving, monthly * months, principal).astype(float)
+    gross = maturity_interest(rates[idx], months, is_saving, arrays['is_compound'][idx], principal, monthly)
+    tax_amount = np.floor(gross * TAX_RATES[tax])           # 원 단위 절사
+    net = gross - tax_amount
+    # 세후 연 수익률 (납입 원금 대비, 기간 환산)
+    effective_yield = net / paid * 12 / months * 100
+
+    score = effective_yield if sort == 'yield' else net
+    order = np.argsort(-score, kind='stable')[:limit]
+    return [
+        {
+            'kind': arrays['kind'][j], 'option_id': arrays['id'][j], 'product_id': arrays['product_id'][j],
+            'fin_prdt_cd': arrays['fin_prdt_cd'][j], 'kor_co_nm': arrays['kor_co_nm'][j],
+            'fin_prdt_nm': arrays['fin_prdt_nm'][j], 'intr_rate_type_nm': arrays['intr_rate_type_nm'][j],
+            'save_trm': months, 'rate': float(rates[j]),
+            'paid': int(paid[k]), 'interest': int(np.floor(gross[k])), 'tax': int(tax_amount[k]),
+            'net_interest': int(np.floor(net[k])), 'maturity_amount': int(np.floor(paid[k] + net[k])),
+            'effective_yield': round(float(effective_yield[k]), 3),
+        }
+        for k, j in ((k, idx[k]) for k in order)
+    ]
@@ -0,0 +1,91 @@
+# backend/finlife/utils/snapshots.py
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# 🐜 스냅샷 파일 (워커 공용, 갱신되면 자동 교체)
+# =========================================================
+# - 쓰기: 임시 파일에 다 쓴 뒤 os.replace 로 한 번에 교체 (반쯤 쓴 파일을 읽는 일 없음)
+# - 읽기: check_interval 초마다 mtime만 확인해서 바뀌었으면 다시 읽고 참조를 통째로 바꿔 끼움
+#   (참조 교체는 대입 한 번이라 요청 처리 중인 스레드는 이전 객체를 끝까지 안전하게 씀)
+
+
+class SnapshotFile:
+    def __init__(self, filename, fmt="json", check_interval=60):
+        self.filename = filename
+        self.fmt = fmt
+        self.check_interval = check_interval
+        self._value = None
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        return os.path.join(settings.MARKET_SNAPSHOT_DIR, self.filename)
+
+    def _read(self, path):
+        if self.fmt == "pickle":
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def write(self, value):
+        path = self.path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        if self.fmt == "pickle":
+            with open(tmp_path, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._value, self._mtime, self._checked_at = value, os.path.getmtime(path), time.time()
+
+    def get(self, force=False):
+        """현재 스냅샷 (없으면 None). 파일이 바뀌었으면 새 내용으로 교체"""
+        now = time.time()
+        if not force and self._value is not None and now - self._checked_at < self.check_interval:
+            return self._value
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError:
+                return self._value
+            if mtime != self._mtime:
+                try:
+                    self._value, self._mtime = self._read(self.path), mtime
+                except Exception as e:
+                    logger.warning("Snapshot load error (%s): %s", self.filename, e)
+            return self._value
+
+    def acquire_build_lock(self, stale_after=600):
+        """스냅샷이 아예 없을 때 여러 워커가 동시에 만들지 않도록 잠금 파일 선점"""
+        lock_path = f"{self.path}.lock"
+        os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+        try:
+            if time.time() - os.path.getmtime(lock_path) > stale_after:
+                os.remove(lock_path)  # 빌드하다 죽은 프로세스가 남긴 잠금
+        except OSError:
+            pass
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            return False
+
+    def release_build_lock(self):
+        try: os.remove(f"{self.path}.lock")
+        except OSError: pass
@@ -0,0 +1,165 @@
+# backend/finlife/utils/subscription_matrix.py
+import threading
+
+import numpy as np
+from scipy import sparse
+
+from finlife.models import DepositOptions, SavingOptions
+from .snapshots import SnapshotFile
+
+# =========================================================
+# 🐜 유저 x 상품옵션 가입 행렬 (recommend_products 2단계 + "이 상품 가입자가 함께 가입한 상품")
+# =========================================================
+# - 열 키는 (kind, option_id): 예금/적금 옵션 id 가 겹쳐도 섞이지 않음
+# - 기준 행렬 matrix(CSR) + 이후 가입/해지분 delta(DOK, +1/-1)  ->  실제 가입 = matrix + delta
+#   가입/해지 때는 delta 한 칸만 바꾸고, 스케줄러 subscription_matrix 작업이 주기적으로 다시 합쳐서 스냅샷 저장
+# - 유사 유저 집계 = (이웃 표시 벡터) @ 행렬  -> 희소 행렬-벡터 곱 한 번
+# - 함께 가입한 상품 = (이 상품 가입자 벡터) @ 행렬 -> 가입자 행만 훑음
+
+MATRIX_VERSION = 1
+SUBSCRIPTION_SNAPSHOT = SnapshotFile("subscription_matrix.pkl", fmt="pickle")
+OPTION_MODELS = {'deposit': DepositOptions, 'saving': SavingOptions}
+
+
+class SubscriptionMatrix:
+    def __init__(self, pairs):
+        """pairs: [(user_id, (kind, option_id)), ...]"""
+        self.user_ids, self.row_pos = [], {}
+        self.items, self.col_pos = [], {}
+        rows = [self._position(self.user_ids, self.row_pos, uid) for uid, _ in pairs]
+        cols = [self._position(self.items, self.col_pos, key) for _, key in pairs]
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(pairs), dtype=np.float32), (rows, cols)), shape=self.shape,
+        )
+        self.matrix.data[:] = 1  # 같은 쌍이 두 번 들어와도 1
+        self.columns = self.matrix.tocsc()
+        self.delta = sparse.dok_matrix(self.shape, dtype=np.float32)
+        self._delta_csr = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_lock", None)
+        state["_delta_csr"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def shape(self):
+        return (len(self.user_ids), len(self.items))
+
+    @staticmethod
+    def _position(keys, positions, key):
+        if key not in positions:
+            positions[key] = len(keys)
+            keys.append(key)
+        return positions[key]
+
+    # -----------------------------------------------------
+    # 증분 갱신 (가입/해지)
+    # -----------------------------------------------------
+    def set(self, user_id, key, joined):
+        with self._lock:
+            r = self._position(self.user_ids, self.row_pos, user_id)
+            c = self._position(self.items, self.col_pos, key)
+            if self.matrix.shape != self.shape:
+                # 처음 보는 유저/상품이면 행렬 크기만 늘림 (기존 값 복사 없음)
+                for m in (self.matrix, self.columns, self.delta):
+                    m.resize(self.shape)
+            base = self.matrix[r, c] if r < self.matrix.shape[0] else 0
+            self.delta[r, c] = (1 if joined else 0) - base
+            self._delta_csr = None
+
+    def _delta(self):
+        delta = self._delta_csr
+        if delta is None:
+            delta = self._delta_csr = self.delta.tocsr()
+        return delta
+
+    def _aggregate(self, row_vector):
+        """(1 x 유저) 희소 벡터 @ 가입 행렬 -> 상품별 합계 (dense 1차원)"""
+        return np.asarray((row_vector @ self.matrix + row_vector @ self._delta()).todense()).ravel()
+
+    # -----------------------------------------------------
+    # 조회
+    # -----------------------------------------------------
+    def joined(self, user_id):
+        r = self.row_pos.get(user_id)
+        if r is None:
+            return set()
+        row = self.matrix.getrow(r) + self._delta().getrow(r)
+        return {self.items[c] for c, v in zip(row.indices, row.data) if v > 0}
+
+    def neighbour_counts(self, user_ids, exclude=(), limit=10):
+        """이웃들이 가입한 상품 [(key, 가입 이웃 수), ...] 많은 순 (exclude 키는 제외)"""
+        rows = [self.row_pos[uid] for uid in user_ids if uid in self.row_pos]
+        if not rows:
+            return []
+        indicator = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (np.zeros(len(rows), dtype=int), rows)), shape=(1, self.shape[0]),
+        )
+        return self._top_items(self._aggregate(indicator), exclude, limit)
+
+    def also_joined(self, key, exclude=(), limit=10):
+        """이 상품 가입자들이 함께 가입한 상품 [(key, 함께 가입한 유저 수), ...], 가입자 수"""
+        c = self.col_pos.get(key)
+        if c is None:
+            return [], 0
+        members = (self.columns.getcol(c) + self._delta().getcol(c)).T.tocsr()
+        members.data = (members.data > 0).astype(np.float32)
+        members.eliminate_zeros()
+        if not members.nnz:
+            return [], 0
+        return self._top_items(self._aggregate(members), set(exclude) | {key}, limit), int(members.nnz)
+
+    def _top_items(self, counts, exclude, limit):
+        for key in exclude:
+            if key in self.col_pos:
+                counts[self.col_pos[key]] = 0
+        nonzero = np.flatnonzero(counts > 0)
+        if not len(nonzero):
+            return []
+        # 개수 많은 순, 같으면 열 순서(먼저 가입 기록이 생긴 상품) 순
+        order = nonzero[np.argsort(-counts[nonzero], kind="stable")][:limit]
+        return [(self.items[c], int(counts[c])) for c in order]
+
+
+def build_subscription_matrix():
+    pairs = []
+    for kind, OptionModel in OPTION_MODELS.items():
+        through = OptionModel.contract_user.through
+        column = f"{OptionModel._meta.model_name}_id"
+        pairs += [
+            (user_id, (kind, option_id))
+            for user_id, option_id in through.objects.order_by("pk").values_list("user_id", column)
+        ]
+    return SubscriptionMatrix(pairs)
+
+
+def write_subscription_snapshot():
+    matrix = build_subscription_matrix()
+    SUBSCRIPTION_SNAPSHOT.write({"schema": MATRIX_VERSION, "matrix": matrix})
+    return matrix
+
+
+def get_subscription_matrix():
+    snapshot = SUBSCRIPTION_SNAPSHOT.get()
+    if snapshot and snapshot.get("schema") == MATRIX_VERSION:
+        return snapshot["matrix"]
+    if not SUBSCRIPTION_SNAPSHOT.acquire_build_lock():
+        return build_subscription_matrix()
+    try: return write_subscription_snapshot()
+    finally: SUBSCRIPTION_SNAPSHOT.release_build_lock()
+
+
+def update_subscriptions(user_ids, keys, joined):
+    """signals 에서 호출: 현재 워커 행렬에 가입/해지 반영 (스냅샷이 없으면 다음 조회 때 새로 만듦)"""
+    snapshot = SUBSCRIPTION_SNAPSHOT.get()
+    if not snapshot:
+        return
+    for user_id in user_ids:
+        for key in keys:
+            snapshot["matrix"].set(user_id, key, joined)
@@ -0,0 +1,163 @@
+# backend/finlife/utils/ticker_index.py
+from bisect import bisect_left
+
+from .snapshots import SnapshotFile
+
+# =========================================================
+# 🐜 종목명/종목코드 검색 인덱스
+# =========================================================
+# - exact: 이름/코드 딕셔너리 조회
+# - prefix: 정렬된 이름 목록 + bisect
+# - substring: 1~2글자 n-gram 역색인 교집합 후 실제 포함 여부만 확인
+# 한 번 만들어서 스냅샷 파일로 저장해두고, 새 프로세스는 파일만 읽어서 바로 사용
+# (KRX 매핑 스냅샷이 갱신되면 같은 버전으로 다시 만들어짐)
+
+INDEX_VERSION = 1
+
+
+def _grams(text):
+    # 1글자(unigram) + 2글자(bigram). 한글 종목명은 짧아서 이 정도면 충분
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+class TickerIndex:
+    def __init__(self, mapping):
+        # mapping: {종목명: 야후 심볼} (get_krx_mapping 결과)
+        self.mapping = dict(mapping)
+        self.names = sorted(self.mapping)
+        self.lower_names = {}
+        for name in self.names:
+            self.lower_names.setdefault(name.lower(), name)
+        self.sorted_lower = sorted(self.lower_names)
+
+        # 종목코드(005930) -> 종목명. 야후 심볼에서 거래소 접미사(.KS/.KQ)를 뗀 값
+        self.codes = {}
+        for name, symbol in self.mapping.items():
+            code = symbol.split(".")[0]
+            if code.isdigit(): self.codes.setdefault(code, name)
+        self.sorted_codes = sorted(self.codes)
+
+        postings = {}
+        for i, name in enumerate(self.names):
+            for gram in _grams(name.lower()):
+                postings.setdefault(gram, []).append(i)
+        self.postings = {gram: frozenset(ids) for gram, ids in postings.items()}
+
+    # -----------------------------------------------------
+    # 조회
+    # -----------------------------------------------------
+    def exact(self, query):
+        if query in self.mapping: return self.mapping[query]
+        name = self.lower_names.get(query.lower())
+        if name: return self.mapping[name]
+        name = self.codes.get(query)
+        return self.mapping[name] if name else None
+
+    def prefix(self, query, limit=None):
+        key = query.lower()
+        result = []
+        i = bisect_left(self.sorted_lower, key)
+        while i < len(self.sorted_lower) and self.sorted_lower[i].startswith(key):
+            result.append(self.lower_names[self.sorted_lower[i]])
+            if limit and len(result) >= limit: break
+            i += 1
+        return result
+
+    def code_prefix(self, query, limit=None):
+        result = []
+        i = bisect_left(self.sorted_codes, query)
+        while i < len(self.sorted_codes) and self.sorted_codes[i].startswith(query):
+            result.append(self.codes[self.sorted_codes[i]])
+            if limit and len(result) >= limit: break
+            i += 1
+        return result
+
+    def substring(self, query):
+        key = query.lower()
+        if not key: return []
+        grams = [key[i:i + 2] for i in range(len(key) - 1)] or [key]
+        candidates = None
+        for gram in sorted(grams, key=lambda g: len(self.postings.get(g, ()))):
+            ids = self.postings.get(gram)
+            if not ids: return []
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates: return []
+        return [self.names[i] for i in candidates if key in self.names[i].lower()]
+
+    def best_match(self, query):
+        """부분 일치하는 종목 중 가장 짧은 이름의 심볼 (기존 선형 탐색과 동일한 규칙)"""
+        candidates = self.substring(query)
+        if not candidates: return None
+        return self.mapping[min(candidates, key=lambda n: (len(n), n))]
+
+    def autocomplete(self, query, limit=10):
+        """정확히 일치 > 접두어 > 부분 일치 순, 같은 순위면 짧은 이름 우선"""
+        query = query.strip()
+        if not query: return []
+        ranked = {}
+
+        def add(name, rank):
+            if name not in ranked or rank < ranked[name]: ranked[name] = rank
+
+        exact_name = self.lower_names.get(query.lower()) or self.codes.get(query)
+        if exact_name: add(exact_name, 0)
+        if query.isdigit():
+            for name in self.code_prefix(query, limit): add(name, 1)
+        for name in self.prefix(query, limit): add(name, 1)
+        if len(ranked) < limit:
+            for name in self.substring(query): add(name, 2)
+
+        ordered = sorted(ranked.items(), key=lambda item: (item[1], len(item[0]), item[0]))[:limit]
+        return [
+            {"name": name, "symbol": self.mapping[name], "match": ("exact", "prefix", "contains")[rank]}
+            for name, rank in ordered
+        ]
+
+    def __len__(self):
+        return len(self.names)
+
+
+# =========================================================
+# 프로세스 공용 인덱스 (KRX 매핑 스냅샷과 같은 버전으로 관리)
+# =========================================================
+TICKER_INDEX_SNAPSHOT = SnapshotFile("ticker_index.pkl", fmt="pickle")
+
+
+def write_index_snapshot(version, mapping):
+    index = TickerIndex(mapping)
+    TICKER_INDEX_SNAPSHOT.write({"schema": INDEX_VERSION, "version": version, "index": index})
+    return index
+
+
+def build_ticker_index():
+    from .external_api import KRX_MAPPING_SNAPSHOT, get_krx_mapping
+
+    mapping = get_krx_mapping()
+    snapshot = KRX_MAPPING_SNAPSHOT.get()
+    if snapshot is None:
+        # 매핑 스냅샷이 아직 없으면(인기 종목 임시 매핑) 저장하지 않고 메모리에서만 사용
+        return TickerIndex(mapping)
+    return write_index_snapshot(snapshot["version"], snapshot["mapping"])
+
+
+_fallback_index = None
+
+
+def get_ticker_index():
+    """요청에서 쓰는 인덱스. 여기서는 절대 다시 만들지 않음 (만드는 건 krx_mapping 작업 / build_ticker_index 커맨드)
+    버전이 지난 인덱스라도 있으면 그대로 쓰고, 아예 없으면 인기 종목만으로 메모리 인덱스"""
+    global _fallback_index
+    from .external_api import KOREAN_POPULAR_MAP, KRX_MAPPING_SNAPSHOT
+
+    mapping_snapshot = KRX_MAPPING_SNAPSHOT.get()
+    snapshot = TICKER_INDEX_SNAPSHOT.get()
+    if snapshot and mapping_snapshot and snapshot.get("version") != mapping_snapshot["version"]:
+        # 매핑만 먼저 교체된 경우일 수 있으니 인덱스 파일도 바로 다시 확인
+        snapshot = TICKER_INDEX_SNAPSHOT.get(force=True)
+    if snapshot and snapshot.get("schema") == INDEX_VERSION:
+        return snapshot["index"]
+    if _fallback_index is None:
+        _fallback_index = TickerIndex(KOREAN_POPULAR_MAP)
+    return _fallback_index
@@ -0,0 +1,200 @@
+# backend/finlife/utils/user_index.py
+import threading
+from datetime import date
+
+import numpy as np
+from django.contrib.auth import get_user_model
+
+from finlife.scheduler import request_run
+from .snapshots import SnapshotFile
+
+# =========================================================
+# 🐜 유사 유저 검색 인덱스 (recommend_products 1단계)
+# =========================================================
+# - 특성: [나이, 연봉, 자산] (기존 DataFrame + cosine_similarity 와 같은 값)
+# - 행마다 길이 1로 정규화해서 저장 -> 코사인 유사도 = 내 벡터와의 내적 한 번 (N x 3 행렬-벡터 곱)
+# - N x N 유사도 행렬은 만들지 않고, 상위 k 는 argpartition 으로 뽑음
+# - 스냅샷 파일로 워커끼리 공유 (스케줄러 user_index 작업이 주기적으로 다시 만듦, 날짜가 지나면 바로 돌도록 요청)
+#   + 프로필이 바뀌면 signals 에서 그 유저 행만 바로 갱신 (해당 워커 메모리)
+
+INDEX_VERSION = 1
+USER_INDEX_SNAPSHOT = SnapshotFile("user_index.pkl", fmt="pickle")
+USER_INDEX_JOB = "user_index"   # finlife/jobs.py 의 재구축 작업
+FEATURES = ("age", "salary", "money")
+FEATURE_FIELDS = {"birth_date", "salary", "money"}   # 이 필드가 바뀔 때만 인덱스 갱신
+
+
+def _age(born, today=None):
+    # 기존 추천 로직과 같은 "연 나이" (만 나이 아님)
+    today = today or date.today()
+    return today.year - born.year if born else 30
+
+
+def user_features(birth_date, salary, money, today=None):
+    return np.array([_age(birth_date, today), salary or 0, money or 0], dtype=np.float64)
+
+
+def _normalize(rows):
+    norms = np.linalg.norm(rows, axis=-1, keepdims=True)
+    return np.divide(rows, norms, out=np.zeros_like(rows), where=norms > 0)
+
+
+def eligible_users():
+    # 기존 로직과 같은 조건: 생일과 연봉이 입력된 유저만
+    return get_user_model().objects.filter(birth_date__isnull=False, salary__isnull=False)
+
+
+class UserIndex:
+    # (user_ids, matrix, active, pos) 를 튜플 하나로 들고 있다가 갱신할 때는 복사본을 만들어 대입 한 번으로 교체
+    # -> top_k 는 시작할 때 잡은 튜플만 보므로 id -> 행 번호와 행렬이 서로 어긋난 상태를 읽는 일 없음
+    def __init__(self, user_ids, features):
+        user_ids = np.asarray(user_ids, dtype=np.int64)
+        matrix = _normalize(np.asarray(features, dtype=np.float64).reshape(-1, len(FEATURES)))
+        active = np.ones(len(user_ids), dtype=bool)
+        self._state = (user_ids, matrix, active, {int(uid): i for i, uid in enumerate(user_ids)})
+        self._lock = threading.Lock()   # 쓰는 쪽끼리만 (읽기는 잠금 없음)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_lock", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def user_ids(self):
+        return self._state[0]
+
+    @property
+    def matrix(self):
+        return self._state[1]
+
+    def __len__(self):
+        return int(self._state[2].sum())
+
+    def __contains__(self, user_id):
+        return user_id in self._state[3]
+
+    # -----------------------------------------------------
+    # 증분 갱신 (프로필 수정/가입/탈퇴)
+    # -----------------------------------------------------
+    def upsert(self, user_id, features):
+        row = _normalize(np.asarray(features, dtype=np.float64))
+        with self._lock:
+            user_ids, matrix, active, pos = self._state
+            i = pos.get(user_id)
+            if i is None:
+                # 새 유저는 끝에 붙임 (배열 복사는 가입 시 한 번, 전체 재구축은 스케줄러가 함)
+                pos = {**pos, user_id: len(user_ids)}
+                user_ids = np.append(user_ids, user_id)
+                matrix = np.vstack([matrix, row])
+                active = np.append(active, True)
+            else:
+                matrix, active = matrix.copy(), active.copy()
+                matrix[i] = row
+                active[i] = True
+            self._state = (user_ids, matrix, active, pos)
+
+    def remove(self, user_id):
+        with self._lock:
+            user_ids, matrix, active, pos = self._state
+            i = pos.get(user_id)
+            if i is None:
+                return
+            pos = {uid: j for uid, j in pos.items() if uid != user_id}
+            matrix, active = matrix.copy(), active.copy()
+            active[i] = False
+            matrix[i] = 0
+            self._state = (user_ids, matrix, active, pos)
+
+    # -----------------------------------------------------
+    # 조회
+    # -----------------------------------------------------
+    def similarities(self, features):
+        return self._state[1] @ _normalize(np.asarray(features, dtype=np.float64))
+
+    def top_k(self, features, k=10, exclude=None):
+        """(user_ids, similarities) 유사도 높은 순. 내 행 하나만 계산 (O(N), N x N 행렬 없음)"""
+        user_ids, matrix, active, pos = self._state
+        sims = np.where(active, matrix @ _normalize(np.asarray(features, dtype=np.float64)), -np.inf)
+        if exclude is not None and exclude in pos:
+            sims[pos[exclude]] = -np.inf
+        k = min(k, int(np.isfinite(sims).sum()))
+        if k <= 0:
+            return [], []
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top], kind="stable")]
+        return user_ids[top].tolist(), sims[top].tolist()
+
+
+def build_user_index():
+    today = date.today()
+    rows = list(eligible_users().values_list("id", "birth_date", "salary", "money"))
+    features = [user_features(b, s, m, today) for _, b, s, m in rows]
+    return UserIndex([r[0] for r in rows], features)
+
+
+def write_user_index_snapshot():
+    index = build_user_index()
+    USER_INDEX_SNAPSHOT.write({"schema": INDEX_VERSION, "built_on": date.today().isoformat(), "index": index})
+    return index
+
+
+def get_user_index():
+    snapshot = USER_INDEX_SNAPSHOT.get()
+    if snapshot and snapshot.get("schema") == INDEX_VERSION:
+        # 날짜가 지난 스냅샷(나이가 1살씩 밀림)도 그대로 쓰고, 재구축은 스케줄러에 맡김 (요청에서 O(N) 재구축 안 함)
+        if snapshot.get("built_on") != date.today().isoformat():
+            _request_rebuild(snapshot.get("built_on"))
+        return snapshot["index"]
+
+    # 스냅샷이 아예 없을 때(첫 배포)만: 한 워커가 파일로 남기고, 나머지는 이번 요청용으로만 DB에서 바로 만듦
+    if not USER_INDEX_SNAPSHOT.acquire_build_lock():
+        return build_user_index()
+    try: return write_user_index_snapshot()
+    finally: USER_INDEX_SNAPSHOT.release_build_lock()
+
+
+_rebuild_requested_for = None
+
+
+def _request_rebuild(built_on):
+    # 같은 스냅샷에 대해서는 워커당 한 번만 요청
+    global _rebuild_requested_for
+    if _rebuild_requested_for == built_on:
+        return
+    _rebuild_requested_for = built_on
+    request_run(USER_INDEX_JOB)
+
+
+def similar_user_ids(user, k=10):
+    """나와 비슷한 유저 상위 k명 (나 제외). 생일/연봉이 없으면 None"""
+    if user.birth_date is None or user.salary is None:
+        return None
+    index = get_user_index()
+    # 내 벡터는 인덱스가 아니라 지금 요청의 유저 객체로 계산 (방금 바꾼 프로필도 바로 반영)
+    features = user_features(user.birth_date, user.salary, user.money)
+    if user.pk not in index:
+        index.upsert(user.pk, features)
+    ids, _ = index.top_k(features, k=k, exclude=user.pk)
+    return ids
+
+
+def update_user_in_index(user):
+    """signals 에서 호출: 프로필이 바뀐 유저 행만 현재 워커 인덱스에 반영"""
+    snapshot = USER_INDEX_SNAPSHOT.get()
+    if not snapshot:
+        return  # 아직 인덱스가 없으면 다음 조회 때 DB에서 새로 만듦
+    index = snapshot["index"]
+    if user.birth_date is not None and user.salary is not None:
+        index.upsert(user.pk, user_features(user.birth_date, user.salary, user.money))
+    else:
+        index.remove(user.pk)
+
+
+def remove_user_from_index(user_id):
+    snapshot = USER_INDEX_SNAPSHOT.get()
+    if snapshot:
+        snapshot["index"].remove(user_id)
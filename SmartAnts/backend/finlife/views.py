@@ -1,4 +1,5 @@
 # backend/finlife/views.py
+import math
 import re
 import random
 import requests
@@ -6,13 +7,14 @@ import pandas as pd
 from datetime import datetime, timedelta
 
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 from collections import Counter
 
 from django.conf import settings
 from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404
 from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
 
@@ -21,13 +23,13 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 
-from .models import DepositProduct, DepositOptions, SavingProduct, SavingOptions, ExchangeRate # DepositProduct, SavingProduct (s) 빠짐 나중에 추후에
+from .models import DepositProduct, DepositOptions, SavingProduct, SavingOptions, ExchangeRate, DepositRateHistory, SavingRateHistory # DepositProduct, SavingProduct (s) 빠짐 나중에 추후에
 from .serializers import (
     DepositProductSerializer, SavingProductSerializer, 
     ExchangeRateSerializer, JoinedDepositOptionSerializer, JoinedSavingOptionSerializer,
-    DepositOptionsSerializer, SavingOptionsSerializer
+    DepositOptionsSerializer, SavingOptionsSerializer, with_option_rates,
 )
 
 # 🐜 [수정] 모든 외부 유틸리티를 안정적인 동기 방식으로 호출합니다.
@@ -37,66 +39,177 @@ from .utils.external_api import (
     get_spot_history_data,
     get_stock_data 
 )
-from .utils.quant_analysis import get_stock_ranking
+from .catalogue_cache import cached_catalogue_response
+from .pagination import CataloguePagination
+from .scheduler import job_status
+from .utils.backtest import run_backtest
+from .utils.cache import market_cache
+from .utils.quant_analysis import (
+    get_stock_ranking, sweep_weights, weight_grid, weight_grid_size, weight_samples, WEIGHT_KEYS, MAX_SWEEP_VECTORS,
+)
+from .utils.simulator import SORT_KEYS, TAX_RATES, simulate_options
+from .utils.ticker_index import get_ticker_index
 from .utils.youtube_api import search_youtube_videos
 
 # API KEY 설정
-FINLIFE_API_KEY = getattr(settings, 'FINLIFE_API_KEY', "3c4cbc25442ea93a9a4361c35eb0cf14")
-EXIM_API_KEY = getattr(settings, 'EXIM_API_KEY', "VMyu0svCx0AhAHQms9zCgdFuWrfIUFiu")
 NAVER_CLIENT_ID = settings.NAVER_CLIENT_ID
 NAVER_CLIENT_SECRET = settings.NAVER_CLIENT_SECRET
 
 User = get_user_model()
+
 # ==========================================
 # [데이터 수집 및 상품 조회]
 # ==========================================
-def fetch_and_save_products():
-    top_fin_grp_nos = ['020000', '030300']
-    product_types = [
-        ('depositProductsSearch.json', DepositProduct, DepositOptions),
-        ('savingProductsSearch.json', SavingProduct, SavingOptions)
-    ]
-    for filename, ProductModel, OptionModel in product_types:
-        for top_no in top_fin_grp_nos:
-            url = f'http://finlife.fss.or.kr/finlifeapi/{filename}?auth={FINLIFE_API_KEY}&topFinGrpNo={top_no}&pageNo=1'
-            try:
-                res = requests.get(url).json()
-                if res.get('result', {}).get('err_cd') == '000':
-                    base_list = res['result']['baseList']
-                    option_list = res['result']['optionList']
-                    for base in base_list:
-                        product, _ = ProductModel.objects.get_or_create(
-                            fin_prdt_cd=base['fin_prdt_cd'],
-                            defaults={
-                                'kor_co_nm': base['kor_co_nm'], 'fin_prdt_nm': base['fin_prdt_nm'],
-                                'etc_note': base.get('etc_note'), 'join_deny': base.get('join_deny'),
-                                'join_member': base.get('join_member'), 'join_way': base.get('join_way'),
-                                'spcl_cnd': base.get('spcl_cnd'),
-                            }
-                        )
-                        this_options = [o for o in option_list if o['fin_prdt_cd'] == base['fin_prdt_cd']]
-                        for opt in this_options:
-                            OptionModel.objects.get_or_create(
-                                product=product, fin_prdt_cd=opt['fin_prdt_cd'],
-                                intr_rate_type_nm=opt['intr_rate_type_nm'], save_trm=opt['save_trm'],
-                                defaults={'intr_rate': opt.get('intr_rate'), 'intr_rate2': opt.get('intr_rate2')}
-                            )
-            except Exception as e:
-                print(f"Error saving {ProductModel.__name__}: {e}")
-
-class DepositProductListAPIView(APIView):
+class ProductCatalogueAPIView(APIView):
+    """
+    예금/적금 목록 공통. 쿼리 파라미터 (모두 선택)
+    - bank: 은행명 (쉼표로 여러 개)        - save_trm: 가입 기간 (개월)
+    - rate_type: 금리 유형 (단리/복리)     - min_rate: 최고 우대금리 하한 (%)
+    - sort: bank(기본) | rate | name
+    - page_size / cursor: 주면 커서 페이지네이션 ({next, previous, results}), 없으면 기존처럼 전체 배열
+    응답은 catalogue_cache 에 통째로 캐시 (상품 동기화가 끝나면 무효화, ETag/304 지원)
+    """
     permission_classes = [AllowAny]
-    def get(self, request):
-        if not DepositProduct.objects.exists(): fetch_and_save_products()
-        products = DepositProduct.objects.all().order_by('kor_co_nm')
-        return Response(DepositProductSerializer(products, many=True).data)
+    product_model = option_model = serializer_class = cache_name = None
+    SORT_ORDERING = {'bank': ('kor_co_nm', 'id'), 'name': ('fin_prdt_nm', 'id'), 'rate': ('-max_intr_rate2', 'id')}
+
+    def parse_filters(self, params):
+        product_filters, option_filters = {}, {}
+        if params.get('bank'):
+            product_filters['kor_co_nm__in'] = [b.strip() for b in params['bank'].split(',') if b.strip()]
+        if params.get('save_trm'):
+            option_filters['save_trm'] = int(params['save_trm'])
+        if params.get('rate_type'):
+            option_filters['intr_rate_type_nm'] = params['rate_type']
+        if params.get('min_rate'):
+            min_rate = float(params['min_rate'])
+            if not math.isfinite(min_rate):
+                raise ValueError('min_rate must be finite')   # nan/inf 면 모든 행이 걸러짐
+            option_filters['intr_rate2__gte'] = min_rate
+        return product_filters, option_filters
 
-class SavingProductListAPIView(APIView):
-    permission_classes = [AllowAny]
     def get(self, request):
-        if not SavingProduct.objects.exists(): fetch_and_save_products()
-        products = SavingProduct.objects.all().order_by('kor_co_nm')
-        return Response(SavingProductSerializer(products, many=True).data)
+        return cached_catalogue_response(request, self.cache_name, lambda: self.build_response(request))
+
+    def build_response(self, request):
+        sort = request.GET.get('sort', 'bank')
+        if sort not in self.SORT_ORDERING:
+            return Response({'error': f'sort는 {list(self.SORT_ORDERING)} 중 하나여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            product_filters, option_filters = self.parse_filters(request.GET)
+        except ValueError:
+            return Response({'error': 'save_trm/min_rate는 숫자여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        products = with_option_rates(
+            self.product_model.objects.filter(**product_filters), self.option_model, option_filters,
+        ).order_by(*self.SORT_ORDERING[sort])
+
+        if 'page_size' in request.GET or 'cursor' in request.GET:
+            paginator = CataloguePagination(ordering=self.SORT_ORDERING[sort])
+            page = paginator.paginate_queryset(products, request, view=self)
+            return paginator.get_paginated_response(self.serializer_class(page, many=True).data)
+        return Response(self.serializer_class(products, many=True).data)
+
+class DepositProductListAPIView(ProductCatalogueAPIView):
+    product_model, option_model, serializer_class = DepositProduct, DepositOptions, DepositProductSerializer
+    cache_name = 'deposits'
+
+class SavingProductListAPIView(ProductCatalogueAPIView):
+    product_model, option_model, serializer_class = SavingProduct, SavingOptions, SavingProductSerializer
+    cache_name = 'savings'
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def simulate_products(request):
+    """
+    예금/적금 만기 시뮬레이션 (?principal=10000000&monthly=500000&months=12)
+    - rate: max(우대금리, 기본) | basic   - tax: general(15.4%) | preferential(9.5%) | none
+    - kind: deposit | saving (없으면 둘 다) - sort: interest(세후 이자, 기본) | yield(세후 연 수익률)
+    """
+    try:
+        principal = int(request.GET.get('principal', 0))
+        monthly = int(request.GET.get('monthly', 0))
+        months = int(request.GET.get('months', 12))
+        limit = max(1, min(int(request.GET.get('limit', 50)), 500))
+    except ValueError:
+        return Response({'error': 'principal/monthly/months/limit는 정수여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    rate, tax = request.GET.get('rate', 'max'), request.GET.get('tax', 'general')
+    if principal < 0 or monthly < 0 or not (principal or monthly) or not 1 <= months <= 120:
+        return Response({'error': '원금 또는 월 납입액과 1~120개월 기간을 입력하세요.'}, status=status.HTTP_400_BAD_REQUEST)
+    if rate not in ('max', 'basic') or tax not in TAX_RATES:
+        return Response({'error': f'rate는 max/basic, tax는 {list(TAX_RATES)} 중 하나여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    sort = request.GET.get('sort', 'interest')
+    if sort not in SORT_KEYS:
+        return Response({'error': f'sort는 {list(SORT_KEYS)} 중 하나여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    results = simulate_options(
+        principal, monthly, months, rate=rate, tax=tax,
+        kind=request.GET.get('kind'), limit=limit, sort=sort,
+    )
+    return Response({'principal': principal, 'monthly': monthly, 'months': months, 'tax': tax, 'results': results})
+
+RATE_HISTORY_MODELS = {'deposit': (DepositRateHistory, DepositOptions), 'saving': (SavingRateHistory, SavingOptions)}
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def rate_changes(request):
+    """
+    금리 변경 피드 (?since=2025-01-01 또는 2025-01-01T09:00:00, 기본: 최근 7일)
+    - kind: deposit | saving (없으면 둘 다)   - include_new=1: 새로 생긴 옵션도 포함
+    """
+    since_param = request.GET.get('since')
+    if since_param:
+        try:
+            since = parse_datetime(since_param)
+            if since is None and parse_date(since_param):
+                since = datetime.combine(parse_date(since_param), datetime.min.time())
+        except ValueError:
+            since = None
+        if not since:
+            return Response({'error': 'since는 YYYY-MM-DD 또는 ISO 8601 형식이어야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+    else:
+        since = timezone.now() - timedelta(days=7)
+    limit = min(int(request.GET.get('limit', 200)) if request.GET.get('limit', '').isdigit() else 200, 1000)
+    kinds = [request.GET['kind']] if request.GET.get('kind') in RATE_HISTORY_MODELS else list(RATE_HISTORY_MODELS)
+
+    changes = []
+    for kind in kinds:
+        HistoryModel, _ = RATE_HISTORY_MODELS[kind]
+        qs = HistoryModel.objects.filter(created_at__gt=since)
+        if request.GET.get('include_new') != '1':
+            qs = qs.exclude(prev_intr_rate__isnull=True, prev_intr_rate2__isnull=True)
+        for h in qs.select_related('option__product').order_by('-created_at')[:limit]:
+            changes.append({
+                'kind': kind, 'option_id': h.option_id, 'fin_prdt_cd': h.option.fin_prdt_cd,
+                'kor_co_nm': h.option.product.kor_co_nm, 'fin_prdt_nm': h.option.product.fin_prdt_nm,
+                'intr_rate_type_nm': h.option.intr_rate_type_nm, 'save_trm': h.option.save_trm,
+                'date': h.date, 'changed_at': h.created_at,
+                'old': {'intr_rate': h.prev_intr_rate, 'intr_rate2': h.prev_intr_rate2},
+                'new': {'intr_rate': h.intr_rate, 'intr_rate2': h.intr_rate2},
+            })
+    changes.sort(key=lambda c: c['changed_at'], reverse=True)
+    return Response({'since': since, 'count': len(changes[:limit]), 'results': changes[:limit]})
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def option_rate_history(request, kind, option_pk):
+    """옵션 하나의 금리 추이 (스파크라인용, 최근 points 개). (option, date) 인덱스만 읽음"""
+    HistoryModel, OptionModel = RATE_HISTORY_MODELS[kind]
+    option = get_object_or_404(OptionModel, pk=option_pk)
+    points = min(int(request.GET['points']) if request.GET.get('points', '').isdigit() else 90, 365)
+    rows = list(
+        HistoryModel.objects.filter(option_id=option.pk).order_by('-date', '-id')
+        .values('date', 'intr_rate', 'intr_rate2')[:points]
+    )
+    return Response({
+        'option_id': option.pk, 'save_trm': option.save_trm, 'intr_rate_type_nm': option.intr_rate_type_nm,
+        'intr_rate': option.intr_rate, 'intr_rate2': option.intr_rate2,
+        'points': rows[::-1],
+    })
 
 class StockTopAPIView(APIView):
     permission_classes = [AllowAny]
@@ -145,156 +258,52 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
 
-import pandas as pd
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-from collections import Counter
-from datetime import date
-
 from .models import DepositOptions, SavingOptions
-from .serializers import DepositOptionsSerializer, SavingOptionsSerializer
+from .serializers import RelatedDepositOptionSerializer, RelatedSavingOptionSerializer
+from .recommendations import get_recommendations
+from .utils import subscription_matrix
 
 User = get_user_model()
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def recommend_products(request):
-    try:
-        user = request.user
-        
-        # 🐜 1. 내가 이미 가입한 상품 ID 목록 추출 (중복 추천 방지용)
-        # related_name이 'subscribed_deposits', 'subscribed_savings'로 설정되어 있어야 함
-        my_deposit_ids = set(user.subscribed_deposits.values_list('id', flat=True))
-        my_saving_ids = set(user.subscribed_savings.values_list('id', flat=True))
-        my_joined_ids = my_deposit_ids | my_saving_ids # 합집합
-
-        # ----------------------------------------
-        # [알고리즘 1단계] 유사 유저 기반 필터링 (Collaborative Filtering)
-        # ----------------------------------------
-        all_users = User.objects.filter(birth_date__isnull=False, salary__isnull=False)
-        
-        # 데이터 부족 시 베스트 상품으로 이동
-        if not all_users.exists():
-            return get_best_products_response(user, my_joined_ids, is_no_data=True)
+    # 🐜 추천 계산은 finlife/recommendations.py (유저별 캐시, 프로필/가입/상품 동기화 시 무효화)
+    return Response(get_recommendations(request.user))
 
-        df = pd.DataFrame(list(all_users.values('id', 'birth_date', 'salary', 'money')))
-        
-        # 내 정보가 없으면(신규) 베스트 상품
-        if user.id not in df['id'].values:
-            return get_best_products_response(user, my_joined_ids, is_new_user=True)
-
-        # 나이 계산
-        def calculate_age(born):
-            today = date.today()
-            return today.year - born.year if born else 30
-        
-        df['age'] = df['birth_date'].apply(calculate_age)
-        df = df.drop(columns=['birth_date'])
 
-        # 코사인 유사도 계산
-        df = df.set_index('id')
-        df.fillna(0, inplace=True) 
-        similarity_matrix = cosine_similarity(df)
-        
-        user_idx = df.index.get_loc(user.id)
-        
-        # 유사 유저 상위 10명 (나 제외)
-        similar_indices = similarity_matrix[user_idx].argsort()[::-1][1:11]
-        similar_user_ids = df.index[similar_indices].tolist()
-        
-        # 유사 유저들의 가입 상품 수집
-        similar_users = User.objects.filter(id__in=similar_user_ids)
-        option_ids = []
-        for u in similar_users:
-            if hasattr(u, 'subscribed_deposits'):
-                # 내가 가입 안 한 것만 추가
-                for opt_id in u.subscribed_deposits.values_list('id', flat=True):
-                    if opt_id not in my_joined_ids:
-                        option_ids.append(opt_id)
-            if hasattr(u, 'subscribed_savings'):
-                for opt_id in u.subscribed_savings.values_list('id', flat=True):
-                    if opt_id not in my_joined_ids:
-                        option_ids.append(opt_id)
-
-        # 추천할 게 없으면 베스트 상품
-        if not option_ids:
-            return get_best_products_response(user, my_joined_ids, is_no_data=True)
-        
-        # 가장 많이 가입된 상품 추출
-        counter = Counter(option_ids)
-        most_common_ids = [id for id, count in counter.most_common(10)] # 넉넉하게 10개 뽑음
-        
-        rec_deposits = list(DepositOptions.objects.filter(id__in=most_common_ids))
-        rec_savings = list(SavingOptions.objects.filter(id__in=most_common_ids))
-        
-        candidates = rec_deposits + rec_savings
+ALSO_JOINED_MODELS = {'deposit': (DepositOptions, RelatedDepositOptionSerializer), 'saving': (SavingOptions, RelatedSavingOptionSerializer)}
 
-        # ----------------------------------------
-        # [알고리즘 2단계] 투자 성향(Risk Appetite) 반영 정렬
-        # ----------------------------------------
-        # user.risk_appetite: 1(안정) ~ 5(공격)
-        risk_score = user.risk_appetite if user.risk_appetite else 3
-        
-        if risk_score >= 4:
-            # 공격형: 최고 우대 금리(intr_rate2) 높은 순
-            candidates.sort(key=lambda x: x.intr_rate2 if x.intr_rate2 else 0, reverse=True)
-            msg = f'{user.nickname}님의 공격적인 투자 성향에 맞춰 수익률이 높은 상품을 우선 추천해요! 🔥'
-        
-        elif risk_score <= 2:
-            # 안정형: 기본 금리(intr_rate) 높은 순 (조건 없이 받는 돈 중요)
-            candidates.sort(key=lambda x: x.intr_rate if x.intr_rate else 0, reverse=True)
-            msg = f'{user.nickname}님의 신중한 성향을 고려해 기본 금리가 튼튼한 상품을 모았어요! 🛡️'
-            
-        else:
-            # 중립형: 인기순(Counter 순서) 유지
-            # candidates는 DB 쿼리 결과라 순서가 섞였을 수 있으니 counter 점수로 재정렬
-            candidates.sort(key=lambda x: counter[x.id], reverse=True)
-            msg = f'{user.nickname}님과 비슷한 자산/연령대 유저들이 가장 많이 선택한 상품이에요! 🐜'
-
-        # 최종 상위 5~6개만 슬라이싱
-        final_list = candidates[:6]
 
-        combined_data = (
-            DepositOptionsSerializer([x for x in final_list if isinstance(x, DepositOptions)], many=True).data + 
-            SavingOptionsSerializer([x for x in final_list if isinstance(x, SavingOptions)], many=True).data
-        )
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def also_joined_options(request, kind, option_pk):
+    """이 상품 가입자들이 함께 가입한 상품 (?limit=, 기본 6). 로그인했으면 내가 가입한 상품은 뺌"""
+    OptionModel, _ = ALSO_JOINED_MODELS[kind]
+    option = get_object_or_404(OptionModel, pk=option_pk)
+    limit = min(int(request.GET['limit']) if request.GET.get('limit', '').isdigit() else 6, 30)
+
+    exclude = set()
+    if request.user.is_authenticated:
+        exclude = {('deposit', pk) for pk in request.user.subscribed_deposits.values_list('id', flat=True)}
+        exclude |= {('saving', pk) for pk in request.user.subscribed_savings.values_list('id', flat=True)}
+    related, joined_users = subscription_matrix.get_subscription_matrix().also_joined(
+        (kind, option.pk), exclude=exclude, limit=limit,
+    )
 
-        return Response({
-            'type': 'custom',
-            'message': msg,
-            'data': combined_data
-        })
+    # 종류별로 한 번씩만 조회하고 함께 가입한 수 순서대로 다시 나열
+    objects = {}
+    for related_kind, (RelatedModel, serializer_class) in ALSO_JOINED_MODELS.items():
+        ids = [pk for (k, pk), _ in related if k == related_kind]
+        queryset = RelatedModel.objects.filter(id__in=ids).select_related('product')
+        for row in serializer_class(queryset, many=True).data:
+            objects[(related_kind, row['id'])] = row
+    results = [
+        {'kind': key[0], 'co_joined': count, **objects[key]}
+        for key, count in related if key in objects
+    ]
+    return Response({'kind': kind, 'option_id': option.pk, 'joined_users': joined_users, 'results': results})
 
-    except Exception as e:
-        print(f"!!! 추천 알고리즘 에러 !!!: {e}")
-        # 에러 시에도 내가 가입한건 빼고 베스트 상품 추천
-        my_deposit_ids = set(user.subscribed_deposits.values_list('id', flat=True))
-        my_saving_ids = set(user.subscribed_savings.values_list('id', flat=True))
-        return get_best_products_response(user, my_deposit_ids | my_saving_ids, is_no_data=True)
-
-
-# 🐜 헬퍼 함수: 베스트 상품 추천 (중복 제외 기능 추가됨)
-def get_best_products_response(user, joined_ids, is_new_user=False, is_no_data=False):
-    # 내가 가입한 ID 제외하고 조회
-    top_deposits = DepositOptions.objects.exclude(id__in=joined_ids).order_by('-intr_rate2')[:3]
-    top_savings = SavingOptions.objects.exclude(id__in=joined_ids).order_by('-intr_rate2')[:3]
-    
-    combined_data = (
-        DepositOptionsSerializer(top_deposits, many=True).data +
-        SavingOptionsSerializer(top_savings, many=True).data
-    )
-    
-    msg = '최고 금리 상품들을 모아봤어요!'
-    if is_new_user:
-        msg = '프로필 정보를 입력하시면 더 정확한 맞춤 추천이 가능해요! 인기 상품부터 둘러보세요.'
-    elif is_no_data:
-        msg = '비슷한 유저 데이터가 부족하여 금리순으로 보여드려요!'
-        
-    return Response({
-        'type': 'best_rate',
-        'message': msg,
-        'data': combined_data
-    })
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
@@ -306,11 +315,85 @@ def recommend_stocks(request):
             'w_per': float(request.GET.get('w_per', 0.15)), 
             'w_pbr': float(request.GET.get('w_pbr', 0.15)),
         }
+        # 과거 스냅샷 조회 (?date=2025-01-10), 없으면 가장 최근 스냅샷
+        snapshot_date = None
+        if request.GET.get('date'):
+            try:
+                snapshot_date = datetime.strptime(request.GET['date'], '%Y-%m-%d').date()
+            except ValueError:
+                return JsonResponse({'error': 'date는 YYYY-MM-DD 형식이어야 합니다.'}, status=400)
         # 🐜 [수정] limit=20 -> 200으로 변경!
         # 이제 프론트엔드로 200개를 보냅니다. 필터링은 프론트에서 합니다.
-        return JsonResponse(get_stock_ranking(limit=200, weights=weights))
+        return JsonResponse(get_stock_ranking(limit=200, weights=weights, snapshot_date=snapshot_date))
     except Exception as e: 
         return JsonResponse({'error': str(e)}, status=500)
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def sweep_stock_weights(request):
+    """
+    가중치 여러 개를 한 번에 평가 (recommend-stocks 를 수백 번 호출하는 대신)
+    body: {"weights": [{"w_div": 0.3, ...}, ...]} 또는 {"grid_step": 0.1} 또는 {"samples": 1000, "seed": 42}
+          + 선택: "k"(상위 몇 개, 기본 20), "date"(YYYY-MM-DD)
+    """
+    data = request.data
+    too_many = Response({'error': f'가중치 벡터는 1~{MAX_SWEEP_VECTORS}개까지 가능합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    # 🐜 벡터 개수는 만들기 전에 확인 (누구나 호출 가능한 API라 samples=10**9 같은 요청으로 메모리를 다 쓰지 않도록)
+    try:
+        if data.get('weights'):
+            if not isinstance(data['weights'], list) or len(data['weights']) > MAX_SWEEP_VECTORS:
+                return too_many
+            vectors = np.array([[float(w.get(key, 0)) for key in WEIGHT_KEYS] for w in data['weights']])
+        elif data.get('grid_step'):
+            step = float(data['grid_step'])
+            if not 0.02 <= step <= 0.5:
+                return Response({'error': 'grid_step은 0.02~0.5 사이여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+            if weight_grid_size(step) > MAX_SWEEP_VECTORS:
+                return too_many
+            vectors = weight_grid(step)
+        else:
+            samples = int(data.get('samples', 500))
+            if not 1 <= samples <= MAX_SWEEP_VECTORS:
+                return too_many
+            vectors = weight_samples(samples, data.get('seed'))
+        k = int(data.get('k', 20))
+        snapshot_date = datetime.strptime(data['date'], '%Y-%m-%d').date() if data.get('date') else None
+    except (TypeError, ValueError, AttributeError):
+        return Response({'error': '잘못된 가중치 형식입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if not 1 <= len(vectors) <= MAX_SWEEP_VECTORS:
+        return too_many
+    if (vectors < 0).any() or not 1 <= k <= 200:
+        return Response({'error': '가중치는 0 이상, k는 1~200 사이여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    result = sweep_weights(vectors, k=k, snapshot_date=snapshot_date)
+    if result is None:
+        return Response({'error': '퀀트 스냅샷이 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(result)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def backtest_stocks(request):
+    """저장된 팩터 스냅샷으로 가중치 백테스트 (?w_div=..&top_n=20&rebalance=monthly&start=2020-01-01)"""
+    try:
+        weights = {k: float(request.GET[k]) for k in ('w_div', 'w_roe', 'w_per', 'w_pbr') if k in request.GET}
+        top_n = int(request.GET.get('top_n', 20))
+        start = datetime.strptime(request.GET['start'], '%Y-%m-%d').date() if request.GET.get('start') else None
+        end = datetime.strptime(request.GET['end'], '%Y-%m-%d').date() if request.GET.get('end') else None
+    except ValueError:
+        return Response({'error': '잘못된 파라미터입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    if not 1 <= top_n <= 200:
+        return Response({'error': 'top_n은 1~200 사이여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        result = run_backtest(weights, top_n=top_n, rebalance=request.GET.get('rebalance', 'monthly'), start=start, end=end)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if result is None:
+        return Response({'error': '백테스트할 팩터 스냅샷이 부족합니다.'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(result)
 # ==========================================
 # [외부 데이터 및 지표 - 안정적인 동기 방식]
 # ==========================================
@@ -327,6 +410,20 @@ def get_market_status(request):
         return Response({"error": "데이터 로드 실패"}, status=500)
 
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def market_cache_stats(request):
+    """외부 시세 캐시 hit/miss 통계 (관리자 전용)"""
+    return Response(market_cache.stats())
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def sync_status(request):
+    """백그라운드 동기화 작업별 마지막 실행 상태 (관리자 전용)"""
+    return Response(job_status())
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def exchange_history(request):
@@ -351,24 +448,7 @@ def spot_price_history(request):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def exchange_rate(request):
-    """실시간 환율 목록 (DB 기반)"""
-    if not ExchangeRate.objects.exists():
-        for i in range(7):
-            search_date = (datetime.now() - timedelta(days=i)).strftime('%Y%m%d')
-            url = f'https://www.koreaexim.go.kr/site/program/financial/exchangeJSON?authkey={EXIM_API_KEY}&data=AP01&searchdate={search_date}'
-            try:
-                res = requests.get(url, verify=False, timeout=5)
-                data = res.json()
-                if data:
-                    ExchangeRate.objects.all().delete()
-                    for item in data:
-                        ExchangeRate.objects.create(
-                            cur_unit=item.get('cur_unit'), cur_nm=item.get('cur_nm'),
-                            deal_bas_r=item.get('deal_bas_r', '0').replace(',', ''),
-                            reference_date=datetime.now().strftime('%Y-%m-%d')
-                        )
-                    break
-            except: continue
+    """실시간 환율 목록 (DB 기반, 갱신은 스케줄러 exchange_rates 작업)"""
     rates = ExchangeRate.objects.all()
     return Response(ExchangeRateSerializer(rates, many=True).data)
 
@@ -448,7 +528,7 @@ def finance_news_view(request):
 def get_bank_products(request):
     bank_name = request.GET.get('bank_name', '')
     clean_name = bank_name.replace("KB", "").replace("NH", "").split()[0] 
-    products = DepositProduct.objects.filter(kor_co_nm__contains=clean_name)[:3]
+    products = with_option_rates(DepositProduct.objects.filter(kor_co_nm__contains=clean_name), DepositOptions)[:3]
     return Response(DepositProductSerializer(products, many=True).data)
 
 @api_view(['GET'])
@@ -474,4 +554,18 @@ def stock_detail_api(request, symbol):
     if not data:
         return Response({"message": "데이터를 불러올 수 없습니다."}, status=404)
         
-    return Response(data)
\ No newline at end of file
+    return Response(data)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def stock_autocomplete(request):
+    """종목명/종목코드 자동완성 (정확히 일치 > 접두어 > 부분 일치)"""
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 10)), 50))
+    except ValueError:
+        limit = 10
+    if not query:
+        return Response([])
+    return Response(get_ticker_index().autocomplete(query, limit=limit))